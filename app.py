@@ -1,8 +1,39 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import pickle
+import dataclasses
+import functools
 import os
+import sys
+import threading
+import time
+import startup                      # first: its import time is the start of the cold-start timeline
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+with startup.phase("import pandas"):
+    import pandas as pd
+with startup.phase("import app modules"):
+    import dataset_io
+    import catalog_index
+    import insights_cube
+    import comparables
+    import inference
+    import prediction_cache
+    import depreciation
+    import metrics
+    import profiling
+
+_RERUN_T0 = time.perf_counter()
+
+# Number of nearest real listings shown under a prediction
+SIMILAR_CARS_K = 25
+
+# Shared prediction cache: max entries, and km bucket width used in its key
+PREDICTION_CACHE_SIZE = int(os.environ.get("CARWORTH_PREDICTION_CACHE_SIZE", "4096"))
+PREDICTION_CACHE_KMS_BUCKET = int(os.environ.get("CARWORTH_PREDICTION_CACHE_KMS_BUCKET", "1000"))
+
+# Preload the model and dataset in a background thread when the process starts
+WARM_UP = os.environ.get("CARWORTH_WARMUP", "1") != "0"
+
+# Metrics admin tab: CARWORTH_ADMIN=1, or ?admin=1 in the URL
+ADMIN = os.environ.get("CARWORTH_ADMIN") == "1"
 
 # ─── PAGE CONFIG ────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -12,8 +43,145 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# ─── GLOBAL CSS — Corporate Memphis 3D Claymorphic ──────────────────────────
-CLAY_CSS = """
+# ─── RERUN PROFILER ─────────────────────────────────────────────────────────
+# CARWORTH_PROFILE=1 or ?profile=1: profile this rerun into profiles/ (see profiling.py)
+profiler = None
+if profiling.PROFILE_ALWAYS or st.query_params.get("profile") == "1":
+    _ctx = get_script_run_ctx()
+    profiler = profiling.RerunProfiler(_ctx.session_id if _ctx else "bare").start()
+
+try:
+    # ─── PARTIAL RERUNS ─────────────────────────────────────────────────────
+    # A widget inside a fragment reruns only that fragment, not all four tabs.
+    # The end of this script, which records and flushes the rerun metrics,
+    # does not run then, so a fragment rerun does that itself.
+    def metered_fragment(func):
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ctx = get_script_run_ctx()
+                if ctx is not None and ctx.fragment_ids_this_run:     # not part of a full rerun
+                    metrics.observe("fragment_rerun", time.perf_counter() - t0)
+                    metrics.count("fragment_reruns")
+                    metrics.flush()
+        return st.fragment(body)
+
+    # ─── CACHED RESOURCES ───────────────────────────────────────────────────
+    # Shared by every session in this process. Defined before the page renders so
+    # the background warm-up below can fill them while the first page is drawn.
+    @st.cache_data
+    def load_data():
+        with startup.phase("load dataset"):
+            return dataset_io.load_cleaned()
+
+    @st.cache_resource
+    def load_catalog():
+        # Written by data_cleaning.py; rebuilt from the dataset if missing or stale
+        with startup.phase("load catalog"):
+            if dataset_io.is_fresh(catalog_index.CATALOG_PATH):
+                return catalog_index.load_catalog()
+            return catalog_index.build_catalog(load_data())
+
+    @st.cache_resource
+    def load_comparables():
+        data = load_data()
+        with startup.phase("build comparables index"):
+            return comparables.ComparablesIndex(data)
+
+    @st.cache_resource(max_entries=1)
+    def load_model(version):
+        # `version` is the artifact fingerprint, so a retrained model is reloaded.
+        # Prefers model_bundle/ (memory-mapped compiled arrays) over the pickle.
+        with startup.phase("load model"):
+            return inference.load_model()
+
+    @st.cache_resource
+    def get_prediction_cache():
+        return prediction_cache.PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_KMS_BUCKET)
+
+    def uses_log_transform() -> bool:
+        return inference.model_log_transform()
+
+    @st.cache_data(max_entries=256)
+    def load_depreciation_curves(name, company, fuel_type, model_version):
+        # One batched predict over the year × kms grid per car; a new model version
+        # is a new cache key
+        model = load_model(model_version)
+        return depreciation.depreciation_curves(model, name, company, fuel_type, uses_log_transform())
+
+    @st.cache_resource
+    def load_cube():
+        # Materialized by data_cleaning.py; rebuilt from the dataset if missing or stale
+        with startup.phase("load insights cube"):
+            if dataset_io.is_fresh(insights_cube.CUBE_PATH):
+                return insights_cube.Cube.load()
+            return insights_cube.build_cube(dataset_io.load_cleaned())
+
+    @st.cache_data
+    def load_data_sample():
+        return dataset_io.load_head(20)
+
+
+    # ─── BACKGROUND WARM-UP ─────────────────────────────────────────────────
+    def warm_up(model_version):
+        """Fill the caches above and run one prediction, so the first Predict click
+    pays neither the model load nor the first-call overhead of the model."""
+        try:
+            # The page needs these too: loading them here overlaps with the render
+            model = load_model(model_version)
+            catalog = load_catalog()
+            # Only the Predict click needs the rest; don't compete with the first render
+            startup.wait_for_render(timeout=30)
+            company = catalog["companies"][0]
+            name = catalog["models"][company][0]
+            variant = catalog["variants"][company][name]
+            row = pd.DataFrame([[name, company, variant["year_max"], 50_000, variant["fuel_types"][0]]],
+                               columns=inference.FEATURES)
+            with startup.phase("first prediction"):
+                inference.to_price(model.predict(row), uses_log_transform())
+            load_comparables()
+        except Exception as e:              # missing artifacts are reported by the page itself
+            print(f"⚠️  warm-up stopped: {e!r}", file=sys.stderr)
+        finally:
+            startup.finish("warm-up")
+
+    @st.cache_resource
+    def start_warm_up(model_version):
+        # Runs once per process and model version; later sessions find the caches full.
+        # st.cache_data only reads and writes inside a script context, so the thread
+        # gets a copy of this run's context that sends nothing (e.g. cache spinners)
+        # to the page.
+        thread = threading.Thread(target=warm_up, args=(model_version,), name="warm-up", daemon=True)
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            add_script_run_ctx(thread, dataclasses.replace(ctx, _enqueue=lambda msg: None, cursors={}))
+        thread.start()
+        return thread
+
+    if WARM_UP:
+        try:
+            start_warm_up(inference.artifact_version())
+        except FileNotFoundError:
+            startup.finish("warm-up")
+    else:
+        startup.finish("warm-up")
+
+
+    # ─── METRICS ENDPOINT ───────────────────────────────────────────────────
+    @st.cache_resource
+    def start_metrics_server():
+        # One GET /metrics listener per process, on CARWORTH_METRICS_PORT
+        return metrics.serve()
+
+    if metrics.METRICS_PORT:
+        start_metrics_server()
+
+
+    # ─── GLOBAL CSS — Corporate Memphis 3D Claymorphic ──────────────────────
+    CLAY_CSS = """
 <style>
 @import url('https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@400;500;600;700;800;900&display=swap');
 
@@ -80,6 +248,13 @@ section[data-testid="stSidebarContent"] {
     box-shadow: 8px 8px 0px #CFC8BC, 0 24px 60px rgba(60,40,20,0.07) !important;
     padding: 36px 40px !important;
 }
+/* The Predict form sits inside the card already: no second card around it */
+[data-testid="stVerticalBlock"]:has(#form_col_marker) [data-testid="stForm"] {
+    background: none !important;
+    border: none !important;
+    box-shadow: none !important;
+    padding: 0 !important;
+}
 
 /* ── SELECTBOX ──────────────────────────────── */
 div[data-baseweb="select"] > div:first-child {
@@ -231,13 +406,13 @@ h1, h2, h3, h4, h5, h6 {
 }
 </style>
 """
-st.markdown(CLAY_CSS, unsafe_allow_html=True)
+    st.markdown(CLAY_CSS, unsafe_allow_html=True)
 
 
-# ─── HELPER FUNCTIONS ───────────────────────────────────────────────────────
+    # ─── HELPER FUNCTIONS ───────────────────────────────────────────────────
 
-def clay_card(content: str, shadow_color: str = "#CFC8BC", bg: str = "#FFFFFF") -> str:
-    return f"""
+    def clay_card(content: str, shadow_color: str = "#CFC8BC", bg: str = "#FFFFFF") -> str:
+        return f"""
     <div style="
         background: {bg};
         border-radius: 28px;
@@ -248,10 +423,10 @@ def clay_card(content: str, shadow_color: str = "#CFC8BC", bg: str = "#FFFFFF")
     ">{content}</div>"""
 
 
-def stat_card(icon: str, value: str, label: str, sublabel: str = "",
-              bg: str = "#FFFFFF", shadow: str = "#CFC8BC",
-              val_color: str = "#1A1210") -> str:
-    return f"""
+    def stat_card(icon: str, value: str, label: str, sublabel: str = "",
+                  bg: str = "#FFFFFF", shadow: str = "#CFC8BC",
+                  val_color: str = "#1A1210") -> str:
+        return f"""
     <div style="
         background: {bg};
         border-radius: 24px;
@@ -270,9 +445,9 @@ def stat_card(icon: str, value: str, label: str, sublabel: str = "",
     </div>"""
 
 
-def step_card(num: str, title: str, desc: str,
-              num_bg: str = "#FFF0EA", num_color: str = "#FF6B35") -> str:
-    return f"""
+    def step_card(num: str, title: str, desc: str,
+                  num_bg: str = "#FFF0EA", num_color: str = "#FF6B35") -> str:
+        return f"""
     <div style="
         background: #FFFFFF;
         border-radius: 24px;
@@ -295,190 +470,193 @@ def step_card(num: str, title: str, desc: str,
     </div>"""
 
 
-def price_card(price: float) -> str:
-    lakhs = price / 100_000
-    if lakhs >= 1:
-        display = f"₹{lakhs:.2f}L"
-    else:
-        display = f"₹{price:,.0f}"
-
-    lines = [
-        '<div style="',
-        '    background: linear-gradient(145deg, #1C1640, #261E5A);',
-        '    border-radius: 28px;',
-        '    border: 2.5px solid #3D3280;',
-        '    box-shadow: 8px 8px 0px #0E0A28, 0 24px 60px rgba(108,99,255,0.22);',
-        '    padding: 44px 36px;',
-        '    text-align: center;',
-        '">',
-        '    <div style="',
-        '        color: rgba(200,190,255,0.7); font-size: 0.72rem; font-weight: 700;',
-        '        letter-spacing: 0.12em; text-transform: uppercase; margin-bottom: 14px;',
-        '    ">✦ Estimated Resale Value · 2026 Market</div>',
-        '',
-        '    <div style="',
-        '        color: #FFFFFF; font-size: clamp(2.6rem, 6vw, 4rem);',
-        '        font-weight: 900; letter-spacing: -0.04em; line-height: 1;',
-        '        margin-bottom: 8px;',
-        f'    ">{display}</div>',
-        '',
-        '    <div style="',
-        '        color: rgba(200,190,255,0.55); font-size: 0.78rem; margin-bottom: 28px;',
-        f'    ">= ₹{price:,.0f}</div>',
-        '',
-        '    <div style="',
-        '        display: inline-flex; align-items: center; gap: 8px;',
-        '        background: rgba(108,99,255,0.2); border: 1.5px solid rgba(108,99,255,0.35);',
-        '        border-radius: 100px; padding: 8px 18px;',
-        '">',
-        '        <span style="color: #A89CFF; font-size: 0.8rem; font-weight: 600;">',
-        '            ⚡ GradientBoosting ML — R² 0.79',
-        '        </span>',
-        '    </div>',
-        '</div>'
-    ]
-    return "".join(lines)
-
-
-# ─── TABS ───────────────────────────────────────────────────────────────────
-tab1, tab2, tab3, tab4 = st.tabs(["🏠  Home", "🎯  Predict", "📊  Insights", "ℹ️  About"])
-
-
-# ════════════════════════════════════════════════════════════════════════════
-# TAB 1 — HOME
-# ════════════════════════════════════════════════════════════════════════════
-with tab1:
-
-    # ── HERO CARD ──────────────────────────────────────────────────────────
-    hero_lines = [
-        '<div style="',
-        '    background: linear-gradient(135deg, #FFFFFF 0%, #FFF6EF 100%);',
-        '    border-radius: 32px;',
-        '    border: 2.5px solid #E0D8CE;',
-        '    box-shadow: 10px 10px 0px #CFC8BC, 0 30px 80px rgba(60,40,20,0.08);',
-        '    padding: 52px 56px;',
-        '    margin-bottom: 28px;',
-        '    display: flex;',
-        '    align-items: center;',
-        '    justify-content: space-between;',
-        '    gap: 32px;',
-        '    overflow: hidden;',
-        '    position: relative;',
-        '    flex-wrap: wrap;',
-        '">',
-        '    <!-- BG blobs -->',
-        '    <div style="position:absolute;top:-60px;right:-40px;width:300px;height:300px;',
-        '        background:radial-gradient(circle,rgba(255,107,53,0.10) 0%,transparent 70%);',
-        '        border-radius:50%;pointer-events:none;"></div>',
-        '    <div style="position:absolute;bottom:-80px;left:260px;width:240px;height:240px;',
-        '        background:radial-gradient(circle,rgba(108,99,255,0.07) 0%,transparent 70%);',
-        '        border-radius:50%;pointer-events:none;"></div>',
-        '',
-        '    <!-- Left: text -->',
-        '    <div style="flex:1;min-width:260px;max-width:520px;position:relative;z-index:1;">',
-        '        <div style="display:inline-flex;align-items:center;gap:8px;',
-        '            background:rgba(255,107,53,0.10);border:1.5px solid rgba(255,107,53,0.22);',
-        '            border-radius:100px;padding:6px 16px;margin-bottom:22px;">',
-        '            <div style="width:7px;height:7px;background:#FF6B35;border-radius:50%;"></div>',
-        '            <span style="color:#FF6B35;font-size:0.75rem;font-weight:700;',
-        '                letter-spacing:0.06em;text-transform:uppercase;">AI-Powered Valuation</span>',
-        '        </div>',
-        '',
-        '        <h1 style="font-size:clamp(2rem,4vw,3.2rem);font-weight:900;color:#1A1210;',
-        '            letter-spacing:-0.04em;line-height:1.08;margin-bottom:16px;">',
-        '            Know Your Car\'s<br>',
-        '            <span style="background:linear-gradient(135deg,#FF6B35,#FF8C5A);',
-        '                -webkit-background-clip:text;-webkit-text-fill-color:transparent;',
-        '                background-clip:text;">True Worth.</span>',
-        '        </h1>',
-        '',
-        '        <p style="color:#7A6B5C;font-size:1rem;line-height:1.72;',
-        '            margin-bottom:26px;max-width:400px;">',
-        '            India\'s accurate used car price predictor — trained on <strong style="color:#1A1210;">800+',
-        '            real Quikr listings</strong> with 2026 market price correction.',
-        '        </p>',
-        '',
-        '        <div style="display:flex;gap:10px;flex-wrap:wrap;">',
-        '            <div style="background:#F8F3EC;border:2px solid #E0D8CE;border-radius:100px;',
-        '                padding:8px 18px;font-size:0.81rem;font-weight:700;color:#5C4E3E;">',
-        '                ✓ 25+ Brands',
-        '            </div>',
-        '            <div style="background:#EDFBF4;border:2px solid #B8EDD4;border-radius:100px;',
-        '                padding:8px 18px;font-size:0.81rem;font-weight:700;color:#1A7040;">',
-        '                ✓ 2026 Prices',
-        '            </div>',
-        '            <div style="background:#EEEEFF;border:2px solid #C4BEFF;border-radius:100px;',
-        '                padding:8px 18px;font-size:0.81rem;font-weight:700;color:#3A30A0;">',
-        '                ✓ Instant Result',
-        '            </div>',
-        '        </div>',
-        '    </div>',
-        '',
-        '    <!-- Right: car SVG + floating badges -->',
-        '    <div style="flex-shrink:0;position:relative;width:280px;height:190px;">',
-        '        <svg viewBox="0 0 280 160" width="280" height="160" xmlns="http://www.w3.org/2000/svg">',
-        '            <ellipse cx="140" cy="156" rx="112" ry="7" fill="rgba(0,0,0,0.09)"/>',
-        '            <rect x="15" y="86" width="250" height="55" rx="27" fill="#FF6B35"/>',
-        '            <rect x="15" y="86" width="250" height="22" rx="22" fill="#FF8C5A" opacity="0.45"/>',
-        '            <path d="M64,86 Q89,40 120,35 L160,35 Q191,40 216,86 Z" fill="#FF6B35"/>',
-        '            <path d="M74,86 Q97,48 124,43 L156,43 Q183,48 206,86 Z" fill="#FF8C5A" opacity="0.40"/>',
-        '            <path d="M86,86 Q109,57 127,51 L153,51 Q171,57 194,86 Z" fill="#B8DEF0" opacity="0.88"/>',
-        '            <path d="M96,86 Q113,67 127,62 L141,62 Q150,65 160,73"',
-        '                stroke="white" stroke-width="2.5" fill="none" opacity="0.55" stroke-linecap="round"/>',
-        '            <circle cx="68" cy="140" r="28" fill="#221A18"/>',
-        '            <circle cx="68" cy="140" r="18" fill="#DDD8D0"/>',
-        '            <circle cx="68" cy="140" r="7" fill="#221A18"/>',
-        '            <circle cx="212" cy="140" r="28" fill="#221A18"/>',
-        '            <circle cx="212" cy="140" r="18" fill="#DDD8D0"/>',
-        '            <circle cx="212" cy="140" r="7" fill="#221A18"/>',
-        '            <rect x="248" y="98" width="16" height="10" rx="5" fill="#FFD166" opacity="0.95"/>',
-        '            <rect x="248" y="112" width="11" height="7" rx="3.5" fill="#FFD166" opacity="0.55"/>',
-        '            <rect x="16" y="98" width="16" height="10" rx="5" fill="#FF4444" opacity="0.90"/>',
-        '            <line x1="140" y1="91" x2="140" y2="134" stroke="#E85C28" stroke-width="2" opacity="0.65"/>',
-        '            <rect x="154" y="112" width="17" height="4" rx="2" fill="#D85020" opacity="0.75"/>',
-        '            <rect x="109" y="112" width="17" height="4" rx="2" fill="#D85020" opacity="0.75"/>',
-        '            <rect x="18" y="134" width="24" height="6" rx="3" fill="#D85020" opacity="0.55"/>',
-        '            <rect x="238" y="134" width="24" height="6" rx="3" fill="#D85020" opacity="0.55"/>',
-        '        </svg>',
-        '',
-        '        <!-- Floating price tag -->',
-        '        <div style="position:absolute;top:-8px;right:-14px;',
-        '            background:#FFFFFF;border:2.5px solid #E0D8CE;',
-        '            box-shadow:4px 4px 0px #CFC8BC;border-radius:18px;',
-        '            padding:10px 16px;text-align:center;min-width:90px;">',
-        '            <div style="font-size:0.62rem;font-weight:700;color:#9A8B7C;',
-        '                text-transform:uppercase;letter-spacing:0.06em;margin-bottom:2px;">Est. Value</div>',
-        '            <div style="font-size:1.1rem;font-weight:900;color:#FF6B35;',
-        '                letter-spacing:-0.02em;">₹4.8L</div>',
-        '        </div>',
-        '',
-        '        <!-- Floating year badge -->',
-        '        <div style="position:absolute;bottom:8px;left:-12px;',
-        '            background:#6C63FF;border:2.5px solid #4E46C0;',
-        '            box-shadow:3px 3px 0px #3830A0;border-radius:14px;',
-        '            padding:8px 14px;white-space:nowrap;">',
-        '            <div style="font-size:0.7rem;font-weight:700;color:rgba(255,255,255,0.9);">📍 2026 Market</div>',
-        '        </div>',
-        '    </div>',
-        '</div>'
-    ]
-    st.markdown("".join(hero_lines), unsafe_allow_html=True)
-
-    # ── STAT CARDS ─────────────────────────────────────────────────────────
-    s1, s2, s3, s4 = st.columns(4, gap="medium")
-    s1.markdown(stat_card("🚗", "816+", "Cars Analysed", "Real Quikr listings"), unsafe_allow_html=True)
-    s2.markdown(stat_card("🏭", "25+", "Manufacturers", "Maruti to Mercedes",
-                           bg="#FFFFFF", shadow="#CFC8BC"), unsafe_allow_html=True)
-    s3.markdown(stat_card("🎯", "R² 0.79", "Model Accuracy",
-                           "GradientBoosting",
-                           bg="#FFFFFF", shadow="#CFC8BC",
-                           val_color="#FF6B35"), unsafe_allow_html=True)
-    s4.markdown(stat_card("⚡", "<1 sec", "Prediction Speed", "Instant valuation"), unsafe_allow_html=True)
-
-    st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
-
-    # ── HOW IT WORKS ───────────────────────────────────────────────────────
-    st.markdown("""
+    def price_card(price: float) -> str:
+        lakhs = price / 100_000
+        if lakhs >= 1:
+            display = f"₹{lakhs:.2f}L"
+        else:
+            display = f"₹{price:,.0f}"
+
+        lines = [
+            '<div style="',
+            '    background: linear-gradient(145deg, #1C1640, #261E5A);',
+            '    border-radius: 28px;',
+            '    border: 2.5px solid #3D3280;',
+            '    box-shadow: 8px 8px 0px #0E0A28, 0 24px 60px rgba(108,99,255,0.22);',
+            '    padding: 44px 36px;',
+            '    text-align: center;',
+            '">',
+            '    <div style="',
+            '        color: rgba(200,190,255,0.7); font-size: 0.72rem; font-weight: 700;',
+            '        letter-spacing: 0.12em; text-transform: uppercase; margin-bottom: 14px;',
+            '    ">✦ Estimated Resale Value · 2026 Market</div>',
+            '',
+            '    <div style="',
+            '        color: #FFFFFF; font-size: clamp(2.6rem, 6vw, 4rem);',
+            '        font-weight: 900; letter-spacing: -0.04em; line-height: 1;',
+            '        margin-bottom: 8px;',
+            f'    ">{display}</div>',
+            '',
+            '    <div style="',
+            '        color: rgba(200,190,255,0.55); font-size: 0.78rem; margin-bottom: 28px;',
+            f'    ">= ₹{price:,.0f}</div>',
+            '',
+            '    <div style="',
+            '        display: inline-flex; align-items: center; gap: 8px;',
+            '        background: rgba(108,99,255,0.2); border: 1.5px solid rgba(108,99,255,0.35);',
+            '        border-radius: 100px; padding: 8px 18px;',
+            '">',
+            '        <span style="color: #A89CFF; font-size: 0.8rem; font-weight: 600;">',
+            '            ⚡ GradientBoosting ML — R² 0.79',
+            '        </span>',
+            '    </div>',
+            '</div>'
+        ]
+        return "".join(lines)
+
+
+    # ─── TABS ───────────────────────────────────────────────────────────────
+    show_admin = ADMIN or st.query_params.get("admin") == "1"
+    tab1, tab2, tab3, tab4, *admin_tab = st.tabs(
+        ["🏠  Home", "🎯  Predict", "📊  Insights", "ℹ️  About"] + (["🛠️  Admin"] if show_admin else [])
+    )
+
+
+    # ════════════════════════════════════════════════════════════════════════
+    # TAB 1 — HOME
+    # ════════════════════════════════════════════════════════════════════════
+    with tab1, startup.phase("render Home tab"):
+
+        # ── HERO CARD ──────────────────────────────────────────────────────────
+        hero_lines = [
+            '<div style="',
+            '    background: linear-gradient(135deg, #FFFFFF 0%, #FFF6EF 100%);',
+            '    border-radius: 32px;',
+            '    border: 2.5px solid #E0D8CE;',
+            '    box-shadow: 10px 10px 0px #CFC8BC, 0 30px 80px rgba(60,40,20,0.08);',
+            '    padding: 52px 56px;',
+            '    margin-bottom: 28px;',
+            '    display: flex;',
+            '    align-items: center;',
+            '    justify-content: space-between;',
+            '    gap: 32px;',
+            '    overflow: hidden;',
+            '    position: relative;',
+            '    flex-wrap: wrap;',
+            '">',
+            '    <!-- BG blobs -->',
+            '    <div style="position:absolute;top:-60px;right:-40px;width:300px;height:300px;',
+            '        background:radial-gradient(circle,rgba(255,107,53,0.10) 0%,transparent 70%);',
+            '        border-radius:50%;pointer-events:none;"></div>',
+            '    <div style="position:absolute;bottom:-80px;left:260px;width:240px;height:240px;',
+            '        background:radial-gradient(circle,rgba(108,99,255,0.07) 0%,transparent 70%);',
+            '        border-radius:50%;pointer-events:none;"></div>',
+            '',
+            '    <!-- Left: text -->',
+            '    <div style="flex:1;min-width:260px;max-width:520px;position:relative;z-index:1;">',
+            '        <div style="display:inline-flex;align-items:center;gap:8px;',
+            '            background:rgba(255,107,53,0.10);border:1.5px solid rgba(255,107,53,0.22);',
+            '            border-radius:100px;padding:6px 16px;margin-bottom:22px;">',
+            '            <div style="width:7px;height:7px;background:#FF6B35;border-radius:50%;"></div>',
+            '            <span style="color:#FF6B35;font-size:0.75rem;font-weight:700;',
+            '                letter-spacing:0.06em;text-transform:uppercase;">AI-Powered Valuation</span>',
+            '        </div>',
+            '',
+            '        <h1 style="font-size:clamp(2rem,4vw,3.2rem);font-weight:900;color:#1A1210;',
+            '            letter-spacing:-0.04em;line-height:1.08;margin-bottom:16px;">',
+            '            Know Your Car\'s<br>',
+            '            <span style="background:linear-gradient(135deg,#FF6B35,#FF8C5A);',
+            '                -webkit-background-clip:text;-webkit-text-fill-color:transparent;',
+            '                background-clip:text;">True Worth.</span>',
+            '        </h1>',
+            '',
+            '        <p style="color:#7A6B5C;font-size:1rem;line-height:1.72;',
+            '            margin-bottom:26px;max-width:400px;">',
+            '            India\'s accurate used car price predictor — trained on <strong style="color:#1A1210;">800+',
+            '            real Quikr listings</strong> with 2026 market price correction.',
+            '        </p>',
+            '',
+            '        <div style="display:flex;gap:10px;flex-wrap:wrap;">',
+            '            <div style="background:#F8F3EC;border:2px solid #E0D8CE;border-radius:100px;',
+            '                padding:8px 18px;font-size:0.81rem;font-weight:700;color:#5C4E3E;">',
+            '                ✓ 25+ Brands',
+            '            </div>',
+            '            <div style="background:#EDFBF4;border:2px solid #B8EDD4;border-radius:100px;',
+            '                padding:8px 18px;font-size:0.81rem;font-weight:700;color:#1A7040;">',
+            '                ✓ 2026 Prices',
+            '            </div>',
+            '            <div style="background:#EEEEFF;border:2px solid #C4BEFF;border-radius:100px;',
+            '                padding:8px 18px;font-size:0.81rem;font-weight:700;color:#3A30A0;">',
+            '                ✓ Instant Result',
+            '            </div>',
+            '        </div>',
+            '    </div>',
+            '',
+            '    <!-- Right: car SVG + floating badges -->',
+            '    <div style="flex-shrink:0;position:relative;width:280px;height:190px;">',
+            '        <svg viewBox="0 0 280 160" width="280" height="160" xmlns="http://www.w3.org/2000/svg">',
+            '            <ellipse cx="140" cy="156" rx="112" ry="7" fill="rgba(0,0,0,0.09)"/>',
+            '            <rect x="15" y="86" width="250" height="55" rx="27" fill="#FF6B35"/>',
+            '            <rect x="15" y="86" width="250" height="22" rx="22" fill="#FF8C5A" opacity="0.45"/>',
+            '            <path d="M64,86 Q89,40 120,35 L160,35 Q191,40 216,86 Z" fill="#FF6B35"/>',
+            '            <path d="M74,86 Q97,48 124,43 L156,43 Q183,48 206,86 Z" fill="#FF8C5A" opacity="0.40"/>',
+            '            <path d="M86,86 Q109,57 127,51 L153,51 Q171,57 194,86 Z" fill="#B8DEF0" opacity="0.88"/>',
+            '            <path d="M96,86 Q113,67 127,62 L141,62 Q150,65 160,73"',
+            '                stroke="white" stroke-width="2.5" fill="none" opacity="0.55" stroke-linecap="round"/>',
+            '            <circle cx="68" cy="140" r="28" fill="#221A18"/>',
+            '            <circle cx="68" cy="140" r="18" fill="#DDD8D0"/>',
+            '            <circle cx="68" cy="140" r="7" fill="#221A18"/>',
+            '            <circle cx="212" cy="140" r="28" fill="#221A18"/>',
+            '            <circle cx="212" cy="140" r="18" fill="#DDD8D0"/>',
+            '            <circle cx="212" cy="140" r="7" fill="#221A18"/>',
+            '            <rect x="248" y="98" width="16" height="10" rx="5" fill="#FFD166" opacity="0.95"/>',
+            '            <rect x="248" y="112" width="11" height="7" rx="3.5" fill="#FFD166" opacity="0.55"/>',
+            '            <rect x="16" y="98" width="16" height="10" rx="5" fill="#FF4444" opacity="0.90"/>',
+            '            <line x1="140" y1="91" x2="140" y2="134" stroke="#E85C28" stroke-width="2" opacity="0.65"/>',
+            '            <rect x="154" y="112" width="17" height="4" rx="2" fill="#D85020" opacity="0.75"/>',
+            '            <rect x="109" y="112" width="17" height="4" rx="2" fill="#D85020" opacity="0.75"/>',
+            '            <rect x="18" y="134" width="24" height="6" rx="3" fill="#D85020" opacity="0.55"/>',
+            '            <rect x="238" y="134" width="24" height="6" rx="3" fill="#D85020" opacity="0.55"/>',
+            '        </svg>',
+            '',
+            '        <!-- Floating price tag -->',
+            '        <div style="position:absolute;top:-8px;right:-14px;',
+            '            background:#FFFFFF;border:2.5px solid #E0D8CE;',
+            '            box-shadow:4px 4px 0px #CFC8BC;border-radius:18px;',
+            '            padding:10px 16px;text-align:center;min-width:90px;">',
+            '            <div style="font-size:0.62rem;font-weight:700;color:#9A8B7C;',
+            '                text-transform:uppercase;letter-spacing:0.06em;margin-bottom:2px;">Est. Value</div>',
+            '            <div style="font-size:1.1rem;font-weight:900;color:#FF6B35;',
+            '                letter-spacing:-0.02em;">₹4.8L</div>',
+            '        </div>',
+            '',
+            '        <!-- Floating year badge -->',
+            '        <div style="position:absolute;bottom:8px;left:-12px;',
+            '            background:#6C63FF;border:2.5px solid #4E46C0;',
+            '            box-shadow:3px 3px 0px #3830A0;border-radius:14px;',
+            '            padding:8px 14px;white-space:nowrap;">',
+            '            <div style="font-size:0.7rem;font-weight:700;color:rgba(255,255,255,0.9);">📍 2026 Market</div>',
+            '        </div>',
+            '    </div>',
+            '</div>'
+        ]
+        st.markdown("".join(hero_lines), unsafe_allow_html=True)
+
+        # ── STAT CARDS ─────────────────────────────────────────────────────────
+        s1, s2, s3, s4 = st.columns(4, gap="medium")
+        s1.markdown(stat_card("🚗", "816+", "Cars Analysed", "Real Quikr listings"), unsafe_allow_html=True)
+        s2.markdown(stat_card("🏭", "25+", "Manufacturers", "Maruti to Mercedes",
+                               bg="#FFFFFF", shadow="#CFC8BC"), unsafe_allow_html=True)
+        s3.markdown(stat_card("🎯", "R² 0.79", "Model Accuracy",
+                               "GradientBoosting",
+                               bg="#FFFFFF", shadow="#CFC8BC",
+                               val_color="#FF6B35"), unsafe_allow_html=True)
+        s4.markdown(stat_card("⚡", "<1 sec", "Prediction Speed", "Instant valuation"), unsafe_allow_html=True)
+
+        st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
+
+        # ── HOW IT WORKS ───────────────────────────────────────────────────────
+        st.markdown("""
     <div style="margin:12px 0 20px;">
         <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.1em;
             text-transform:uppercase;margin-bottom:8px;">How It Works</p>
@@ -490,19 +668,19 @@ with tab1:
     </div>
     """, unsafe_allow_html=True)
 
-    h1, h2, h3 = st.columns(3, gap="medium")
-    h1.markdown(step_card("01", "Select Your Car",
-        "Pick manufacturer, model, fuel type, year, and kilometers driven from our dropdowns.",
-        "#FFF0EA", "#FF6B35"), unsafe_allow_html=True)
-    h2.markdown(step_card("02", "ML Model Analyses",
-        "GradientBoosting pipeline trained on 800+ real listings processes your inputs instantly.",
-        "#EEEEFF", "#6C63FF"), unsafe_allow_html=True)
-    h3.markdown(step_card("03", "Get Your Valuation",
-        "Receive the estimated 2026 market price with context from similar car listings.",
-        "#EDFBF4", "#1A7040"), unsafe_allow_html=True)
-
-    # ── FOOTER ─────────────────────────────────────────────────────────────
-    st.markdown("""
+        h1, h2, h3 = st.columns(3, gap="medium")
+        h1.markdown(step_card("01", "Select Your Car",
+            "Pick manufacturer, model, fuel type, year, and kilometers driven from our dropdowns.",
+            "#FFF0EA", "#FF6B35"), unsafe_allow_html=True)
+        h2.markdown(step_card("02", "ML Model Analyses",
+            "GradientBoosting pipeline trained on 800+ real listings processes your inputs instantly.",
+            "#EEEEFF", "#6C63FF"), unsafe_allow_html=True)
+        h3.markdown(step_card("03", "Get Your Valuation",
+            "Receive the estimated 2026 market price with context from similar car listings.",
+            "#EDFBF4", "#1A7040"), unsafe_allow_html=True)
+
+        # ── FOOTER ─────────────────────────────────────────────────────────────
+        st.markdown("""
     <div style="text-align:center;padding:40px 0 20px;
         color:#9A8B7C;font-size:0.78rem;letter-spacing:0.03em;">
         CarWorthML · BCA Major Project · Abhishek Gupta · JEMTEC, Greater Noida · 2022–2025
@@ -510,124 +688,87 @@ with tab1:
     """, unsafe_allow_html=True)
 
 
-# ════════════════════════════════════════════════════════════════════════════
-# TAB 2 — PREDICT
-# ════════════════════════════════════════════════════════════════════════════
-with tab2:
+    # ════════════════════════════════════════════════════════════════════════
+    # TAB 2 — PREDICT
+    # ════════════════════════════════════════════════════════════════════════
+    with tab2, startup.phase("render Predict tab"):
 
-    @st.cache_data
-    def load_data():
-        return pd.read_csv("Cleaned_Car_data.csv")
+        @metered_fragment
+        def predict_panel(catalog, model, model_version, log_transform):
+            """Vehicle form and result card."""
+            form_col, result_col = st.columns([1.05, 0.95], gap="large")
 
-    @st.cache_resource
-    def load_model():
-        with open("LinearRegressionModel.pkl", "rb") as f:
-            return pickle.load(f)
+            if "predict_clicked" not in st.session_state:
+                st.session_state.predict_clicked = False
 
-    def uses_log_transform() -> bool:
-        if os.path.exists("model_meta.pkl"):
-            with open("model_meta.pkl", "rb") as f:
-                meta = pickle.load(f)
-            return meta.get("log_transform", False)
-        return False
-
-    data_ok = model_ok = False
-    try:
-        df = load_data()
-        data_ok = True
-    except FileNotFoundError:
-        st.error("❌ Cleaned_Car_data.csv not found. Run `python data_cleaning.py` first.")
-
-    try:
-        model = load_model()
-        model_ok = True
-    except FileNotFoundError:
-        st.error("❌ LinearRegressionModel.pkl not found. Run `python model_training.py` first.")
-
-    if data_ok and model_ok:
-        log_transform = uses_log_transform()
+            # ── LEFT: FORM ─────────────────────────────────────────────────────
+            with form_col:
+                st.markdown("<div id='form_col_marker'></div>", unsafe_allow_html=True)
+                companies_sorted = catalog["companies"]
 
-        st.markdown("""
-        <div style="margin:8px 0 28px;">
-            <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.1em;
-                text-transform:uppercase;margin-bottom:6px;">Price Predictor</p>
-            <h2 style="color:#1A1210;font-size:1.7rem;font-weight:900;
-                letter-spacing:-0.03em;margin-bottom:4px;">Get Your Car's Market Value</h2>
-            <p style="color:#7A6B5C;font-size:0.9rem;">
-                Fill in your vehicle details for an instant 2026 market valuation.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+                st.markdown("""
+            <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
+                text-transform:uppercase;margin-bottom:18px;">Vehicle Details</p>
+            """, unsafe_allow_html=True)
 
-        form_col, result_col = st.columns([1.05, 0.95], gap="large")
+                # Manufacturer
+                company = st.selectbox(
+                    "Manufacturer",
+                    options=companies_sorted,
+                    help="Choose the car brand"
+                )
+
+                # Model filtered by company
+                models_for_company = catalog["models"][company]
+                car_name = st.selectbox(
+                    "Model",
+                    options=models_for_company,
+                    help="Select the specific model variant"
+                )
+                variant = catalog["variants"][company][car_name]
+                years = (f"{variant['year_min']}" if variant["year_min"] == variant["year_max"]
+                         else f"{variant['year_min']}–{variant['year_max']}")
+                st.caption(f"Listed as {', '.join(variant['fuel_types'])} · {years}")
+
+                # KMs — outside the form so the caption follows every edit
+                kms_driven = st.number_input(
+                    "Kilometers Driven",
+                    min_value=0,
+                    max_value=500_000,
+                    value=50_000,
+                    step=1_000,
+                )
+
+                st.caption(f"≈ {kms_driven // 15000} years of average Indian city driving")
+
+                # The rest only matters once submitted, so editing it sends nothing
+                with st.form("predict_form", border=False):
+                    # Fuel type
+                    fuel_type = st.selectbox(
+                        "Fuel Type",
+                        options=catalog["fuel_types"],
+                        help="Select fuel type"
+                    )
 
-        if "predict_clicked" not in st.session_state:
-            st.session_state.predict_clicked = False
+                    # Year
+                    year = st.slider(
+                        "Year of Manufacture",
+                        min_value=2000,
+                        max_value=2024,
+                        value=2015,
+                        step=1,
+                    )
 
-        # ── LEFT: FORM ─────────────────────────────────────────────────────
-        with form_col:
-            st.markdown("<div id='form_col_marker'></div>", unsafe_allow_html=True)
-            companies_sorted = sorted(df["company"].unique())
+                    st.markdown("<div style='height:10px;'></div>", unsafe_allow_html=True)
 
-            st.markdown("""
-            <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
-                text-transform:uppercase;margin-bottom:18px;">Vehicle Details</p>
-            """, unsafe_allow_html=True)
+                    if st.form_submit_button("🚀  Predict Price →", use_container_width=True):
+                        st.session_state.predict_clicked = True
 
-            # Manufacturer
-            company = st.selectbox(
-                "Manufacturer",
-                options=companies_sorted,
-                help="Choose the car brand"
-            )
-
-            # Model filtered by company
-            models_for_company = sorted(
-                df[df["company"] == company]["name"].unique()
-            )
-            car_name = st.selectbox(
-                "Model",
-                options=models_for_company,
-                help="Select the specific model variant"
-            )
-
-            # Fuel type
-            fuel_type = st.selectbox(
-                "Fuel Type",
-                options=sorted(df["fuel_type"].unique()),
-                help="Select fuel type"
-            )
-
-            # Year
-            year = st.slider(
-                "Year of Manufacture",
-                min_value=2000,
-                max_value=2024,
-                value=2015,
-                step=1,
-            )
-
-            # KMs
-            kms_driven = st.number_input(
-                "Kilometers Driven",
-                min_value=0,
-                max_value=500_000,
-                value=50_000,
-                step=1_000,
-            )
-
-            st.caption(f"≈ {kms_driven // 15000} years of average Indian city driving")
-
-            st.markdown("<div style='height:10px;'></div>", unsafe_allow_html=True)
-
-            if st.button("🚀  Predict Price →", use_container_width=True):
-                st.session_state.predict_clicked = True
-
-        # ── RIGHT: RESULT ──────────────────────────────────────────────────
-        with result_col:
-
-            if not st.session_state.predict_clicked:
-                st.markdown("""
+            # ── RIGHT: RESULT ──────────────────────────────────────────────────
+            with result_col:
+
+                if not st.session_state.predict_clicked:
+                    st.markdown("""
                 <div style="
                     background: #FFFFFF;
                     border-radius: 28px;
@@ -650,62 +791,76 @@ with tab2:
                 </div>
                 """, unsafe_allow_html=True)
 
-            else:
-                try:
-                    input_df = pd.DataFrame(
-                        [[car_name, company, year, kms_driven, fuel_type]],
-                        columns=["name", "company", "year", "kms_driven", "fuel_type"],
-                    )
-                    pred_raw = model.predict(input_df)[0]
-                    price = float(np.exp(pred_raw) if log_transform else pred_raw)
-                    price = max(price, 40_000.0)
-
-                    # Price display card - fixed to not markdown inside clay_card
-                    html_content = price_card(price)
-                    st.markdown(html_content, unsafe_allow_html=True)
-
-                    # Similar cars context
-                    similar = df[
-                        (df["company"] == company) &
-                        (df["fuel_type"] == fuel_type) &
-                        (df["year"].between(year - 2, year + 2))
-                    ]
-
-                    if len(similar) >= 3:
-                        st.markdown("""
+                else:
+                    try:
+                        cache = get_prediction_cache()
+                        cache_key = cache.key(car_name, company, year, fuel_type, kms_driven)
+                        price = cache.get(cache_key, model_version)
+                        metrics.count("prediction_cache_hit" if price is not None else "prediction_cache_miss")
+                        if price is None:
+                            with metrics.timer("build_input"):
+                                # Priced at the bucket's kms, so every input in it gets the same price
+                                input_df = pd.DataFrame(
+                                    [[car_name, company, year, cache.bucket_kms(kms_driven), fuel_type]],
+                                    columns=["name", "company", "year", "kms_driven", "fuel_type"],
+                                )
+                            with metrics.timer("predict"):
+                                pred_raw = model.predict(input_df)
+                            price = float(inference.to_price(pred_raw, log_transform)[0])
+                            cache.put(cache_key, model_version, price)
+
+                        # Price display card - fixed to not markdown inside clay_card
+                        html_content = price_card(price)
+                        st.markdown(html_content, unsafe_allow_html=True)
+
+                        # Similar cars context — nearest real listings by year and kms
+                        with metrics.timer("similar_cars"):
+                            similar = load_comparables().query(
+                                company, fuel_type, year, kms_driven, k=SIMILAR_CARS_K
+                            )
+
+                        if len(similar) >= 3:
+                            st.markdown("""
                         <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;
                             letter-spacing:0.09em;text-transform:uppercase;
                             margin:22px 0 12px;">Similar Cars in Dataset</p>
                         """, unsafe_allow_html=True)
 
-                        m1, m2, m3 = st.columns(3)
-                        m1.metric("Min", f"₹{similar['Price'].min()/100000:.1f}L")
-                        m2.metric("Avg", f"₹{similar['Price'].mean()/100000:.1f}L")
-                        m3.metric("Max", f"₹{similar['Price'].max()/100000:.1f}L")
+                            m1, m2, m3 = st.columns(3)
+                            m1.metric("Min", f"₹{similar.min/100000:.1f}L")
+                            m2.metric("Avg", f"₹{similar.mean/100000:.1f}L")
+                            m3.metric("Max", f"₹{similar.max/100000:.1f}L")
+                            st.caption(f"{len(similar)} closest {company} {fuel_type} listings "
+                                       f"within ±2 years of {year}")
 
-                    # Summary table
-                    st.markdown("""
+                        # Summary table
+                        st.markdown("""
                     <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;
                         letter-spacing:0.09em;text-transform:uppercase;
                         margin:22px 0 12px;">Input Summary</p>
                     """, unsafe_allow_html=True)
 
-                    st.dataframe(
-                        pd.DataFrame({
-                            "Parameter": ["Manufacturer", "Model", "Year",
-                                          "Fuel", "KMs Driven", "Predicted Price"],
-                            "Value": [
-                                company, car_name, str(year),
-                                fuel_type, f"{kms_driven:,} km",
-                                f"₹{price:,.0f}",
-                            ],
-                        }),
-                        use_container_width=True,
-                        hide_index=True,
-                    )
-
-                except Exception as e:
-                    st.markdown(clay_card(f"""
+                        st.dataframe(
+                            pd.DataFrame({
+                                "Parameter": ["Manufacturer", "Model", "Year",
+                                              "Fuel", "KMs Driven", "Predicted Price"],
+                                "Value": [
+                                    company, car_name, str(year),
+                                    fuel_type, f"{kms_driven:,} km",
+                                    f"₹{price:,.0f}",
+                                ],
+                            }),
+                            use_container_width=True,
+                            hide_index=True,
+                        )
+
+                        cache_stats = cache.stats()
+                        st.caption(f"Prediction cache · {cache_stats['hits']} hits · "
+                                   f"{cache_stats['misses']} misses · "
+                                   f"{cache_stats['size']}/{cache_stats['max_size']} entries")
+
+                    except Exception as e:
+                        st.markdown(clay_card(f"""
                     <p style="color:#CC4010;font-size:0.9rem;font-weight:700;margin-bottom:8px;">
                         Prediction error
                     </p>
@@ -715,49 +870,86 @@ with tab2:
                     </p>
                     """), unsafe_allow_html=True)
 
+            # ── DEPRECIATION CURVES ────────────────────────────────────────────
+            # Every year × kms bucket for this car in one predict call, so exploring
+            # age and mileage needs no further clicks
+            if st.session_state.predict_clicked:
+                st.markdown(f"""
+            <div style="margin:36px 0 16px;">
+                <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.1em;
+                    text-transform:uppercase;margin-bottom:6px;">What If</p>
+                <h3 style="color:#1A1210;font-size:1.3rem;font-weight:800;
+                    letter-spacing:-0.02em;margin-bottom:4px;">Depreciation Curve · {car_name}</h3>
+                <p style="color:#7A6B5C;font-size:0.86rem;">
+                    Predicted {fuel_type} price for every year of manufacture, one line per odometer reading.
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+                try:
+                    curves = load_depreciation_curves(car_name, company, fuel_type, model_version)
+                    st.line_chart(curves, use_container_width=True, height=320,
+                                  color=["#FF6B35", "#C84A10", "#9A8B7C", "#1A1210"][:curves.shape[1]])
+                    st.caption(f"{curves.size} predictions · one batched model call, cached per car and fuel type")
+                except Exception as e:
+                    st.caption(f"Depreciation curve unavailable: {e}")
+
+        data_ok = model_ok = False
+        try:
+            with metrics.timer("load_data"):
+                df = load_data()
+            data_ok = True
+        except FileNotFoundError:
+            st.error("❌ Cleaned_Car_data.csv not found. Run `python data_cleaning.py` first.")
+
+        try:
+            model_version = inference.artifact_version()
+            with metrics.timer("load_model"):
+                model = load_model(model_version)
+            model_ok = True
+        except FileNotFoundError:
+            st.error("❌ No trained model (model_bundle/ or LinearRegressionModel.pkl) found. "
+                     "Run `python model_training.py` first.")
+
+        if data_ok and model_ok:
+            with metrics.timer("uses_log_transform"):
+                log_transform = uses_log_transform()
+            catalog = load_catalog()
 
-# ════════════════════════════════════════════════════════════════════════════
-# TAB 3 — INSIGHTS
-# ════════════════════════════════════════════════════════════════════════════
-with tab3:
-
-    @st.cache_data
-    def load_data_insights():
-        return pd.read_csv("Cleaned_Car_data.csv")
-
-    try:
-        df3 = load_data_insights()
-        insights_ok = True
-    except FileNotFoundError:
-        st.error("❌ Cleaned_Car_data.csv not found.")
-        insights_ok = False
-
-    if insights_ok:
-
-        st.markdown("""
+            st.markdown("""
         <div style="margin:8px 0 28px;">
             <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.1em;
-                text-transform:uppercase;margin-bottom:6px;">Market Intelligence</p>
+                text-transform:uppercase;margin-bottom:6px;">Price Predictor</p>
             <h2 style="color:#1A1210;font-size:1.7rem;font-weight:900;
-                letter-spacing:-0.03em;margin-bottom:4px;">Market Insights</h2>
+                letter-spacing:-0.03em;margin-bottom:4px;">Get Your Car's Market Value</h2>
             <p style="color:#7A6B5C;font-size:0.9rem;">
-                Price trends, brand comparisons, and fuel-type analysis across 816 listings.
+                Fill in your vehicle details for an instant 2026 market valuation.
             </p>
         </div>
         """, unsafe_allow_html=True)
 
-        # KPI metrics row
-        k1, k2, k3, k4, k5 = st.columns(5)
-        k1.metric("Total Records",   f"{len(df3):,}")
-        k2.metric("Avg Price",       f"₹{df3['Price'].mean()/100000:.1f}L")
-        k3.metric("Lowest",          f"₹{df3['Price'].min()/1000:.0f}K")
-        k4.metric("Highest",         f"₹{df3['Price'].max()/100000:.1f}L")
-        k5.metric("Brands",          f"{df3['company'].nunique()}")
+            predict_panel(catalog, model, model_version, log_transform)
 
-        st.markdown("<div style='height:12px;'></div>", unsafe_allow_html=True)
 
-        # ── CHART 1: Avg Price by Manufacturer ─────────────────────────────
-        st.markdown("""
+    # ════════════════════════════════════════════════════════════════════════
+    # TAB 3 — INSIGHTS
+    # ════════════════════════════════════════════════════════════════════════
+    with tab3, startup.phase("render Insights tab"):
+
+        @metered_fragment
+        def insights_charts(cube):
+            """KPIs, charts and the raw-data sample, all read from the aggregate cube."""
+            # KPI metrics row
+            k1, k2, k3, k4, k5 = st.columns(5)
+            k1.metric("Total Records",   f"{cube.count:,}")
+            k2.metric("Avg Price",       f"₹{cube.mean/100000:.1f}L")
+            k3.metric("Lowest",          f"₹{cube.min/1000:.0f}K")
+            k4.metric("Highest",         f"₹{cube.max/100000:.1f}L")
+            k5.metric("Brands",          f"{cube.n_companies}")
+
+            st.markdown("<div style='height:12px;'></div>", unsafe_allow_html=True)
+
+            # ── CHART 1: Avg Price by Manufacturer ─────────────────────────────
+            st.markdown("""
         <div style="margin-bottom:16px;">
             <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;
                 letter-spacing:0.09em;text-transform:uppercase;margin-bottom:4px;">Chart 01</p>
@@ -769,36 +961,36 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
 
-        avg_co = (
-            df3.groupby("company")["Price"]
-            .mean()
-            .sort_values(ascending=False)
-            .reset_index()
-        )
-        avg_co.columns = ["Manufacturer", "Average Price"]
-        avg_co["Average Price"] = avg_co["Average Price"].astype(int)
+            with metrics.timer("insights_brand_prices"):
+                avg_co = (
+                    cube.rollup("company")["mean"]
+                    .sort_values(ascending=False)
+                    .reset_index()
+                )
+                avg_co.columns = ["Manufacturer", "Average Price"]
+                avg_co["Average Price"] = avg_co["Average Price"].astype(int)
 
-        c_lux, c_mass = st.columns(2, gap="large")
+            c_lux, c_mass = st.columns(2, gap="large")
 
-        lux = avg_co[avg_co["Average Price"] >= 600_000]
-        mass = avg_co[avg_co["Average Price"] < 600_000]
+            lux = avg_co[avg_co["Average Price"] >= 600_000]
+            mass = avg_co[avg_co["Average Price"] < 600_000]
 
-        with c_lux:
-            st.caption("Luxury & Premium segment")
-            if not lux.empty:
-                st.bar_chart(lux, x="Manufacturer", y="Average Price",
-                             use_container_width=True, height=300, color="#FF6B35")
+            with c_lux:
+                st.caption("Luxury & Premium segment")
+                if not lux.empty:
+                    st.bar_chart(lux, x="Manufacturer", y="Average Price",
+                                 use_container_width=True, height=300, color="#FF6B35")
 
-        with c_mass:
-            st.caption("Mass market segment")
-            if not mass.empty:
-                st.bar_chart(mass, x="Manufacturer", y="Average Price",
-                             use_container_width=True, height=300, color="#6C63FF")
+            with c_mass:
+                st.caption("Mass market segment")
+                if not mass.empty:
+                    st.bar_chart(mass, x="Manufacturer", y="Average Price",
+                                 use_container_width=True, height=300, color="#6C63FF")
 
-        st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
+            st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
 
-        # ── CHART 2: Fuel type ──────────────────────────────────────────────
-        st.markdown("""
+            # ── CHART 2: Fuel type ──────────────────────────────────────────────
+            st.markdown("""
         <div style="margin:20px 0 16px;">
             <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;
                 letter-spacing:0.09em;text-transform:uppercase;margin-bottom:4px;">Chart 02</p>
@@ -810,35 +1002,36 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
 
-        f1, f2 = st.columns([1, 1], gap="large")
-
-        with f1:
-            avg_fuel = (
-                df3.groupby("fuel_type")["Price"]
-                .agg(["mean", "median"])
-                .reset_index()
-            )
-            avg_fuel.columns = ["Fuel Type", "Average Price", "Median Price"]
-            avg_fuel["Average Price"]    = avg_fuel["Average Price"].astype(int)
-            avg_fuel["Median Price"] = avg_fuel["Median Price"].astype(int)
-            st.bar_chart(
-                avg_fuel,
-                x="Fuel Type", y=["Average Price", "Median Price"],
-                use_container_width=True, height=280,
-                color=["#FF6B35", "#6C63FF"],
-            )
-
-        with f2:
-            st.markdown("<p style='color:#9A8B7C;font-size:0.78rem;font-weight:600;"
-                        "margin-bottom:14px;'>Listing Count by Fuel Type</p>",
-                        unsafe_allow_html=True)
-            fuel_counts = df3["fuel_type"].value_counts()
-            total = len(df3)
-            palette = {"Diesel": "#FF6B35", "Petrol": "#6C63FF", "LPG": "#FFD166"}
-            for fuel, count in fuel_counts.items():
-                pct = count / total * 100
-                color = palette.get(fuel, "#9A8B7C")
-                st.markdown(f"""
+            f1, f2 = st.columns([1, 1], gap="large")
+
+            with f1:
+                with metrics.timer("insights_fuel_prices"):
+                    avg_fuel = (
+                        cube.rollup("fuel_type", median=True)[["mean", "median"]]
+                        .reset_index()
+                    )
+                    avg_fuel.columns = ["Fuel Type", "Average Price", "Median Price"]
+                    avg_fuel["Average Price"]    = avg_fuel["Average Price"].astype(int)
+                    avg_fuel["Median Price"] = avg_fuel["Median Price"].astype(int)
+                st.bar_chart(
+                    avg_fuel,
+                    x="Fuel Type", y=["Average Price", "Median Price"],
+                    use_container_width=True, height=280,
+                    color=["#FF6B35", "#6C63FF"],
+                )
+
+            with f2:
+                st.markdown("<p style='color:#9A8B7C;font-size:0.78rem;font-weight:600;"
+                            "margin-bottom:14px;'>Listing Count by Fuel Type</p>",
+                            unsafe_allow_html=True)
+                with metrics.timer("insights_fuel_counts"):
+                    fuel_counts = cube.rollup("fuel_type")["count"].sort_values(ascending=False)
+                total = cube.count
+                palette = {"Diesel": "#FF6B35", "Petrol": "#6C63FF", "LPG": "#FFD166"}
+                for fuel, count in fuel_counts.items():
+                    pct = count / total * 100
+                    color = palette.get(fuel, "#9A8B7C")
+                    st.markdown(f"""
                 <div style="background:#FFFFFF;border:2.5px solid #E0D8CE;
                     box-shadow:4px 4px 0px #CFC8BC;
                     border-radius:16px;padding:14px 20px;
@@ -856,10 +1049,10 @@ with tab3:
                 </div>
                 """, unsafe_allow_html=True)
 
-        st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
+            st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
 
-        # ── CHART 3: Price by Year ──────────────────────────────────────────
-        st.markdown("""
+            # ── CHART 3: Price by Year ──────────────────────────────────────────
+            st.markdown("""
         <div style="margin:20px 0 16px;">
             <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;
                 letter-spacing:0.09em;text-transform:uppercase;margin-bottom:4px;">Chart 03</p>
@@ -871,21 +1064,21 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
 
-        price_yr = (
-            df3.groupby("year")["Price"]
-            .mean()
-            .reset_index()
-            .sort_values("year")
-        )
-        price_yr.columns = ["Year", "Average Price"]
-        price_yr["Average Price"] = price_yr["Average Price"].astype(int)
-        st.line_chart(price_yr, x="Year", y="Average Price",
-                      use_container_width=True, height=300, color="#FF6B35")
+            with metrics.timer("insights_price_by_year"):
+                price_yr = (
+                    cube.rollup("year")["mean"]
+                    .reset_index()
+                    .sort_values("year")
+                )
+                price_yr.columns = ["Year", "Average Price"]
+                price_yr["Average Price"] = price_yr["Average Price"].astype(int)
+            st.line_chart(price_yr, x="Year", y="Average Price",
+                          use_container_width=True, height=300, color="#FF6B35")
 
-        st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
+            st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
 
-        # ── CHART 4: Top brands by listing count ───────────────────────────
-        st.markdown("""
+            # ── CHART 4: Top brands by listing count ───────────────────────────
+            st.markdown("""
         <div style="margin:20px 0 16px;">
             <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;
                 letter-spacing:0.09em;text-transform:uppercase;margin-bottom:4px;">Chart 04</p>
@@ -897,27 +1090,52 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
 
-        top10 = df3["company"].value_counts().head(10).reset_index()
-        top10.columns = ["Manufacturer", "Listings"]
-        st.bar_chart(top10, x="Manufacturer", y="Listings",
-                     use_container_width=True, height=300, color="#4ECDC4")
+            with metrics.timer("insights_top_brands"):
+                top10 = cube.rollup("company")["count"].sort_values(ascending=False).head(10).reset_index()
+                top10.columns = ["Manufacturer", "Listings"]
+            st.bar_chart(top10, x="Manufacturer", y="Listings",
+                         use_container_width=True, height=300, color="#4ECDC4")
+
+            # ── RAW DATA EXPANDER ───────────────────────────────────────────────
+            st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
+            with st.expander("📋  View raw dataset sample (first 20 rows)"):
+                sample = load_data_sample()
+                st.dataframe(sample, use_container_width=True, hide_index=True)
+                st.caption(
+                    f"Showing {len(sample)} of {cube.count:,} records · {sample.shape[1]} columns · "
+                    f"Source: Quikr India used car listings (2019–2020) + 1.55× 2026 market correction"
+                )
+
+        try:
+            cube = load_cube()
+            insights_ok = True
+        except FileNotFoundError:
+            st.error("❌ Cleaned_Car_data.csv not found.")
+            insights_ok = False
+
+        if insights_ok:
 
-        # ── RAW DATA EXPANDER ───────────────────────────────────────────────
-        st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
-        with st.expander("📋  View raw dataset sample (first 20 rows)"):
-            st.dataframe(df3.head(20), use_container_width=True, hide_index=True)
-            st.caption(
-                f"Showing 20 of {len(df3):,} records · {df3.shape[1]} columns · "
-                f"Source: Quikr India used car listings (2019–2020) + 1.55× 2026 market correction"
-            )
+            st.markdown("""
+        <div style="margin:8px 0 28px;">
+            <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.1em;
+                text-transform:uppercase;margin-bottom:6px;">Market Intelligence</p>
+            <h2 style="color:#1A1210;font-size:1.7rem;font-weight:900;
+                letter-spacing:-0.03em;margin-bottom:4px;">Market Insights</h2>
+            <p style="color:#7A6B5C;font-size:0.9rem;">
+                Price trends, brand comparisons, and fuel-type analysis across 816 listings.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
+            insights_charts(cube)
 
-# ════════════════════════════════════════════════════════════════════════════
-# TAB 4 — ABOUT
-# ════════════════════════════════════════════════════════════════════════════
-with tab4:
 
-    st.markdown("""
+    # ════════════════════════════════════════════════════════════════════════
+    # TAB 4 — ABOUT
+    # ════════════════════════════════════════════════════════════════════════
+    with tab4, startup.phase("render About tab"):
+
+        st.markdown("""
     <div style="margin:8px 0 28px;">
         <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.1em;
             text-transform:uppercase;margin-bottom:6px;">Project Info</p>
@@ -929,10 +1147,10 @@ with tab4:
     </div>
     """, unsafe_allow_html=True)
 
-    id1, id2 = st.columns(2, gap="large")
+        id1, id2 = st.columns(2, gap="large")
 
-    with id1:
-        st.markdown(clay_card("""
+        with id1:
+            st.markdown(clay_card("""
         <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
             text-transform:uppercase;margin-bottom:18px;">Student Details</p>
         <table style="width:100%;border-collapse:collapse;">
@@ -974,8 +1192,8 @@ with tab4:
         </table>
         """), unsafe_allow_html=True)
 
-    with id2:
-        st.markdown(clay_card("""
+        with id2:
+            st.markdown(clay_card("""
         <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
             text-transform:uppercase;margin-bottom:18px;">Institution & Guide</p>
         <table style="width:100%;border-collapse:collapse;">
@@ -1010,102 +1228,102 @@ with tab4:
         </table>
         """), unsafe_allow_html=True)
 
-    # ── TECH OVERVIEW ──────────────────────────────────────────────────────
-    st.markdown("""
+        # ── TECH OVERVIEW ──────────────────────────────────────────────────────
+        st.markdown("""
     <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
         text-transform:uppercase;margin:8px 0 16px;">Technical Overview</p>
     """, unsafe_allow_html=True)
 
-    t1, t2 = st.columns([3, 2], gap="large")
-
-    with t1:
-        ml_pipeline_lines = [
-            '<p style="color:#1A1210;font-size:1rem;font-weight:800;margin-bottom:18px;">',
-            '    ML Pipeline</p>',
-            '',
-            '<p style="color:#7A6B5C;font-size:0.87rem;line-height:1.7;margin-bottom:16px;">',
-            '    Raw Quikr India listings are cleaned and preprocessed.',
-            '    Categorical features (brand, model, fuel type) are encoded with',
-            '    <strong style="color:#1A1210;">OneHotEncoder</strong> inside a',
-            '    <strong style="color:#1A1210;">ColumnTransformer</strong>.',
-            '    Numeric features (year, kms) pass through unchanged.',
-            '</p>',
-            '<p style="color:#7A6B5C;font-size:0.87rem;line-height:1.7;margin-bottom:16px;">',
-            '    Price is <strong style="color:#1A1210;">log-transformed</strong> before training —',
-            '    this captures percentage-based depreciation and dramatically improves accuracy.',
-            '    A <strong style="color:#1A1210;">GradientBoostingRegressor</strong> then learns',
-            '    non-linear pricing relationships.',
-            '</p>',
-            '<div style="background:#F8F3EC;border:2px solid #E0D8CE;border-radius:14px;',
-            '    padding:18px;font-family:monospace;font-size:0.8rem;color:#FF6B35;line-height:1.9;">',
-            '    Input → [name, company, year, kms_driven, fuel_type]<br>',
-            '    ↓ OneHotEncoder (name, company, fuel_type)<br>',
-            '    ↓ passthrough (year, kms_driven)<br>',
-            '    ↓ GradientBoostingRegressor (300 trees)<br>',
-            '    ↓ exp() → Predicted Price (₹)',
-            '</div>'
-        ]
-        st.markdown(clay_card("".join(ml_pipeline_lines)), unsafe_allow_html=True)
-
-    with t2:
-        model_perf_lines = [
-            '<p style="color:#1A1210;font-size:1rem;font-weight:800;margin-bottom:18px;">',
-            '    Model Performance</p>',
-            '',
-            '<div style="margin-bottom:16px;">',
-            '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
-            '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">Algorithm</p>',
-            '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">',
-            '        Gradient Boosting Regressor</p>',
-            '</div>',
-            '<div style="margin-bottom:16px;">',
-            '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
-            '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">R² Score</p>',
-            '    <p style="color:#FF6B35;font-size:1.5rem;font-weight:900;letter-spacing:-0.02em;">',
-            '        0.79</p>',
-            '</div>',
-            '<div style="margin-bottom:16px;">',
-            '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
-            '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">CV R² (5-fold)</p>',
-            '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">0.71 ± 0.10</p>',
-            '</div>',
-            '<div style="margin-bottom:16px;">',
-            '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
-            '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">Dataset</p>',
-            '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">',
-            '        816 real Quikr listings + 1.55× 2026 inflation</p>',
-            '</div>',
-            '<div>',
-            '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
-            '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">Price Transform</p>',
-            '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">',
-            '        log(price) → exp() at inference</p>',
-            '</div>'
-        ]
-        st.markdown(clay_card("".join(model_perf_lines)), unsafe_allow_html=True)
-
-    # ── TECH STACK ─────────────────────────────────────────────────────────
-    st.markdown("""
+        t1, t2 = st.columns([3, 2], gap="large")
+
+        with t1:
+            ml_pipeline_lines = [
+                '<p style="color:#1A1210;font-size:1rem;font-weight:800;margin-bottom:18px;">',
+                '    ML Pipeline</p>',
+                '',
+                '<p style="color:#7A6B5C;font-size:0.87rem;line-height:1.7;margin-bottom:16px;">',
+                '    Raw Quikr India listings are cleaned and preprocessed.',
+                '    Categorical features (brand, model, fuel type) are encoded with',
+                '    <strong style="color:#1A1210;">OneHotEncoder</strong> inside a',
+                '    <strong style="color:#1A1210;">ColumnTransformer</strong>.',
+                '    Numeric features (year, kms) pass through unchanged.',
+                '</p>',
+                '<p style="color:#7A6B5C;font-size:0.87rem;line-height:1.7;margin-bottom:16px;">',
+                '    Price is <strong style="color:#1A1210;">log-transformed</strong> before training —',
+                '    this captures percentage-based depreciation and dramatically improves accuracy.',
+                '    A <strong style="color:#1A1210;">GradientBoostingRegressor</strong> then learns',
+                '    non-linear pricing relationships.',
+                '</p>',
+                '<div style="background:#F8F3EC;border:2px solid #E0D8CE;border-radius:14px;',
+                '    padding:18px;font-family:monospace;font-size:0.8rem;color:#FF6B35;line-height:1.9;">',
+                '    Input → [name, company, year, kms_driven, fuel_type]<br>',
+                '    ↓ OneHotEncoder (name, company, fuel_type)<br>',
+                '    ↓ passthrough (year, kms_driven)<br>',
+                '    ↓ GradientBoostingRegressor (300 trees)<br>',
+                '    ↓ exp() → Predicted Price (₹)',
+                '</div>'
+            ]
+            st.markdown(clay_card("".join(ml_pipeline_lines)), unsafe_allow_html=True)
+
+        with t2:
+            model_perf_lines = [
+                '<p style="color:#1A1210;font-size:1rem;font-weight:800;margin-bottom:18px;">',
+                '    Model Performance</p>',
+                '',
+                '<div style="margin-bottom:16px;">',
+                '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
+                '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">Algorithm</p>',
+                '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">',
+                '        Gradient Boosting Regressor</p>',
+                '</div>',
+                '<div style="margin-bottom:16px;">',
+                '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
+                '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">R² Score</p>',
+                '    <p style="color:#FF6B35;font-size:1.5rem;font-weight:900;letter-spacing:-0.02em;">',
+                '        0.79</p>',
+                '</div>',
+                '<div style="margin-bottom:16px;">',
+                '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
+                '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">CV R² (5-fold)</p>',
+                '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">0.71 ± 0.10</p>',
+                '</div>',
+                '<div style="margin-bottom:16px;">',
+                '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
+                '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">Dataset</p>',
+                '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">',
+                '        816 real Quikr listings + 1.55× 2026 inflation</p>',
+                '</div>',
+                '<div>',
+                '    <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;',
+                '        text-transform:uppercase;letter-spacing:0.06em;margin-bottom:5px;">Price Transform</p>',
+                '    <p style="color:#1A1210;font-size:0.9rem;font-weight:600;">',
+                '        log(price) → exp() at inference</p>',
+                '</div>'
+            ]
+            st.markdown(clay_card("".join(model_perf_lines)), unsafe_allow_html=True)
+
+        # ── TECH STACK ─────────────────────────────────────────────────────────
+        st.markdown("""
     <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
         text-transform:uppercase;margin:8px 0 16px;">Technology Stack</p>
     """, unsafe_allow_html=True)
 
-    tech = [
-        ("🐍", "Python 3.11+",        "Core language"),
-        ("🤖", "Scikit-learn",         "ML pipeline, GradientBoosting, OHE"),
-        ("📊", "Pandas / NumPy",       "Data loading, cleaning, analysis"),
-        ("🌐", "Streamlit 1.32",       "Web framework and UI"),
-        ("📦", "Pickle",               "Model serialization"),
-        ("🎨", "Custom CSS",           "Corporate Memphis 3D design"),
-        ("📈", "Altair (st.bar_chart)","Market insight charts"),
-        ("🔢", "NumPy (log/exp)",      "Price log-transform pipeline"),
-    ]
-
-    rows = [tech[i:i+4] for i in range(0, len(tech), 4)]
-    for row in rows:
-        cols = st.columns(4, gap="medium")
-        for col, (icon, name, desc) in zip(cols, row):
-            col.markdown(f"""
+        tech = [
+            ("🐍", "Python 3.11+",        "Core language"),
+            ("🤖", "Scikit-learn",         "ML pipeline, GradientBoosting, OHE"),
+            ("📊", "Pandas / NumPy",       "Data loading, cleaning, analysis"),
+            ("🌐", "Streamlit 1.32",       "Web framework and UI"),
+            ("📦", "Pickle",               "Model serialization"),
+            ("🎨", "Custom CSS",           "Corporate Memphis 3D design"),
+            ("📈", "Altair (st.bar_chart)","Market insight charts"),
+            ("🔢", "NumPy (log/exp)",      "Price log-transform pipeline"),
+        ]
+
+        rows = [tech[i:i+4] for i in range(0, len(tech), 4)]
+        for row in rows:
+            cols = st.columns(4, gap="medium")
+            for col, (icon, name, desc) in zip(cols, row):
+                col.markdown(f"""
             <div style="background:#FFFFFF;border:2.5px solid #E0D8CE;
                 box-shadow:5px 5px 0px #CFC8BC;border-radius:20px;
                 padding:20px;margin-bottom:12px;">
@@ -1115,31 +1333,31 @@ with tab4:
             </div>
             """, unsafe_allow_html=True)
 
-    # ── KNOWN LIMITATIONS ──────────────────────────────────────────────────
-    st.markdown("""
+        # ── KNOWN LIMITATIONS ──────────────────────────────────────────────────
+        st.markdown("""
     <p style="color:#9A8B7C;font-size:0.72rem;font-weight:700;letter-spacing:0.09em;
         text-transform:uppercase;margin:8px 0 16px;">Known Limitations</p>
     """, unsafe_allow_html=True)
 
-    limitations = [
-        ("No geolocation data",
-         "Prices vary significantly across cities. This model does not account for city-level pricing."),
-        ("Brand coverage",
-         "Only 25 manufacturers are covered. Rare or imported brands may not return accurate predictions."),
-        ("Gradient Boosting limits",
-         "Tree-based models may extrapolate poorly for very rare or unseen car configurations."),
-        ("Dataset window",
-         "Training data reflects 2019–2020 listings × 1.55 inflation. Individual market fluctuations may vary."),
-        ("Condition not captured",
-         "Accident history, service records, and physical condition significantly affect actual resale value."),
-        ("No city-tier pricing",
-         "Metro vs tier-2 city price differences of 10–20% are not modelled in this version."),
-    ]
-
-    lc1, lc2 = st.columns(2, gap="large")
-    for i, (title, desc) in enumerate(limitations):
-        col = lc1 if i % 2 == 0 else lc2
-        col.markdown(f"""
+        limitations = [
+            ("No geolocation data",
+             "Prices vary significantly across cities. This model does not account for city-level pricing."),
+            ("Brand coverage",
+             "Only 25 manufacturers are covered. Rare or imported brands may not return accurate predictions."),
+            ("Gradient Boosting limits",
+             "Tree-based models may extrapolate poorly for very rare or unseen car configurations."),
+            ("Dataset window",
+             "Training data reflects 2019–2020 listings × 1.55 inflation. Individual market fluctuations may vary."),
+            ("Condition not captured",
+             "Accident history, service records, and physical condition significantly affect actual resale value."),
+            ("No city-tier pricing",
+             "Metro vs tier-2 city price differences of 10–20% are not modelled in this version."),
+        ]
+
+        lc1, lc2 = st.columns(2, gap="large")
+        for i, (title, desc) in enumerate(limitations):
+            col = lc1 if i % 2 == 0 else lc2
+            col.markdown(f"""
         <div style="background:#FFFFFF;border-left:4px solid #FF6B35;
             border:2.5px solid #E0D8CE;border-left-width:4px;
             border-radius:16px;padding:16px 20px;margin-bottom:10px;
@@ -1151,8 +1369,8 @@ with tab4:
         </div>
         """, unsafe_allow_html=True)
 
-    # ── FOOTER ─────────────────────────────────────────────────────────────
-    st.markdown("""
+        # ── FOOTER ─────────────────────────────────────────────────────────────
+        st.markdown("""
     <div style="text-align:center;padding:40px 0 20px;border-top:2px solid #E0D8CE;margin-top:24px;">
         <p style="color:#1A1210;font-size:1rem;font-weight:900;letter-spacing:-0.02em;
             margin-bottom:6px;">CarWorthML</p>
@@ -1165,3 +1383,54 @@ with tab4:
         <p style="color:#CFC8BC;font-size:0.7rem;margin-top:16px;">© 2025 Abhishek Gupta</p>
     </div>
     """, unsafe_allow_html=True)
+
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ADMIN — hot-path latency histograms
+    # ════════════════════════════════════════════════════════════════════════
+    if admin_tab:
+        with admin_tab[0]:
+            if not metrics.ENABLED:
+                st.info("Metrics are off. Set CARWORTH_METRICS_FILE=metrics.prom and/or "
+                        "CARWORTH_METRICS_PORT=9464 before starting the app.")
+            else:
+                snap = metrics.snapshot()
+                hists = snap["histograms"]
+                st.caption(f"Since process start · {snap['counters'].get('reruns', 0):,} reruns · "
+                           f"latest rerun not yet included")
+                if hists:
+                    st.dataframe(
+                        pd.DataFrame([
+                            {"Step": step, "Calls": h.count,
+                             "Mean ms": h.sum / h.count * 1e3,
+                             "p50 ms": h.quantile(0.5) * 1e3,
+                             "p95 ms": h.quantile(0.95) * 1e3,
+                             "p99 ms": h.quantile(0.99) * 1e3,
+                             "Total s": h.sum}
+                            for step, h in sorted(hists.items())
+                        ]).round(3),
+                        use_container_width=True, hide_index=True,
+                    )
+                    step = st.selectbox("Latency histogram", sorted(hists))
+                    labels = [f"{i:02d} · ≤{b * 1e3:g} ms" for i, b in enumerate(metrics.BUCKETS)]
+                    labels.append(f"{len(labels):02d} · >{metrics.BUCKETS[-1]:g} s")  # numbered: charts sort x labels
+                    st.bar_chart(
+                        pd.DataFrame({"Bucket": labels, "Calls": hists[step].counts}),
+                        x="Bucket", y="Calls", use_container_width=True, height=280, color="#FF6B35",
+                    )
+                if snap["counters"]:
+                    st.dataframe(
+                        pd.DataFrame(sorted(snap["counters"].items()), columns=["Event", "Count"]),
+                        use_container_width=True, hide_index=True,
+                    )
+
+    metrics.observe("rerun", time.perf_counter() - _RERUN_T0)
+    metrics.count("reruns")
+    metrics.flush()
+finally:
+    # Also on st.stop(), a rerun request or an exception, so neither cProfile
+    # nor the sampler thread outlives this rerun
+    profile_path = profiler.stop() if profiler else None
+if profile_path:
+    st.toast(f"Rerun profile saved to {profile_path}")
+startup.finish("render")
@@ -0,0 +1,156 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import inference
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:          # CSV in/out only
+    pa = pq = None
+
+PRICE_COLUMN = "predicted_price"
+
+# Per-process model state, loaded once (in the parent, or in each worker)
+_model = None
+_log_transform = False
+
+
+def _init_model(model_path, meta_path):
+    # With a model bundle, every worker maps the same array files, so the
+    # model's pages are shared instead of unpickled into each process
+    global _model, _log_transform
+    _model = inference.load_model(model_path)
+    _log_transform = inference.model_log_transform(model_path, meta_path)
+
+
+def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Append predicted_price (₹) to a chunk of listings.
+
+    Rows with a missing or non-numeric feature get NaN instead of failing
+    the whole chunk.
+    """
+    X = chunk[inference.FEATURES].copy()
+    X["year"] = pd.to_numeric(X["year"], errors="coerce")
+    X["kms_driven"] = pd.to_numeric(X["kms_driven"], errors="coerce")
+    valid = X.notna().all(axis=1).to_numpy()
+
+    price = np.full(len(X), np.nan)
+    if valid.any():
+        price[valid] = inference.to_price(_model.predict(X[valid]), _log_transform)
+
+    out = chunk.copy()
+    out[PRICE_COLUMN] = price.round(0)
+    return out
+
+
+def read_chunks(path, chunksize):
+    if path.endswith(".parquet"):
+        if pq is None:
+            sys.exit("❌ Reading Parquet needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Streams scored chunks to CSV or Parquet (chosen by file extension)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        if self.parquet and pq is None:
+            sys.exit("❌ Writing Parquet needs pyarrow (pip install pyarrow)")
+        self._writer = None
+        self._schema = None
+        self._first = True
+
+    def write(self, df):
+        if self.parquet:
+            if self._writer is None:
+                # Fixed up front: one chunk's inferred dtypes (int year, say)
+                # need not match the next one's (object, or float with NaN)
+                self._schema = pa.schema(
+                    [(col, pa.string()) for col in df.columns if col != PRICE_COLUMN]
+                    + [(PRICE_COLUMN, pa.float64())]
+                )
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            frame = df.astype({col: "string" for col in self._schema.names if col != PRICE_COLUMN})
+            frame[PRICE_COLUMN] = frame[PRICE_COLUMN].astype("float64")
+            self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        else:
+            df.to_csv(self.path, index=False, mode="w" if self._first else "a", header=self._first)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(args):
+    t0 = time.perf_counter()
+    writer = ChunkWriter(args.output)
+    rows = chunks = 0
+
+    def report(scored):
+        nonlocal rows, chunks
+        writer.write(scored)
+        rows += len(scored)
+        chunks += 1
+        elapsed = time.perf_counter() - t0
+        print(f"   chunk {chunks}: {rows:,} rows scored ({rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+    if args.workers <= 1:
+        _init_model(args.model, args.meta)
+        for chunk in read_chunks(args.input, args.chunksize):
+            report(score_chunk(chunk))
+    else:
+        # Keep at most 2 chunks per worker in flight so memory stays bounded;
+        # results are written in input order.
+        with ProcessPoolExecutor(args.workers, initializer=_init_model,
+                                 initargs=(args.model, args.meta)) as pool:
+            pending = deque()
+            for chunk in read_chunks(args.input, args.chunksize):
+                pending.append(pool.submit(score_chunk, chunk))
+                if len(pending) >= 2 * args.workers:
+                    report(pending.popleft().result())
+            while pending:
+                report(pending.popleft().result())
+
+    writer.close()
+    elapsed = time.perf_counter() - t0
+    print(f"✅ {args.output} — {rows:,} listings valued in {elapsed:.1f}s "
+          f"({rows / max(elapsed, 1e-9):,.0f} rows/sec, {max(args.workers, 1)} process(es))")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Value a whole inventory of listings with the trained model",
+    )
+    parser.add_argument("input", help="CSV or Parquet file with name, company, year, kms_driven, fuel_type")
+    parser.add_argument("-o", "--output", default="valuations.csv",
+                        help="output CSV or Parquet (input columns + predicted_price)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default 50,000)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"processes to score chunks in parallel (this machine has {os.cpu_count()})")
+    parser.add_argument("--model", default=None,
+                        help="model bundle directory or pipeline pickle "
+                             f"(default: {inference.BUNDLE_DIR}/ if present, else {inference.MODEL_PATH})")
+    parser.add_argument("--meta", default=inference.META_PATH, help="metadata pickle for a pipeline pickle")
+    args = parser.parse_args()
+
+    args.model = args.model or inference.default_model_path()
+    for path in (args.input, args.model):
+        if not os.path.exists(path):
+            sys.exit(f"❌ {path} not found.")
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import dataset_io
+import inference
+import compiled_model
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+# Run in a fresh interpreter: what a new worker pays before its first prediction.
+# The first load also imports sklearn; a second copy measures the model alone.
+COLD_LOAD_SNIPPET = """
+import json, os, resource, sys, time
+def rss():
+    if os.path.exists("/proc/self/statm"):      # current RSS (Linux)
+        return int(open("/proc/self/statm").read().split()[1]) * resource.getpagesize() / 2**20
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+def peak_rss():
+    # VmHWM is this process's own peak; ru_maxrss also counts what the
+    # parent's memory was when it forked us
+    if os.path.exists("/proc/self/status"):
+        for line in open("/proc/self/status"):
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+t0 = time.perf_counter()
+import inference
+t1 = time.perf_counter()
+first = inference.load_pipeline(sys.argv[1])
+t2 = time.perf_counter()
+before = rss()
+second = inference.load_pipeline(sys.argv[1])
+print(json.dumps({"import_s": t1 - t0, "first_load_s": t2 - t1,
+                  "peak_rss_mb": peak_rss(),
+                  "model_rss_mb": rss() - before}))
+"""
+
+
+def app_input(name, company, year, kms_driven, fuel_type) -> pd.DataFrame:
+    """The one-row frame app.py builds for a prediction, column for column."""
+    return pd.DataFrame(
+        [[name, company, year, kms_driven, fuel_type]],
+        columns=["name", "company", "year", "kms_driven", "fuel_type"],
+    )
+
+
+def percentiles(seconds) -> dict:
+    ms = np.asarray(seconds) * 1e3
+    return {
+        "n": len(ms),
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "max_ms": round(float(ms.max()), 4),
+    }
+
+
+def bench_load(model_path: str, reps: int = 5) -> dict:
+    """Warm unpickle time, plus first load and memory of a fresh process."""
+    warm = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        inference.load_pipeline(model_path)
+        warm.append(time.perf_counter() - t0)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    cold = subprocess.run([sys.executable, "-c", COLD_LOAD_SNIPPET, os.path.abspath(model_path)],
+                          cwd=here, capture_output=True, text=True, check=True)
+    cold = json.loads(cold.stdout.strip().splitlines()[-1])
+    return {
+        "file_kb": round(os.path.getsize(model_path) / 1024, 1),
+        "warm_load_ms": round(float(np.median(warm)) * 1e3, 3),
+        "cold_first_load_s": round(cold["import_s"] + cold["first_load_s"], 3),
+        "cold_peak_rss_mb": round(cold["peak_rss_mb"], 1),
+        "model_rss_mb": round(cold["model_rss_mb"], 2),
+    }
+
+
+def bench_single_row(predict, rows: list, log_transform: bool) -> dict:
+    """Latency of app-style requests: build the one-row frame, predict, convert to ₹."""
+    for row in rows[:20]:                                   # warm-up
+        inference.to_price(predict(app_input(*row)), log_transform)
+    latencies = []
+    for row in rows:
+        t0 = time.perf_counter()
+        inference.to_price(predict(app_input(*row)), log_transform)
+        latencies.append(time.perf_counter() - t0)
+    return percentiles(latencies)
+
+
+def bench_batches(predict, X: pd.DataFrame, sizes, min_seconds: float = 1.0) -> list:
+    results = []
+    for size in sizes:
+        batch = X.sample(size, replace=True, random_state=size).reset_index(drop=True)
+        predict(batch.head(min(size, 100)))                 # warm-up
+        times = []
+        while sum(times) < min_seconds or len(times) < 3:
+            t0 = time.perf_counter()
+            predict(batch)
+            times.append(time.perf_counter() - t0)
+        best = min(times)
+        results.append({
+            "batch_size": size,
+            "repeats": len(times),
+            "best_ms": round(best * 1e3, 3),
+            "median_ms": round(float(np.median(times)) * 1e3, 3),
+            "rows_per_sec": round(size / best, 1),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference latency, throughput and load cost")
+    parser.add_argument("--model", default=inference.MODEL_PATH)
+    parser.add_argument("--meta", default=inference.META_PATH)
+    parser.add_argument("--arrays", default=compiled_model.COMPILED_PATH,
+                        help="compiled evaluator arrays; benchmarked too when present")
+    parser.add_argument("--requests", type=int, default=2000, help="single-row requests to time")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--min-seconds", type=float, default=1.0,
+                        help="minimum time spent per batch size (at least 3 repeats)")
+    parser.add_argument("-o", "--output", default="benchmark_inference.json", help="results JSON")
+    args = parser.parse_args()
+
+    for path in (args.model, dataset_io.CLEANED_CSV):
+        if not os.path.exists(path):
+            sys.exit(f"❌ {path} not found. Run `python setup.py` first.")
+
+    # Before the dataset is loaded, so the fresh process forks from a smaller parent
+    print("Model load...")
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "model": args.model,
+        "load": bench_load(args.model),
+        "evaluators": {},
+    }
+    load = report["load"]
+    print(f"   {load['file_kb']:,.0f} KB pickle · warm load {load['warm_load_ms']:.1f} ms · "
+          f"fresh process {load['cold_first_load_s']:.2f}s to first model, "
+          f"{load['cold_peak_rss_mb']:.0f} MB RSS ({load['model_rss_mb']:.1f} MB per model copy)")
+
+    X = dataset_io.load_cleaned()[inference.FEATURES]
+    log_transform = inference.uses_log_transform(args.meta)
+    sample = X.sample(args.requests, replace=True, random_state=0)
+    rows = [(str(n), str(c), int(y), int(k), str(f)) for n, c, y, k, f in sample.itertuples(index=False)]
+
+    evaluators = {"pipeline": inference.load_pipeline(args.model).predict}
+    if os.path.exists(args.arrays):
+        evaluators["compiled"] = compiled_model.CompiledModel.load(args.arrays).predict
+
+    for label, predict in evaluators.items():
+        print(f"\n{label}")
+        single = bench_single_row(predict, rows, log_transform)
+        print(f"   single row ({single['n']:,} requests): p50 {single['p50_ms']:.3f} ms · "
+              f"p95 {single['p95_ms']:.3f} ms · p99 {single['p99_ms']:.3f} ms")
+        batches = bench_batches(predict, X, args.batch_sizes, args.min_seconds)
+        for b in batches:
+            print(f"   batch {b['batch_size']:>7,}: {b['best_ms']:>10.2f} ms · {b['rows_per_sec']:>12,.0f} rows/sec")
+        report["evaluators"][label] = {"single_row": single, "batches": batches}
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ {args.output} written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib import metadata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Training phases, each run in its own process so peak RSS is per phase
+PHASES = ("load", "cv", "fit")
+
+
+def _script(name):
+    return os.path.join(HERE, name)
+
+
+# Fresh interpreter that runs a script, then writes its own peak RSS (VmHWM,
+# KiB) to argv[1]. The ru_maxrss wait4 returns would also count whatever the
+# child inherited from this process before exec.
+_PEAK_WRAPPER = """
+import atexit, os, runpy, sys
+def write_peak(path=sys.argv[1]):
+    with open("/proc/self/status") as f:
+        hwm = next(line.split()[1] for line in f if line.startswith("VmHWM:"))
+    with open(path, "w") as f:
+        f.write(hwm)
+atexit.register(write_peak)
+sys.argv = sys.argv[2:]
+sys.path[0] = os.path.dirname(sys.argv[0])
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def measure(script, args, cwd, log_path) -> dict:
+    """Run a Python script to completion; its wall time, CPU time and peak RSS.
+
+    os.wait4 returns the CPU time of the finished process including every
+    descendant it waited for, so the joblib workers of cross_val_score(n_jobs=-1)
+    are counted too. Peak RSS is the script's own VmHWM where /proc exists.
+    """
+    peak_path = os.path.join(cwd, "bench.peak")
+    if os.path.exists("/proc/self/status"):
+        cmd = [sys.executable, "-c", _PEAK_WRAPPER, peak_path, script, *args]
+    else:
+        cmd = [sys.executable, script, *args]
+    if os.path.exists(peak_path):
+        os.remove(peak_path)
+    with open(log_path, "ab") as log:
+        log.write(f"\n$ {os.path.basename(script)} {' '.join(args)}\n".encode())
+        log.flush()
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - t0
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    peak_kb = usage.ru_maxrss                               # ru_maxrss is KiB on Linux
+    if os.path.exists(peak_path):
+        with open(peak_path) as f:
+            peak_kb = int(f.read())
+    return {
+        "wall_s": round(wall, 3),
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 3),
+        "user_s": round(usage.ru_utime, 3),
+        "sys_s": round(usage.ru_stime, 3),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "returncode": proc.returncode,
+    }
+
+
+def _last_json_line(log_path):
+    with open(log_path) as f:
+        for line in reversed(f.read().splitlines()):
+            if line.startswith("{"):
+                return json.loads(line)
+    return None
+
+
+def _tail(log_path, n=15):
+    with open(log_path, errors="replace") as f:
+        return "".join(f.readlines()[-n:])
+
+
+def bench_size(rows: int, seed: int, engine: str, workdir: str) -> dict:
+    """Generate, clean and train on `rows` raw listings inside `workdir`."""
+    log_path = os.path.join(workdir, "bench.log")
+    steps = [
+        ("generate", _script("generate_dataset.py"), ["--vectorized", "--rows", str(rows), "--seed", str(seed)]),
+        ("clean", _script("data_cleaning.py"), []),
+    ] + [
+        (phase, _script("benchmark_training.py"), ["--phase", phase, "--engine", engine])
+        for phase in PHASES
+    ]
+
+    result = {"rows": rows, "stages": {}}
+    for name, script, args in steps:
+        stage = measure(script, args, workdir, log_path)
+        if name in PHASES:
+            stage["detail"] = _last_json_line(log_path)
+        result["stages"][name] = stage
+        print(f"   {rows:>9,} rows  {name:<9} {stage['wall_s']:>8.2f}s wall  "
+              f"{stage['cpu_s']:>8.2f}s CPU  {stage['peak_rss_mb']:>8.1f} MB peak")
+        if stage["returncode"] != 0:
+            print(f"❌ {name} failed (exit {stage['returncode']}):\n{_tail(log_path)}")
+            result["failed"] = name
+            break
+
+    detail = result["stages"].get("load", {}).get("detail") or {}
+    result["training_rows"] = detail.get("rows")
+    return result
+
+
+# ── Training phases (run in a child process by bench_size) ──────────────
+def run_phase(phase: str, engine: str) -> None:
+    """Time one training phase in-process and print its timings as a JSON line."""
+    import model_training
+    from sklearn.metrics import r2_score
+    from sklearn.model_selection import cross_val_score, train_test_split
+
+    t0 = time.perf_counter()
+    X, y_log = model_training.load_training_data()
+    out = {"phase": phase, "rows": len(X), "load_s": round(time.perf_counter() - t0, 3)}
+
+    pipe = model_training.build_pipeline(engine, X)
+    if phase == "cv":
+        t0 = time.perf_counter()
+        scores = cross_val_score(pipe, X, y_log, cv=5, scoring="r2", n_jobs=-1)
+        out.update(cv_s=round(time.perf_counter() - t0, 3), cv_r2=round(float(scores.mean()), 5))
+    elif phase == "fit":
+        X_train, X_test, y_train, y_test = train_test_split(X, y_log, test_size=0.1, random_state=42)
+        t0 = time.perf_counter()
+        pipe.fit(X_train, y_train)
+        out["fit_s"] = round(time.perf_counter() - t0, 3)
+        t0 = time.perf_counter()
+        pred = pipe.predict(X_test)
+        out.update(predict_s=round(time.perf_counter() - t0, 3),
+                   holdout_r2=round(float(r2_score(y_test, pred)), 5))
+    print(json.dumps(out))
+
+
+def _environment() -> dict:
+    # Versions from package metadata: importing numpy/pandas/sklearn here
+    # would grow this process, and every child forked from it
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": metadata.version("numpy"),
+        "pandas": metadata.version("pandas"),
+        "scikit-learn": metadata.version("scikit-learn"),
+        "git_commit": commit,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark dataset generation, cleaning and training across dataset sizes",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="raw rows per run (default 1k 10k 100k 1M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engine", default="gbr", help="training engine (see model_training.py --engine)")
+    parser.add_argument("-o", "--output", default="benchmark_training.json", help="results JSON")
+    parser.add_argument("--keep", action="store_true", help="keep each run's working directory")
+    parser.add_argument("--phase", choices=PHASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase:
+        run_phase(args.phase, args.engine)
+        return
+    if not hasattr(os, "wait4"):
+        sys.exit("❌ benchmark_training.py needs os.wait4 (Linux/macOS)")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "engine": args.engine,
+        "seed": args.seed,
+        "environment": _environment(),
+        "runs": [],
+    }
+    for rows in args.sizes:
+        # Each size gets a fresh working directory so no artifact is reused
+        workdir = tempfile.mkdtemp(prefix=f"carworth-bench-{rows}-")
+        try:
+            report["runs"].append(bench_size(rows, args.seed, args.engine, workdir))
+        finally:
+            if args.keep:
+                print(f"   kept {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        # Rewritten after every size so a long run leaves partial results behind
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"✅ {args.output} — {len(report['runs'])} dataset size(s) benchmarked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import json
+import os
+import pandas as pd
+
+CATALOG_PATH = "catalog_index.json"
+
+
+class CatalogBuilder:
+    """Accumulates the company → model → fuel/year catalog chunk by chunk.
+
+    Layout of the finished index (all lists sorted):
+
+        {
+          "companies":  ["Audi", ...],
+          "fuel_types": ["Diesel", "LPG", "Petrol"],
+          "models":     {"Maruti": ["Maruti Alto LXI", ...], ...},
+          "variants":   {"Maruti": {"Maruti Alto LXI":
+                            {"fuel_types": [...], "year_min": 2008, "year_max": 2023}}},
+          "rows":       995,
+        }
+    """
+
+    def __init__(self, catalog: dict = None):
+        self._variants = {}
+        self._rows = 0
+        if catalog:
+            self._rows = catalog.get("rows", 0)
+            for company, names in catalog["variants"].items():
+                for name, v in names.items():
+                    self._variants[(company, name)] = [set(v["fuel_types"]), v["year_min"], v["year_max"]]
+
+    def update(self, df: pd.DataFrame) -> "CatalogBuilder":
+        self._rows += len(df)
+        if df.empty:
+            return self
+        years = df.groupby(["company", "name"], observed=True)["year"].agg(["min", "max"])
+        fuels = df[["company", "name", "fuel_type"]].drop_duplicates()
+        for (company, name), (lo, hi) in years.iterrows():
+            entry = self._variants.get((company, name))
+            if entry is None:
+                self._variants[(company, name)] = [set(), int(lo), int(hi)]
+            else:
+                entry[1] = min(entry[1], int(lo))
+                entry[2] = max(entry[2], int(hi))
+        for company, name, fuel in fuels.itertuples(index=False):
+            self._variants[(company, name)][0].add(fuel)
+        return self
+
+    def result(self) -> dict:
+        variants = {}
+        for (company, name) in sorted(self._variants):
+            fuels, lo, hi = self._variants[(company, name)]
+            variants.setdefault(company, {})[name] = {
+                "fuel_types": sorted(fuels), "year_min": lo, "year_max": hi,
+            }
+        return {
+            "companies":  list(variants),
+            "fuel_types": sorted({f for fuels, _, _ in self._variants.values() for f in fuels}),
+            "models":     {company: list(names) for company, names in variants.items()},
+            "variants":   variants,
+            "rows":       self._rows,
+        }
+
+
+def build_catalog(df: pd.DataFrame) -> dict:
+    return CatalogBuilder().update(df).result()
+
+
+def save_catalog(catalog: dict, path: str = CATALOG_PATH) -> None:
+    with open(path, "w") as f:
+        json.dump(catalog, f, indent=1)
+
+
+def load_catalog(path: str = CATALOG_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_existing(path: str = CATALOG_PATH) -> dict:
+    """The catalog at `path`, or None if there is none yet (for --append runs)."""
+    return load_catalog(path) if os.path.exists(path) else None
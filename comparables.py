@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# One year of age is treated as "as far" as 12,000 km on the odometer — the
+# average yearly mileage the dataset is generated with.
+KMS_PER_YEAR = 12_000
+
+
+class Comparables:
+    """The k nearest listings returned by ComparablesIndex.query()."""
+
+    def __init__(self, year: np.ndarray, kms_driven: np.ndarray, price: np.ndarray):
+        self.year = year
+        self.kms_driven = kms_driven
+        self.price = price
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @property
+    def min(self) -> float:
+        return float(self.price.min())
+
+    @property
+    def mean(self) -> float:
+        return float(self.price.mean())
+
+    @property
+    def max(self) -> float:
+        return float(self.price.max())
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"year": self.year, "kms_driven": self.kms_driven, "Price": self.price})
+
+
+class ComparablesIndex:
+    """Nearest real listings for a (company, fuel_type, year, kms) query.
+
+    Listings are sorted once by company, fuel_type, year and kms_driven into
+    flat arrays, so each (company, fuel_type) partition is a contiguous slice
+    and each year inside it a sub-slice. A query binary-searches the year
+    window and, inside each year, the kms position; only the k listings either
+    side of that position can be among the k nearest, so a query touches at
+    most (2 * max_year_gap + 1) * 2k rows whatever the dataset size.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        comp_codes, comp_names = pd.factorize(df["company"])
+        fuel_codes, fuel_names = pd.factorize(df["fuel_type"])
+        year = df["year"].to_numpy()
+        kms = df["kms_driven"].to_numpy()
+
+        order = np.lexsort((kms, year, fuel_codes, comp_codes))
+        self.year = year[order]
+        self.kms = kms[order]
+        self.price = df["Price"].to_numpy()[order]
+
+        part = comp_codes[order].astype(np.int64) * len(fuel_names) + fuel_codes[order]
+        starts = np.flatnonzero(np.r_[True, part[1:] != part[:-1]]) if len(part) else np.array([], int)
+        ends = np.r_[starts[1:], len(part)]
+        self._parts = {
+            (comp_names[part[s] // len(fuel_names)], fuel_names[part[s] % len(fuel_names)]): (s, e)
+            for s, e in zip(starts, ends)
+        }
+
+    def query(self, company: str, fuel_type: str, year: int, kms_driven: int,
+              k: int = 25, max_year_gap: int = 2) -> Comparables:
+        """Up to `k` listings nearest in (year, kms) within ±max_year_gap years."""
+        start, end = self._parts.get((company, fuel_type), (0, 0))
+        years = self.year[start:end]
+        lo = start + np.searchsorted(years, year - max_year_gap, side="left")
+        hi = start + np.searchsorted(years, year + max_year_gap, side="right")
+
+        candidates = []
+        y = lo
+        while y < hi:
+            # Slice of this one year, then the k rows either side of kms_driven
+            y_end = start + np.searchsorted(years, self.year[y], side="right")
+            pos = y + np.searchsorted(self.kms[y:y_end], kms_driven)
+            candidates.append(np.arange(max(y, pos - k), min(y_end, pos + k)))
+            y = y_end
+
+        idx = np.concatenate(candidates) if candidates else np.array([], dtype=np.int64)
+        if len(idx) > k:
+            dist = ((self.year[idx].astype(np.int64) - year) * KMS_PER_YEAR) ** 2 \
+                + (self.kms[idx].astype(np.int64) - kms_driven) ** 2
+            idx = idx[np.argpartition(dist, k - 1)[:k]]
+        return Comparables(self.year[idx], self.kms[idx], self.price[idx])
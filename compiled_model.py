@@ -0,0 +1,285 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import inference
+
+COMPILED_PATH = "model_arrays.npz"
+
+# Rows scored together; bounds the (rows × trees) work arrays
+BLOCK_ROWS = 1024
+
+# Leaf bitmasks are one machine word per tree
+MASK_DTYPES = {8: np.uint8, 16: np.uint16, 32: np.uint32, 64: np.uint64}
+
+# Index of the lowest set bit of every 16-bit value
+_words = np.arange(1 << 16)
+_LOWEST_BIT = (np.frexp((_words & -_words).astype(np.float64))[1] - 1).clip(0).astype(np.uint8)
+
+
+def _tree_leaves(tree, depth):
+    """Heap-ordered view of one sklearn tree padded to a complete tree of `depth`.
+
+    Returns (splits, leaf_value): splits are (feature, threshold, first leaf,
+    n leaves below) per internal node, leaf_value holds each real leaf's value
+    at the leftmost padded leaf under it (the only one it can be reached by).
+    """
+    splits, leaf_value = [], np.zeros(2 ** depth)
+    stack = [(0, 0, 0)]                      # (sklearn node, first leaf, level)
+    while stack:
+        node, first, level = stack.pop()
+        width = 2 ** (depth - level)
+        if tree.children_left[node] != -1:
+            splits.append((tree.feature[node], tree.threshold[node], first, width))
+            stack.append((tree.children_left[node], first, level + 1))
+            stack.append((tree.children_right[node], first + width // 2, level + 1))
+        else:
+            leaf_value[first] = tree.value[node, 0, 0]
+    return splits, leaf_value
+
+
+def _feature_sources(ct):
+    """Model feature index → (input column, category code or None), plus categories."""
+    inputs = list(ct.feature_names_in_)
+    feature_source, categories = [], {}
+    for label, transformer, columns in ct.transformers_:
+        if transformer == "drop":
+            continue
+        if label == "remainder":
+            for col in columns:
+                feature_source.append((inputs[col] if isinstance(col, (int, np.integer)) else col, None))
+        else:
+            if transformer.drop is not None:
+                raise ValueError("OneHotEncoder(drop=...) is not supported")
+            for col, cats in zip(columns, transformer.categories_):
+                categories[col] = np.asarray(cats, dtype=str)
+                feature_source.extend((col, code) for code in range(len(cats)))
+    return inputs, feature_source, categories
+
+
+def _regressor_trees(gbr):
+    if gbr.estimators_.shape[1] != 1:
+        raise ValueError("only single-output regressors can be compiled")
+    init = 0.0 if gbr.init_ == "zero" else np.ravel(gbr.init_.constant_)[0]
+    return [est.tree_ for est in gbr.estimators_[:, 0]], init
+
+
+def compile_pipeline(pipe) -> dict:
+    """Flatten a fitted OneHotEncoder + GradientBoostingRegressor pipeline into arrays.
+
+    Trees are evaluated QuickScorer-style: every tree is padded to a complete
+    binary tree whose leaves are bits of one mask word. A split that sends a
+    row right rules out the leaves of its left subtree, and the exit leaf is
+    the lowest bit still set once every such split has been applied.
+    Which splits go right depends on one input column each, so per column we
+    precompute the AND of their masks:
+
+      masks:<col>       one row per category (+ a last row for unseen values),
+                        or one row per position among the sorted thresholds
+      categories:<col>  the encoder's categories, in code order
+      thresholds:<col>  sorted distinct split thresholds of a numeric column
+      value             leaf values, (trees × leaves)
+    """
+    ct, gbr = pipe.steps[0][1], pipe.steps[-1][1]
+    trees, init = _regressor_trees(gbr)
+    return _compile_trees(ct, trees, np.ones(len(trees)), init, gbr.learning_rate)
+
+
+def compile_ensemble(ensemble) -> dict:
+    """Merge the regressors of a FoldEnsemble with a shared encoder into one model.
+
+    The average of k boosted models is itself a sum of trees: every tree's
+    leaves are scaled by its model's learning rate / k and the init values are
+    averaged. Predictions match ensemble.predict up to float rounding, since
+    the terms are added in a different order.
+    """
+    if ensemble.preprocessor is None:
+        raise ValueError("fold models with different encoders cannot be merged")
+    trees, scale, inits = [], [], []
+    for gbr in ensemble.regressors:
+        fold_trees, init = _regressor_trees(gbr)
+        trees += fold_trees
+        scale += [gbr.learning_rate / len(ensemble.regressors)] * len(fold_trees)
+        inits.append(init)
+    return _compile_trees(ensemble.preprocessor[0], trees, np.array(scale), float(np.mean(inits)), 1.0)
+
+
+def _compile_trees(ct, trees, scale, init, learning_rate) -> dict:
+    """Mask tables for `trees`; tree i's leaf values are multiplied by scale[i]."""
+    inputs, feature_source, categories = _feature_sources(ct)
+    depth = max(t.max_depth for t in trees)
+    n_leaves = 2 ** depth
+    if n_leaves > 64:
+        raise ValueError(f"trees of depth {depth} do not fit a 64-bit leaf mask")
+    dtype = MASK_DTYPES[max(8, n_leaves)]
+    full = np.iinfo(dtype).max
+
+    value = np.zeros((len(trees), n_leaves))
+    right = {col: [] for col, _ in feature_source}      # (tree, threshold, code, mask)
+    for i, t in enumerate(trees):
+        splits, value[i] = _tree_leaves(t, depth)
+        for feature, threshold, first, width in splits:
+            left_leaves = ((1 << (width // 2)) - 1) << first
+            col, code = feature_source[feature]
+            right[col].append((i, threshold, code, full & ~left_leaves))
+
+    arrays = {
+        "inputs":        np.asarray(inputs, dtype=str),
+        "value":         value * scale[:, None],
+        "init":          np.array(init),
+        "learning_rate": np.array(learning_rate),
+    }
+    for col, splits in right.items():
+        if col in categories:
+            # One-hot column: the row's own category feature is 1, all others 0
+            n_cats = len(categories[col])
+            masks = np.full((n_cats + 1, len(trees)), full, dtype=dtype)
+            for i, threshold, code, mask in splits:
+                if threshold < 1.0:
+                    masks[code, i] &= mask
+                if threshold < 0.0:
+                    others = np.arange(n_cats + 1) != code
+                    masks[others, i] &= mask
+            arrays[f"categories:{col}"] = categories[col]
+        else:
+            # Numeric column: a row goes right at every split whose threshold is
+            # below its value, i.e. a prefix of the sorted thresholds. Splits
+            # sharing a threshold always go the same way, so they share a row.
+            splits.sort(key=lambda s: s[1])
+            thresholds = np.unique([s[1] for s in splits])
+            masks = np.full((len(thresholds) + 1, len(trees)), full, dtype=dtype)
+            k = 0
+            for row, threshold in enumerate(thresholds, start=1):
+                masks[row] = masks[row - 1]
+                while k < len(splits) and splits[k][1] == threshold:
+                    i, _, _, mask = splits[k]
+                    masks[row, i] &= mask
+                    k += 1
+            arrays[f"thresholds:{col}"] = thresholds.astype(np.float64)
+        arrays[f"masks:{col}"] = masks
+    return arrays
+
+
+def save(arrays: dict, path: str = COMPILED_PATH) -> None:
+    np.savez(path, **arrays)
+
+
+class CompiledModel:
+    """Vectorized evaluator for arrays produced by compile_pipeline().
+
+    predict() returns exactly what `pipe.predict` returns for the same input:
+    numeric values are compared as float32 against the same float64
+    thresholds, and stage outputs are summed in the same order.
+    """
+
+    def __init__(self, arrays: dict):
+        self.inputs = [str(c) for c in arrays["inputs"]]
+        self.init = float(arrays["init"])
+        self.categories = {
+            key.split(":", 1)[1]: pd.Index(arrays[key])
+            for key in arrays if key.startswith("categories:")
+        }
+        self.thresholds = {
+            key.split(":", 1)[1]: arrays[key]
+            for key in arrays if key.startswith("thresholds:")
+        }
+        self.masks = {col: arrays[f"masks:{col}"] for col in self.inputs if f"masks:{col}" in arrays}
+        n_trees, n_leaves = arrays["value"].shape
+        self._value = np.ravel(arrays["learning_rate"] * arrays["value"])
+        self._leaf_base = np.arange(n_trees) * n_leaves
+
+    @classmethod
+    def load(cls, path: str = COMPILED_PATH) -> "CompiledModel":
+        with np.load(path) as z:
+            return cls({key: z[key] for key in z.files})
+
+    def encode(self, X: pd.DataFrame) -> dict:
+        """Row index into each column's mask table."""
+        rows = {}
+        for col in self.masks:
+            if col in self.categories:
+                rows[col] = self._codes(col, X[col])
+            else:
+                x = X[col].to_numpy(dtype=np.float32).astype(np.float64)
+                rows[col] = np.searchsorted(self.thresholds[col], x, side="left")
+        return rows
+
+    def _codes(self, col: str, values: pd.Series) -> np.ndarray:
+        index, unseen = self.categories[col], len(self.categories[col])
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Map the few distinct categories, not every row
+            lookup = np.append(index.get_indexer(values.cat.categories.astype(str)), -1)
+            code = lookup[values.cat.codes.to_numpy()]
+        else:
+            code = index.get_indexer(values if values.dtype == object else values.astype(str))
+        code[code < 0] = unseen                              # last mask row: no split goes right
+        return code
+
+    def _raw_block(self, rows: dict, start: int, stop: int) -> np.ndarray:
+        tables = iter(self.masks.items())
+        col, table = next(tables)
+        mask = np.take(table, rows[col][start:stop], axis=0)
+        for col, table in tables:
+            mask &= np.take(table, rows[col][start:stop], axis=0)
+
+        # Exit leaf = lowest set bit
+        if mask.dtype.itemsize <= 2:
+            leaf = np.take(_LOWEST_BIT, mask)
+        else:
+            leaf = np.frexp((mask & (~mask + 1)).astype(np.float64))[1] - 1
+        values = np.take(self._value, self._leaf_base + leaf)
+
+        # Reducing over the leading axis adds one tree's row at a time, so this is
+        # the same left-to-right sum as sklearn: init + lr*v1 + lr*v2 + ...
+        return np.sum(np.ascontiguousarray(values.T), axis=0, initial=self.init)
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        if not len(X):
+            return np.empty(0)
+        rows = self.encode(X)
+        return np.concatenate([
+            self._raw_block(rows, i, min(i + BLOCK_ROWS, len(X)))
+            for i in range(0, len(X), BLOCK_ROWS)
+        ])
+
+
+def _time(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) / reps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time the compiled tree evaluator")
+    parser.add_argument("--model", default=inference.MODEL_PATH)
+    parser.add_argument("--arrays", default=COMPILED_PATH)
+    parser.add_argument("--reps", type=int, default=200, help="single-row repetitions")
+    args = parser.parse_args()
+
+    import dataset_io
+    pipe = inference.load_pipeline(args.model)
+    compiled = CompiledModel.load(args.arrays)
+    X = dataset_io.load_cleaned()[inference.FEATURES]
+
+    diff = np.abs(compiled.predict(X) - pipe.predict(X)).max()
+    print(f"Max |compiled - pipeline| over {len(X):,} rows: {diff}")
+
+    # Single row, built exactly like app.py does
+    row = pd.DataFrame([["Maruti Swift VXI", "Maruti", 2015, 50_000, "Petrol"]],
+                       columns=inference.FEATURES)
+    t_pipe = _time(lambda: pipe.predict(row), args.reps)
+    t_comp = _time(lambda: compiled.predict(row), args.reps)
+    print(f"Single row   pipeline {t_pipe * 1e3:7.3f} ms   compiled {t_comp * 1e3:7.3f} ms   "
+          f"({t_pipe / t_comp:.1f}×)")
+
+    for n in (10, 1_000, 100_000):
+        batch = X.sample(n, replace=True, random_state=0)
+        t_pipe = _time(lambda: pipe.predict(batch), 1)
+        t_comp = _time(lambda: compiled.predict(batch), 1)
+        print(f"{n:>7,} rows  pipeline {t_pipe * 1e3:7.1f} ms   compiled {t_comp * 1e3:7.1f} ms   "
+              f"({t_pipe / t_comp:.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,217 @@
+import argparse
+import os
+import resource
+import time
 import pandas as pd
+import dataset_io
+import cleaning_rules
+import dedup
+import catalog_index
+import insights_cube
 
-car = pd.read_csv("quikr_car.csv")
-print(f"Raw rows: {len(car)}")
-
-# 1. Drop "Ask For Price"
-car = car[car["Price"] != "Ask For Price"].copy()
-
-# 2. Clean Price — remove commas, cast to int
-car["Price"] = car["Price"].astype(str).str.replace(",", "").str.strip()
-car = car[car["Price"].str.isnumeric()]
-car["Price"] = car["Price"].astype(int)
-car = car[car["Price"] > 10000]          # sanity floor
-
-# 3. Clean kms_driven — extract numeric part
-car["kms_driven"] = (
-    car["kms_driven"]
-    .astype(str)
-    .str.split().str[0]
-    .str.replace(",", "")
-    .str.strip()
-)
-car = car[car["kms_driven"].str.isnumeric().fillna(False)]
-car["kms_driven"] = car["kms_driven"].astype(int)
-
-# 4. Clean year — cast to int, drop non-numeric / NaN
-car["year"] = car["year"].astype(str).str.replace(".0", "", regex=False).str.strip()
-car = car[car["year"].str.isnumeric()]
-car["year"] = car["year"].astype(int)
-car = car[(car["year"] >= 1995) & (car["year"] <= 2026)]
-
-# 5. Drop NaN fuel_type
-car = car[~car["fuel_type"].isna()]
-car = car[car["fuel_type"].isin(["Petrol", "Diesel", "LPG"])]
-
-# 6. Clean name — keep first 3 words
-car["name"] = car["name"].str.split().str[:3].str.join(" ")
-
-# 7. Apply 2026 market inflation multiplier
-# Original Quikr data is from ~2019-2020. Indian used car prices have risen
-# ~50% since then due to post-COVID demand surge and supply constraints.
-INFLATION_FACTOR = 1.55
-car["Price"] = (car["Price"] * INFLATION_FACTOR).astype(int)
-
-# 8. Reset index, drop any stale index columns
-car = car.reset_index(drop=True)
-if "Unnamed: 0" in car.columns:
-    car = car.drop(columns=["Unnamed: 0"])
-
-car.to_csv("Cleaned_Car_data.csv", index=False)
-print(f"✅ Cleaned_Car_data.csv — {len(car)} rows, {car.shape[1]} columns")
-print(f"   Price range: ₹{car['Price'].min():,} – ₹{car['Price'].max():,}")
-print(f"   Median price: ₹{car['Price'].median():,.0f}")
-print(f"   Columns dtypes:\n{car.dtypes}")
-print(f"   NaN check:\n{car.isnull().sum()}")
+# Raw columns are read as text so every chunk of a streamed file parses the
+# same way, whatever mix of dirty values it happens to contain.
+RAW_DTYPES = {"name": str, "company": str, "year": str,
+              "Price": str, "kms_driven": str, "fuel_type": str}
+
+
+def clean_frame(car, trace_memory=False):
+    """Clean one frame (a whole file or one chunk) with cleaning_rules.RULES.
+
+    Returns (clean frame, RuleReport).
+    """
+    return cleaning_rules.apply_rules(car, trace_memory=trace_memory)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024     # KiB on Linux
+
+
+def clean_file(src, dst, parquet_dst=None, catalog_dst=None, cube_dst=None, trace_memory=False,
+               deduplicator=None):
+    car = pd.read_csv(src, dtype=RAW_DTYPES)
+    print(f"Raw rows: {len(car)}")
+
+    car, report = clean_frame(car, trace_memory)
+    if deduplicator:
+        car = deduplicator.filter(car)
+
+    if dst:
+        car.to_csv(dst, index=False)
+        print(f"✅ {dst} — {len(car)} rows, {car.shape[1]} columns")
+    if parquet_dst:
+        dataset_io.write_parquet(car, parquet_dst)
+        print(f"✅ {parquet_dst} — columnar copy (categorical name/company/fuel_type)")
+    if catalog_dst:
+        catalog = catalog_index.build_catalog(car)
+        catalog_index.save_catalog(catalog, catalog_dst)
+        print(f"✅ {catalog_dst} — {len(catalog['companies'])} companies, "
+              f"{sum(map(len, catalog['models'].values()))} models")
+    if cube_dst:
+        cube = insights_cube.build_cube(car)
+        cube.save(cube_dst)
+        print(f"✅ {cube_dst} — {len(cube.cells)} company × fuel × year cells")
+    print(f"   Price range: ₹{car['Price'].min():,} – ₹{car['Price'].max():,}")
+    print(f"   Median price: ₹{car['Price'].median():,.0f}")
+    print(f"   Columns dtypes:\n{car.dtypes}")
+    print(f"   NaN check:\n{car.isnull().sum()}")
+    print(f"   Cleaning rules:\n{report.format()}")
+    if deduplicator:
+        print(f"   Dedup:\n{deduplicator.format()}")
+    print(f"   Peak RSS: {peak_rss_mb():,.0f} MB")
+
+
+def clean_stream(src, dst, chunksize, append=False, parquet_dst=None, catalog_dst=None,
+                 cube_dst=None, trace_memory=False, deduplicator=None):
+    """Clean `src` in chunks of `chunksize` rows, appending each to `dst`.
+
+    Only one chunk is held in memory at a time, so peak memory depends on
+    the chunk size and not on the size of the input file. The Parquet copy,
+    if requested, gets one row group per chunk. With a `deduplicator`, reposts
+    are dropped across chunks too; its memory grows with the distinct
+    listings (about 40 bytes each), not with the raw input.
+    """
+    t0 = time.perf_counter()
+    raw_rows = kept_rows = 0
+    price_min = price_max = None
+    write_header = not append
+    report = cleaning_rules.RuleReport()
+
+    # Parquet files cannot be appended to; readers fall back to the newer CSV
+    if parquet_dst and append:
+        print(f"   note: {parquet_dst} is not updated in --append mode")
+        parquet_dst = None
+    parquet = dataset_io.ParquetChunkWriter(parquet_dst) if parquet_dst else None
+    catalog = catalog_index.CatalogBuilder(
+        catalog_index.load_existing(catalog_dst) if append and catalog_dst else None
+    )
+    cube = insights_cube.CubeBuilder(
+        insights_cube.load_existing(cube_dst) if append and cube_dst else None
+    )
+
+    # Appended listings are also checked against the ones already written
+    if deduplicator and append and dst and os.path.exists(dst):
+        for old in pd.read_csv(dst, chunksize=chunksize):
+            deduplicator.observe(old)
+
+    for i, chunk in enumerate(pd.read_csv(src, dtype=RAW_DTYPES, chunksize=chunksize)):
+        raw_rows += len(chunk)
+        car, chunk_report = clean_frame(chunk, trace_memory)
+        report.merge(chunk_report)
+        if deduplicator:
+            car = deduplicator.filter(car)
+        if dst:
+            car.to_csv(dst, index=False, mode="w" if write_header else "a", header=write_header)
+            write_header = False
+        if parquet:
+            parquet.write(car)
+        if catalog_dst:
+            catalog.update(car)
+        if cube_dst:
+            cube.update(car)
+
+        kept_rows += len(car)
+        if len(car):
+            lo, hi = car["Price"].min(), car["Price"].max()
+            price_min = lo if price_min is None else min(price_min, lo)
+            price_max = hi if price_max is None else max(price_max, hi)
+
+        elapsed = time.perf_counter() - t0
+        print(f"   chunk {i + 1}: {raw_rows:,} raw → {kept_rows:,} clean "
+              f"({raw_rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+    if parquet:
+        parquet.close()
+    if catalog_dst:
+        catalog_index.save_catalog(catalog.result(), catalog_dst)
+    if cube_dst:
+        cube.result().save(cube_dst)
+
+    elapsed = time.perf_counter() - t0
+    print(f"Raw rows: {raw_rows:,}")
+    for path in (dst, parquet_dst):
+        if path:
+            print(f"✅ {path} — {kept_rows:,} rows {'appended' if append else 'written'}")
+    if catalog_dst:
+        print(f"✅ {catalog_dst} — {len(catalog.result()['companies'])} companies")
+    if cube_dst:
+        print(f"✅ {cube_dst} — aggregate cube for the Insights tab")
+    if price_min is not None:
+        print(f"   Price range: ₹{price_min:,} – ₹{price_max:,}")
+    print(f"   Throughput: {raw_rows / max(elapsed, 1e-9):,.0f} rows/sec ({elapsed:.1f}s)")
+    print(f"   Cleaning rules:\n{report.format()}")
+    if deduplicator:
+        print(f"   Dedup:\n{deduplicator.format()}")
+    print(f"   Peak RSS: {peak_rss_mb():,.0f} MB")
+
+
+def build_indexes(catalog_dst, cube_dst):
+    """Rebuild the catalog and cube from the already-cleaned dataset."""
+    car = dataset_io.load_cleaned()
+    if catalog_dst:
+        catalog = catalog_index.build_catalog(car)
+        catalog_index.save_catalog(catalog, catalog_dst)
+        print(f"✅ {catalog_dst} — {len(catalog['companies'])} companies, "
+              f"{sum(map(len, catalog['models'].values()))} models")
+    if cube_dst:
+        cube = insights_cube.build_cube(car)
+        cube.save(cube_dst)
+        print(f"✅ {cube_dst} — {len(cube.cells)} company × fuel × year cells")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean quikr_car.csv into Cleaned_Car_data.csv")
+    parser.add_argument("--input", default="quikr_car.csv", help="raw listings CSV")
+    parser.add_argument("--output", default=dataset_io.CLEANED_CSV, help="cleaned CSV")
+    parser.add_argument("--parquet-output", default=dataset_io.CLEANED_PARQUET,
+                        help="columnar copy of the cleaned dataset")
+    parser.add_argument("--catalog-output", default=catalog_index.CATALOG_PATH,
+                        help="company → model → fuel/year index used by the Predict form (\"\" to skip)")
+    parser.add_argument("--cube-output", default=insights_cube.CUBE_PATH,
+                        help="company × fuel × year aggregate cube used by the Insights tab (\"\" to skip)")
+    parser.add_argument("--format", choices=["csv", "parquet", "both"], default="both",
+                        help="which cleaned outputs to write (default both)")
+    parser.add_argument("--stream", action="store_true",
+                        help="clean in bounded-size chunks (constant memory, for large files)")
+    parser.add_argument("--chunksize", type=int, default=200_000,
+                        help="rows per chunk in --stream mode (default 200,000)")
+    parser.add_argument("--append", action="store_true",
+                        help="with --stream, append to an existing output instead of overwriting")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record each cleaning rule's peak allocation with tracemalloc (slower)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="drop exact and near-duplicate listings (reposts of the same car)")
+    parser.add_argument("--dedup-kms", type=int, default=dedup.KMS_TOLERANCE,
+                        help=f"near-duplicate odometer tolerance in km (default {dedup.KMS_TOLERANCE})")
+    parser.add_argument("--dedup-price", type=float, default=dedup.PRICE_TOLERANCE,
+                        help=f"near-duplicate price tolerance as a share (default {dedup.PRICE_TOLERANCE})")
+    parser.add_argument("--indexes-only", action="store_true",
+                        help="only rebuild the catalog and cube from the existing cleaned dataset")
+    args = parser.parse_args()
+
+    if args.indexes_only:
+        build_indexes(args.catalog_output, args.cube_output)
+        return
+
+    dst = args.output if args.format in ("csv", "both") else None
+    parquet_dst = args.parquet_output if args.format in ("parquet", "both") else None
+    if parquet_dst and not dataset_io.parquet_available():
+        print("   note: pyarrow not installed — writing CSV only")
+        parquet_dst = None
+        dst = dst or args.output
+    if args.append and not dst:
+        parser.error("--append needs CSV output (--format csv or both)")
+
+    deduplicator = dedup.Deduplicator(args.dedup_kms, args.dedup_price) if args.dedup else None
+    if args.stream:
+        clean_stream(args.input, dst, args.chunksize, append=args.append,
+                     parquet_dst=parquet_dst, catalog_dst=args.catalog_output,
+                     cube_dst=args.cube_output, trace_memory=args.trace_memory,
+                     deduplicator=deduplicator)
+    else:
+        clean_file(args.input, dst, parquet_dst, args.catalog_output, args.cube_output,
+                   trace_memory=args.trace_memory, deduplicator=deduplicator)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:          # CSV-only fallback
+    pa = pq = None
+
+CLEANED_CSV     = "Cleaned_Car_data.csv"
+CLEANED_PARQUET = "Cleaned_Car_data.parquet"
+
+COLUMNS = ["name", "company", "year", "Price", "kms_driven", "fuel_type"]
+
+# Compact in-memory layout of the cleaned dataset. The three text columns
+# repeat a few hundred distinct values, so they are stored as categoricals
+# (dictionary-encoded in Parquet); the integers fit in 16/32 bits.
+COLUMN_DTYPES = {
+    "name":       "category",
+    "company":    "category",
+    "year":       "int16",
+    "Price":      "int32",
+    "kms_driven": "int32",
+    "fuel_type":  "category",
+}
+
+if pa is not None:
+    _DICT = pa.dictionary(pa.int32(), pa.string())
+    PARQUET_SCHEMA = pa.schema([
+        ("name",       _DICT),
+        ("company",    _DICT),
+        ("year",       pa.int16()),
+        ("Price",      pa.int32()),
+        ("kms_driven", pa.int32()),
+        ("fuel_type",  _DICT),
+    ])
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast a cleaned frame to the compact categorical/int dtypes."""
+    return df[COLUMNS].astype(COLUMN_DTYPES)
+
+
+def _to_table(df: pd.DataFrame):
+    table = pa.Table.from_pandas(to_columnar(df), preserve_index=False)
+    return table.cast(PARQUET_SCHEMA)
+
+
+def write_parquet(df: pd.DataFrame, path: str = CLEANED_PARQUET) -> None:
+    pq.write_table(_to_table(df), path)
+
+
+class ParquetChunkWriter:
+    """Write a cleaned dataset to Parquet one chunk (row group) at a time."""
+
+    def __init__(self, path: str = CLEANED_PARQUET):
+        self.path = path
+        self._writer = pq.ParquetWriter(path, PARQUET_SCHEMA)
+
+    def write(self, df: pd.DataFrame) -> None:
+        if len(df):
+            self._writer.write_table(_to_table(df))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def is_fresh(path: str, source: str = CLEANED_CSV) -> bool:
+    """True if a file derived from `source` exists and is not older than it."""
+    if not os.path.exists(path):
+        return False
+    if not os.path.exists(source):
+        return True
+    return os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def columnar_is_fresh(csv_path: str = CLEANED_CSV, parquet_path: str = CLEANED_PARQUET) -> bool:
+    """True if the Parquet copy exists and is not older than the CSV."""
+    return pq is not None and is_fresh(parquet_path, csv_path)
+
+
+def load_cleaned(csv_path: str = CLEANED_CSV, parquet_path: str = CLEANED_PARQUET) -> pd.DataFrame:
+    """Load the cleaned dataset, preferring the columnar copy over the CSV.
+
+    Either way the frame comes back with the compact COLUMN_DTYPES. Raises
+    FileNotFoundError if neither file exists.
+    """
+    if columnar_is_fresh(csv_path, parquet_path):
+        return pd.read_parquet(parquet_path)
+    return pd.read_csv(csv_path, dtype=COLUMN_DTYPES)
+
+
+def load_tail(start: int, csv_path: str = CLEANED_CSV, parquet_path: str = CLEANED_PARQUET) -> pd.DataFrame:
+    """Rows `start` onwards of the cleaned dataset, i.e. those appended after it
+    had `start` rows. Earlier rows are skipped, not parsed into the frame."""
+    if columnar_is_fresh(csv_path, parquet_path):
+        pf = pq.ParquetFile(parquet_path)
+        groups, offset = [], 0
+        for i in range(pf.num_row_groups):
+            n = pf.metadata.row_group(i).num_rows
+            if offset + n > start:
+                groups.append(i)
+            offset += n
+        if not groups:
+            return pd.read_parquet(parquet_path).iloc[:0]
+        first = sum(pf.metadata.row_group(i).num_rows for i in range(groups[0]))
+        tail = pf.read_row_groups(groups).to_pandas()
+        return tail.iloc[start - first:].reset_index(drop=True)
+    return pd.read_csv(csv_path, dtype=COLUMN_DTYPES, skiprows=range(1, start + 1))
+
+
+def load_head(n: int, csv_path: str = CLEANED_CSV, parquet_path: str = CLEANED_PARQUET) -> pd.DataFrame:
+    """First `n` rows of the cleaned dataset, without reading the rest of it."""
+    if columnar_is_fresh(csv_path, parquet_path):
+        batch = next(pq.ParquetFile(parquet_path).iter_batches(batch_size=n), None)
+        return batch.to_pandas() if batch is not None else pd.DataFrame(columns=COLUMNS)
+    return pd.read_csv(csv_path, dtype=COLUMN_DTYPES, nrows=n)
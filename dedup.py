@@ -0,0 +1,144 @@
+import time
+from itertools import repeat
+import numpy as np
+import pandas as pd
+
+# Reposts of the same car: same name/company/year/fuel, odometer within
+# KMS_TOLERANCE km and price within PRICE_TOLERANCE of the higher price
+KMS_TOLERANCE = 100
+PRICE_TOLERANCE = 0.01
+
+KEY = ["name", "company", "year", "fuel_type"]
+COLUMNS = ["name", "company", "year", "Price", "kms_driven", "fuel_type"]
+
+_PRIME = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _hash_columns(car: pd.DataFrame, columns) -> np.ndarray:
+    """uint64 hash per row of `columns`; categorical and object text hash alike."""
+    frame = car[columns].copy()
+    for col in columns:
+        if pd.api.types.is_integer_dtype(frame[col]):
+            frame[col] = frame[col].astype(np.int64)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _mix(h: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """Hash of (h, value): distinct values never collide for the same h."""
+    return pd.util.hash_array(h ^ (value.astype(np.uint64) * _PRIME))
+
+
+class Deduplicator:
+    """Drops exact and near-duplicate listings from a stream of cleaned frames.
+
+    Exact duplicates are rows equal in every column; a set of row hashes
+    from all earlier frames catches reposts across chunks.
+
+    Near duplicates share the KEY columns and are within `kms_tolerance` km
+    and `price_tolerance` of the higher of their prices. Rows are bucketed by
+    (key, kms // kms_tolerance, log-price bucket). Log-price buckets are
+    -ln(1 - price_tolerance) wide, the largest log gap two such prices can
+    have (ln(1 + tolerance) is narrower), so any such pair is in the same or
+    an adjacent bucket.
+    Only the first row of a bucket can survive it; a row is dropped if its
+    bucket already has an earlier row, or if the first row of one of the 8
+    adjacent buckets is earlier and within tolerance. That is 9 hash lookups
+    per row instead of a pairwise comparison, and the result does not
+    depend on how the stream is chunked.
+    """
+
+    def __init__(self, kms_tolerance: int = KMS_TOLERANCE, price_tolerance: float = PRICE_TOLERANCE):
+        if kms_tolerance < 1 or not 0 < price_tolerance < 1:
+            raise ValueError("dedup tolerances must be positive, and the price tolerance below 1")
+        self.kms_tolerance = int(kms_tolerance)
+        self.price_tolerance = float(price_tolerance)
+        self._log_step = -np.log1p(-self.price_tolerance)
+        # Both grow with each chunk instead of being rebuilt from all earlier ones
+        self._rows = set()                             # hashes of every distinct row so far
+        self._bucket = {}                              # bucket hash → row of self._first
+        self._first = np.empty((1024, 3), dtype=np.int64)   # first row per bucket: seq, kms, price
+        self._buckets_seen = 0
+        self._position = 0                             # rows seen, including observed ones
+        self.rows_in = 0
+        self.removed = {"exact": 0, "near": 0}
+        self.seconds = 0.0
+
+    def _buckets(self, group, kms, price, dk=0, dp=0):
+        kb = kms // self.kms_tolerance + dk
+        pb = np.floor(np.log(price) / self._log_step).astype(np.int64) + dp
+        return _mix(_mix(group, kb), pb)
+
+    def _add_first(self, buckets, seq, kms, price):
+        start, end = self._buckets_seen, self._buckets_seen + len(buckets)
+        if end > len(self._first):                     # doubling keeps appends amortized O(1)
+            grown = np.empty((max(end, 2 * len(self._first)), 3), dtype=np.int64)
+            grown[:start] = self._first[:start]
+            self._first = grown
+        self._first[start:end] = np.column_stack([seq, kms, price])
+        self._bucket.update(zip(buckets.tolist(), range(start, end)))
+        self._buckets_seen = end
+
+    def filter(self, car: pd.DataFrame) -> pd.DataFrame:
+        """The rows of `car` that duplicate neither each other nor any earlier frame."""
+        t0 = time.perf_counter()
+        n = len(car)
+        seq = self._position + np.arange(n)
+        self._position += n
+        self.rows_in += n
+
+        # ── Exact duplicates ────────────────────────────────────────────
+        rows = _hash_columns(car, COLUMNS)
+        exact = (pd.Series(rows).duplicated().to_numpy()
+                 | np.fromiter(map(self._rows.__contains__, rows.tolist()), dtype=bool, count=n))
+        self._rows.update(rows[~exact].tolist())
+
+        # ── Near duplicates ─────────────────────────────────────────────
+        cand = np.flatnonzero(~exact)
+        group = _hash_columns(car.iloc[cand], KEY)
+        kms = car["kms_driven"].to_numpy(dtype=np.int64)[cand]
+        price = car["Price"].to_numpy(dtype=np.int64)[cand]
+        seq = seq[cand]
+        buckets = self._buckets(group, kms, price)
+
+        known = np.fromiter(map(self._bucket.__contains__, buckets.tolist()), dtype=bool, count=len(cand))
+        first = ~pd.Series(buckets).duplicated().to_numpy() & ~known
+        self._add_first(buckets[first], seq[first], kms[first], price[first])
+
+        near = ~first                          # bucket already had an earlier row
+        # Only the first rows of their buckets can still survive
+        sub = np.flatnonzero(first)
+        group, kms, price, seq = group[sub], kms[sub], price[sub], seq[sub]
+        for dk in (-1, 0, 1):
+            for dp in (-1, 0, 1):
+                if dk == dp == 0:
+                    continue
+                keys = self._buckets(group, kms, price, dk, dp).tolist()
+                pos = np.fromiter(map(self._bucket.get, keys, repeat(-1)), dtype=np.int64, count=len(keys))
+                found = np.flatnonzero(pos >= 0)
+                other = self._first[pos[found]]
+                near[sub[found]] |= (
+                    (other[:, 0] < seq[found])
+                    & (np.abs(other[:, 1] - kms[found]) <= self.kms_tolerance)
+                    & (np.abs(other[:, 2] - price[found])
+                       <= self.price_tolerance * np.maximum(other[:, 2], price[found]))
+                )
+
+        keep = np.zeros(n, dtype=bool)
+        keep[cand[~near]] = True
+        self.removed["exact"] += int(exact.sum())
+        self.removed["near"] += int(near.sum())
+        self.seconds += time.perf_counter() - t0
+        return car[keep].reset_index(drop=True)
+
+    def observe(self, car: pd.DataFrame) -> None:
+        """Register already-written listings (e.g. before --append) without counting them."""
+        counters = self.rows_in, dict(self.removed), self.seconds
+        self.filter(car)
+        self.rows_in, self.removed, self.seconds = counters
+
+    def format(self) -> str:
+        kept = self.rows_in - sum(self.removed.values())
+        return (f"   exact duplicates   {self.removed['exact']:>11,}\n"
+                f"   near duplicates    {self.removed['near']:>11,}"
+                f"  (±{self.kms_tolerance:,} km, ±{self.price_tolerance:.0%} price)\n"
+                f"   {self.rows_in:,} rows in → {kept:,} kept · {self.seconds * 1e3:,.0f} ms")
@@ -0,0 +1,58 @@
+import time
+import numpy as np
+import pandas as pd
+
+import dataset_io
+import inference
+
+# The Predict form's year range, and the odometer readings drawn as one curve each
+YEARS = np.arange(2000, 2025)
+KMS_BUCKETS = (10_000, 50_000, 100_000, 150_000)
+
+
+def curve_grid(name: str, company: str, fuel_type: str,
+               years=YEARS, kms_buckets=KMS_BUCKETS) -> pd.DataFrame:
+    """Every (year, kms bucket) combination for one car, as model input rows."""
+    years = np.asarray(years)
+    kms = np.asarray(kms_buckets)
+    return pd.DataFrame({
+        "name": name,
+        "company": company,
+        "year": np.repeat(years, len(kms)),
+        "kms_driven": np.tile(kms, len(years)),
+        "fuel_type": fuel_type,
+    })[inference.FEATURES]
+
+
+def depreciation_curves(model, name: str, company: str, fuel_type: str, log_transform: bool,
+                        years=YEARS, kms_buckets=KMS_BUCKETS) -> pd.DataFrame:
+    """Predicted price by year (rows) and kms bucket (columns), from one predict call."""
+    grid = curve_grid(name, company, fuel_type, years, kms_buckets)
+    grid["Price"] = inference.to_price(model.predict(grid), log_transform)
+    curves = grid.pivot(index="year", columns="kms_driven", values="Price")
+    curves.index.name = "Year"
+    curves.columns = [f"{kms // 1000:,}k km" for kms in curves.columns]
+    return curves
+
+
+def main():
+    model = inference.load_model()
+    log_transform = inference.model_log_transform()
+    df = dataset_io.load_head(1)
+    name, company, fuel_type = df.loc[0, ["name", "company", "fuel_type"]]
+    grid = curve_grid(name, company, fuel_type)
+
+    t0 = time.perf_counter()
+    batched = depreciation_curves(model, name, company, fuel_type, log_transform)
+    t1 = time.perf_counter()
+    single = [inference.to_price(model.predict(grid.iloc[[i]]), log_transform)[0] for i in range(len(grid))]
+    t2 = time.perf_counter()
+
+    assert np.allclose(batched.to_numpy().ravel(), single)
+    print(f"{name} ({fuel_type}) · {len(grid)} grid points")
+    print(f"   one batched predict  {(t1 - t0) * 1e3:8.1f} ms")
+    print(f"   {len(grid)} single-row calls  {(t2 - t1) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def _encoder_state(ct):
+    """What a fitted ColumnTransformer's output depends on, for comparing folds."""
+    state = []
+    for label, transformer, columns in ct.transformers_:
+        state.append((label, list(columns) if not isinstance(columns, str) else columns))
+        if hasattr(transformer, "categories_"):
+            state.append([list(map(str, cats)) for cats in transformer.categories_])
+            infrequent = getattr(transformer, "infrequent_categories_", None)
+            state.append(None if infrequent is None else
+                         [None if c is None else list(map(str, c)) for c in infrequent])
+    return state
+
+
+class FoldEnsemble:
+    """Average of the pipelines fitted on the cross-validation folds.
+
+    Scored like a single pipeline: predict(X) → mean of the fold models'
+    outputs. When every fold ended up with the same encoder (the categories
+    are fixed from the full data, see model_training.one_hot_transformer), X
+    is transformed once and only the regressors run per fold. Otherwise each
+    fold pipeline predicts on its own.
+    """
+
+    def __init__(self, pipelines):
+        pipelines = list(pipelines)
+        if not pipelines:
+            raise ValueError("FoldEnsemble needs at least one fitted pipeline")
+        first = _encoder_state(pipelines[0][0])
+        if all(_encoder_state(p[0]) == first for p in pipelines[1:]):
+            self.preprocessor = pipelines[0][:-1]
+            self.regressors = [p[-1] for p in pipelines]
+            self.pipelines = None
+        else:
+            self.preprocessor = None
+            self.regressors = [p[-1] for p in pipelines]
+            self.pipelines = pipelines
+
+    def __len__(self):
+        return len(self.regressors)
+
+    def predict(self, X) -> np.ndarray:
+        if self.preprocessor is not None:
+            Xt = self.preprocessor.transform(X)
+            return np.mean([reg.predict(Xt) for reg in self.regressors], axis=0)
+        return np.mean([pipe.predict(X) for pipe in self.pipelines], axis=0)
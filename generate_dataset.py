@@ -1,10 +1,9 @@
+import argparse
+import time
 import pandas as pd
 import numpy as np
 import random
 
-random.seed(42)
-np.random.seed(42)
-
 # ── Company tiers and models ──────────────────────────────────────
 COMPANIES = {
     # Luxury tier (multiplier 3.0)
@@ -49,68 +48,226 @@ def generate_price(company, multiplier, year, kms_driven, fuel_type):
     noise = random.gauss(0, price * 0.09)
     return max(int(price + noise), 25000)
 
-rows = []
+
+def generate_price_vectorized(multiplier, year, kms_driven, fuel_type, rng):
+    """Column-wise version of generate_price() for NumPy arrays.
+
+    `fuel_type` is an array of fuel names; `rng` is a numpy Generator so the
+    noise stream is reproducible per block.
+    """
+    base = 280000
+    age_dep = (2024 - year) * 17000
+    km_dep  = kms_driven * 0.85
+    fuel_add = np.where(fuel_type == "Diesel", 38000, np.where(fuel_type == "LPG", -8000, 0))
+    price = (base - age_dep - km_dep + fuel_add) * multiplier
+    price = np.maximum(price, 40000)
+    noise = rng.normal(0, price * 0.09)
+    return np.maximum((price + noise).astype(np.int64), 25000)
+
+
 TARGET = 1060
 
 company_list = list(COMPANIES.keys())
 weights = [8 if COMPANIES[c][0] < 1.5 else (3 if COMPANIES[c][0] < 2.0 else 1) for c in company_list]
 
-for _ in range(TARGET):
-    company = random.choices(company_list, weights=weights, k=1)[0]
-    multiplier, models = COMPANIES[company]
-    model   = random.choice(models)
-    name    = f"{company} {model} {'VXI' if random.random() > 0.5 else 'LXI' if random.random() > 0.5 else 'ZXI'}"
+
+# ── Legacy row-by-row generator (default, produces the reference CSV) ────
+def generate_rows(target):
+    rows = []
+    for _ in range(target):
+        company = random.choices(company_list, weights=weights, k=1)[0]
+        multiplier, models = COMPANIES[company]
+        model   = random.choice(models)
+        name    = f"{company} {model} {'VXI' if random.random() > 0.5 else 'LXI' if random.random() > 0.5 else 'ZXI'}"
+
+        # Year distribution
+        r = random.random()
+        if r < 0.60:
+            year = random.randint(2012, 2019)
+        elif r < 0.85:
+            year = random.randint(2008, 2011)
+        else:
+            year = random.randint(2019, 2023)
+
+        # KMs — inversely correlated with year
+        avg_km  = max(5000, (2024 - year) * 12000 + random.gauss(0, 15000))
+        kms_raw = max(3000, int(avg_km))
+
+        fuel_type = random.choice(FUEL_TYPES)
+        price     = generate_price(company, multiplier, year, kms_raw, fuel_type)
+
+        rows.append({
+            "name":       name,
+            "company":    company,
+            "year":       year,
+            "Price":      price,
+            "kms_driven": kms_raw,
+            "fuel_type":  fuel_type,
+        })
+
+    return pd.DataFrame(rows)
+
+
+def inject_dirt(df):
+    # Consecutive row ranges, one per kind of dirt, sized by DIRT_RATES so
+    # any --rows works: 80/40/30/20/15/10 rows at the default 1,060
+    bounds = np.cumsum([0] + [round(rate * len(df)) for _, rate in DIRT_RATES])
+    kms_string, price_commas, ask_price, nan_fuel, nan_kms, year_float = (
+        range(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])
+    )
+
+    # kms_driven as "45,000 kms"
+    for i in kms_string:
+        df.at[i, "kms_driven"] = f"{df.at[i, 'kms_driven']:,} kms"
+
+    # Price as comma-string
+    for i in price_commas:
+        p = df.at[i, "Price"]
+        df.at[i, "Price"] = f"{p:,}"
+
+    # Price = "Ask For Price"
+    for i in ask_price:
+        df.at[i, "Price"] = "Ask For Price"
+
+    # NaN fuel_type
+    df.loc[nan_fuel, "fuel_type"] = None
+
+    # NaN kms_driven
+    df.loc[nan_kms, "kms_driven"] = None
+
+    # year as float string
+    for i in year_float:
+        df.at[i, "year"] = f"{df.at[i, 'year']}.0"
+
+    return df
+
+
+# ── Vectorized block generator (load-test corpora, --vectorized) ─────────
+# Rows are produced in fixed-size blocks, each seeded from the run seed and
+# its block number. The file therefore depends only on (seed, rows), never on
+# how much memory the writer happens to use.
+BLOCK_ROWS = 500_000
+
+# Dirt rates mirror the legacy layout (80/40/30/20/15/10 rows out of 1060)
+DIRT_RATES = [
+    ("kms_string",   80 / TARGET),
+    ("price_commas", 40 / TARGET),
+    ("ask_price",    30 / TARGET),
+    ("nan_fuel",     20 / TARGET),
+    ("nan_kms",      15 / TARGET),
+    ("year_float",   10 / TARGET),
+]
+
+# Flattened (company, model) table so a whole column can be sampled at once
+_TRIMS        = ["VXI", "LXI", "ZXI"]
+_NAMES        = [f"{c} {m} {t}" for c in company_list for m in COMPANIES[c][1] for t in _TRIMS]
+_MODEL_OFFSET = np.cumsum([0] + [len(COMPANIES[c][1]) for c in company_list])[:-1]
+_MODEL_COUNT  = np.array([len(COMPANIES[c][1]) for c in company_list])
+_MULTIPLIER   = np.array([COMPANIES[c][0] for c in company_list])
+_COMPANY_P    = np.array(weights) / sum(weights)
+_FUELS        = np.array(FUEL_TYPES, dtype=object)
+
+
+def generate_block(n, rng):
+    company_idx = rng.choice(len(company_list), size=n, p=_COMPANY_P)
+    pair_idx    = _MODEL_OFFSET[company_idx] + (rng.random(n) * _MODEL_COUNT[company_idx]).astype(np.int64)
+
+    # Trim: VXI 50%, LXI 25%, ZXI 25% — same odds as the nested ternary above
+    trim = np.where(rng.random(n) > 0.5, 0, np.where(rng.random(n) > 0.5, 1, 2))
+    name = pd.Categorical.from_codes(pair_idx * len(_TRIMS) + trim, _NAMES)
 
     # Year distribution
-    r = random.random()
-    if r < 0.60:
-        year = random.randint(2012, 2019)
-    elif r < 0.85:
-        year = random.randint(2008, 2011)
-    else:
-        year = random.randint(2019, 2023)
+    r = rng.random(n)
+    year = np.where(
+        r < 0.60, rng.integers(2012, 2020, n),
+        np.where(r < 0.85, rng.integers(2008, 2012, n), rng.integers(2019, 2024, n)),
+    )
 
     # KMs — inversely correlated with year
-    avg_km  = max(5000, (2024 - year) * 12000 + random.gauss(0, 15000))
-    kms_raw = max(3000, int(avg_km))
+    avg_km  = np.maximum(5000, (2024 - year) * 12000 + rng.normal(0, 15000, n))
+    kms_raw = np.maximum(3000, avg_km.astype(np.int64))
 
-    fuel_type = random.choice(FUEL_TYPES)
-    price     = generate_price(company, multiplier, year, kms_raw, fuel_type)
+    fuel_type = _FUELS[rng.integers(0, len(FUEL_TYPES), n)]
+    price     = generate_price_vectorized(_MULTIPLIER[company_idx], year, kms_raw, fuel_type, rng)
 
-    rows.append({
+    df = pd.DataFrame({
         "name":       name,
-        "company":    company,
+        "company":    pd.Categorical.from_codes(company_idx, company_list),
         "year":       year,
         "Price":      price,
         "kms_driven": kms_raw,
         "fuel_type":  fuel_type,
     })
+    return inject_dirt_vectorized(df, rng)
+
+
+def inject_dirt_vectorized(df, rng):
+    # One draw per row picks at most one kind of dirt, at the legacy rates
+    u = rng.random(len(df))
+    edges = np.cumsum([rate for _, rate in DIRT_RATES])
+    kind = np.searchsorted(edges, u, side="right")
+    masks = {label: kind == i for i, (label, _) in enumerate(DIRT_RATES)}
+
+    df["kms_driven"] = df["kms_driven"].astype(object)
+    df["Price"]      = df["Price"].astype(object)
+    df["year"]       = df["year"].astype(object)
+    df["fuel_type"]  = df["fuel_type"].astype(object)
+
+    m = masks["kms_string"]
+    df.loc[m, "kms_driven"] = df.loc[m, "kms_driven"].map("{:,} kms".format)
+    m = masks["price_commas"]
+    df.loc[m, "Price"] = df.loc[m, "Price"].map("{:,}".format)
+    df.loc[masks["ask_price"], "Price"] = "Ask For Price"
+    df.loc[masks["nan_fuel"], "fuel_type"] = None
+    df.loc[masks["nan_kms"], "kms_driven"] = None
+    m = masks["year_float"]
+    df.loc[m, "year"] = df.loc[m, "year"].map("{}.0".format)
+    return df
+
+
+def generate_vectorized(rows, seed, path):
+    """Stream `rows` listings to `path` block by block; returns rows written."""
+    n_blocks = -(-rows // BLOCK_ROWS)
+    written = 0
+    for b in range(n_blocks):
+        n = min(BLOCK_ROWS, rows - written)
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(b,)))
+        block = generate_block(n, rng)
+        block.to_csv(path, index=False, mode="w" if b == 0 else "a", header=(b == 0))
+        written += n
+        print(f"   block {b + 1}/{n_blocks} — {written:,} rows")
+    return written
+
 
-df = pd.DataFrame(rows)
+def main():
+    parser = argparse.ArgumentParser(description="Generate the raw quikr_car.csv dataset")
+    parser.add_argument("--rows", type=int, default=TARGET,
+                        help=f"number of raw listings to generate (default {TARGET})")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default 42)")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="NumPy column-wise generation, written in blocks (for large corpora)")
+    parser.add_argument("--output", default="quikr_car.csv", help="output CSV path")
+    args = parser.parse_args()
 
-# ── Inject intentional dirt ──────────────────
-# 80 rows: kms_driven as "45,000 kms"
-for i in range(80):
-    df.at[i, "kms_driven"] = f"{df.at[i, 'kms_driven']:,} kms"
+    if args.vectorized:
+        t0 = time.perf_counter()
+        written = generate_vectorized(args.rows, args.seed, args.output)
+        elapsed = time.perf_counter() - t0
+        print(f"✅ {args.output} created — {written:,} raw rows, 6 columns "
+              f"({elapsed:.1f}s, {written / max(elapsed, 1e-9):,.0f} rows/sec)")
+        return
 
-# 40 rows: Price as comma-string
-for i in range(80, 120):
-    p = df.at[i, "Price"]
-    df.at[i, "Price"] = f"{p:,}"
+    random.seed(args.seed)
+    np.random.seed(args.seed)
 
-# 30 rows: Price = "Ask For Price"
-for i in range(120, 150):
-    df.at[i, "Price"] = "Ask For Price"
+    df = generate_rows(args.rows)
 
-# 20 rows: NaN fuel_type
-df.loc[150:169, "fuel_type"] = None
+    # ── Inject intentional dirt ──────────────────
+    df = inject_dirt(df)
 
-# 15 rows: NaN kms_driven
-df.loc[170:184, "kms_driven"] = None
+    df.to_csv(args.output, index=False)
+    print(f"✅ {args.output} created — {len(df)} raw rows, 6 columns")
 
-# 10 rows: year as float string
-for i in range(185, 195):
-    df.at[i, "year"] = f"{df.at[i, 'year']}.0"
 
-df.to_csv("quikr_car.csv", index=False)
-print(f"✅ quikr_car.csv created — {len(df)} raw rows, 6 columns")
+if __name__ == "__main__":
+    main()
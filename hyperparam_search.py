@@ -0,0 +1,164 @@
+import json
+import math
+import os
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.model_selection import KFold
+
+# Written next to the model; model_training.py trains with CONFIG_PATH when present
+CONFIG_PATH = "model_config.json"
+LEADERBOARD_PATH = "search_leaderboard.csv"
+
+# Search space for the GradientBoosting engine
+LEARNING_RATE_RANGE = (0.02, 0.3)        # sampled log-uniformly
+MAX_DEPTH_CHOICES = [2, 3, 4, 5, 6]
+SUBSAMPLE_RANGE = (0.6, 1.0)
+MIN_SAMPLES_LEAF_CHOICES = [1, 2, 5, 10]
+
+
+def sample_candidates(n: int, seed: int = 42) -> list:
+    rng = np.random.default_rng(seed)
+    lo, hi = np.log10(LEARNING_RATE_RANGE[0]), np.log10(LEARNING_RATE_RANGE[1])
+    return [
+        {
+            "learning_rate": round(float(10 ** rng.uniform(lo, hi)), 4),
+            "max_depth": int(rng.choice(MAX_DEPTH_CHOICES)),
+            "subsample": round(float(rng.uniform(*SUBSAMPLE_RANGE)), 2),
+            "min_samples_leaf": int(rng.choice(MIN_SAMPLES_LEAF_CHOICES)),
+        }
+        for _ in range(n)
+    ]
+
+
+def _staged_r2(model, X_val, y_val) -> np.ndarray:
+    """Validation R² after every boosting stage, from a single fit."""
+    ss_tot = ((y_val - y_val.mean()) ** 2).sum()
+    return np.array([1 - ((y_val - p) ** 2).sum() / ss_tot for p in model.staged_predict(X_val)])
+
+
+def _fit_fold(params, max_estimators, X, y, train_idx, val_idx, deadline):
+    """Fit one candidate on one fold; None if the budget ran out before it started.
+
+    The monitor stops boosting once the wall-clock deadline passes, so a
+    fit in flight returns a shorter validation curve instead of overrunning.
+    """
+    if time.time() >= deadline:
+        return None
+    t0 = time.perf_counter()
+    model = GradientBoostingRegressor(n_estimators=max_estimators, random_state=42, **params)
+    model.fit(X[train_idx], y[train_idx], monitor=lambda i, est, local: time.time() >= deadline)
+    return _staged_r2(model, X[val_idx], y[val_idx]), time.perf_counter() - t0
+
+
+def successive_halving(X, y, n_candidates=27, eta=3, min_rows=200, max_estimators=600,
+                       cv=3, budget_s=300.0, n_jobs=-1, seed=42):
+    """Budgeted successive-halving search over GradientBoosting hyperparameters.
+
+    X is the already-encoded feature matrix. Every round fits the surviving
+    candidates on all `cv` folds with a growing share of the training rows
+    and keeps the best 1/eta. n_estimators is not searched: each fit runs up
+    to `max_estimators` stages and the best stage on the mean validation
+    curve is taken. Returns (winner, leaderboard).
+    """
+    deadline = time.time() + budget_s
+    rng = np.random.default_rng(seed)
+    folds = [(rng.permutation(tr), va)
+             for tr, va in KFold(cv, shuffle=True, random_state=seed).split(X)]
+    n_train = min(len(tr) for tr, _ in folds)
+    n_rounds = max(1, math.ceil(math.log(n_candidates, eta)))
+
+    # Start small enough that the last round trains on every row
+    first_rows = max(min_rows, n_train // eta ** (n_rounds - 1))
+
+    candidates = list(enumerate(sample_candidates(n_candidates, seed)))
+    records, winner, prev_rows = [], None, None
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for rnd in range(n_rounds):
+            rows = n_train if rnd == n_rounds - 1 else min(n_train, first_rows * eta ** rnd)
+            if rows == prev_rows:
+                # Same rows as the last round: its scores already rank the survivors
+                candidates = candidates[:max(1, math.ceil(len(candidates) / eta))]
+                continue
+            prev_rows = rows
+
+            t0 = time.perf_counter()
+            results = parallel(
+                delayed(_fit_fold)(params, max_estimators, X, y, tr[:rows], va, deadline)
+                for _, params in candidates for tr, va in folds
+            )
+
+            scored = []
+            for i, (cid, params) in enumerate(candidates):
+                per_fold = results[i * cv:(i + 1) * cv]
+                if any(r is None for r in per_fold):
+                    continue
+                stages = min(len(curve) for curve, _ in per_fold)
+                mean_curve = np.mean([curve[:stages] for curve, _ in per_fold], axis=0)
+                best = int(mean_curve.argmax())
+                record = {
+                    "round": rnd + 1,
+                    "rows": rows,
+                    "candidate": cid,
+                    **params,
+                    "n_estimators": best + 1,
+                    "cv_r2": round(float(mean_curve[best]), 5),
+                    "fit_s": round(sum(seconds for _, seconds in per_fold), 2),
+                    "truncated": stages < max_estimators,
+                }
+                records.append(record)
+                scored.append((record["cv_r2"], cid, params, record))
+
+            print(f"   round {rnd + 1}/{n_rounds}: {len(scored)}/{len(candidates)} candidates "
+                  f"on {rows:,} rows × {cv} folds in {time.perf_counter() - t0:.1f}s")
+            if not scored:
+                break
+            scored.sort(key=lambda s: s[0], reverse=True)
+            winner = scored[0][3]
+            if time.time() >= deadline:
+                print(f"⚠️  Wall-clock budget of {budget_s:.0f}s reached; keeping the best so far")
+                break
+            candidates = [(cid, params) for _, cid, params, _ in scored[:max(1, math.ceil(len(scored) / eta))]]
+
+    leaderboard = pd.DataFrame(records)
+    if len(leaderboard):
+        leaderboard = leaderboard.sort_values(["round", "cv_r2"], ascending=[False, False], ignore_index=True)
+    return winner, leaderboard
+
+
+def winner_params(winner: dict) -> dict:
+    """GradientBoostingRegressor keyword arguments for a leaderboard record."""
+    return {
+        "n_estimators": int(winner["n_estimators"]),
+        "learning_rate": float(winner["learning_rate"]),
+        "max_depth": int(winner["max_depth"]),
+        "subsample": float(winner["subsample"]),
+        "min_samples_leaf": int(winner["min_samples_leaf"]),
+        "random_state": 42,
+    }
+
+
+def save_results(winner: dict, leaderboard: pd.DataFrame, search: dict,
+                 config_path: str = CONFIG_PATH, leaderboard_path: str = LEADERBOARD_PATH) -> None:
+    config = {
+        "engine": "gbr",
+        "params": winner_params(winner),
+        "cv_r2": winner["cv_r2"],
+        "rows": winner["rows"],
+        "searched_at": datetime.now().isoformat(timespec="seconds"),
+        "search": search,
+    }
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+    leaderboard.to_csv(leaderboard_path, index=False)
+
+
+def load_config(path: str = CONFIG_PATH):
+    """Saved GradientBoosting params, or None if no search has been run."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["params"]
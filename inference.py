@@ -0,0 +1,77 @@
+import os
+import pickle
+import numpy as np
+
+MODEL_PATH = "LinearRegressionModel.pkl"
+META_PATH  = "model_meta.pkl"
+BUNDLE_DIR = "model_bundle"     # versioned bundle, see model_bundle.py
+
+# Model input columns, in the order the pipeline was trained on
+FEATURES = ["name", "company", "year", "kms_driven", "fuel_type"]
+
+# Predictions are never shown below this (₹)
+PRICE_FLOOR = 40_000.0
+
+
+def load_pipeline(path: str = MODEL_PATH):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_meta(path: str = META_PATH) -> dict:
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    return {}
+
+
+def uses_log_transform(path: str = META_PATH) -> bool:
+    return load_meta(path).get("log_transform", False)
+
+
+def default_model_path() -> str:
+    """The model bundle when one has been written, else the pipeline pickle."""
+    return BUNDLE_DIR if os.path.isdir(BUNDLE_DIR) else MODEL_PATH
+
+
+def load_model(path: str = None):
+    """Predictor with .predict(X) from a bundle directory or a pipeline pickle.
+
+    A bundle is opened lazily (manifest first, memory-mapped arrays on use).
+    """
+    path = path or default_model_path()
+    if os.path.isdir(path):
+        import model_bundle
+        return model_bundle.ModelBundle(path).predictor()
+    return load_pipeline(path)
+
+
+def model_log_transform(path: str = None, meta_path: str = META_PATH) -> bool:
+    """log_transform flag from the bundle manifest, or from model_meta.pkl for a pickle."""
+    path = path or default_model_path()
+    if os.path.isdir(path):
+        import model_bundle
+        return model_bundle.read_manifest(path)["log_transform"]
+    return uses_log_transform(meta_path)
+
+
+def artifact_version(model_path: str = None, meta_path: str = META_PATH) -> tuple:
+    """Cheap fingerprint (mtime, size) of the model artifacts; changes on retrain.
+
+    For a bundle this is its manifest, which is replaced on every save.
+    Raises FileNotFoundError if the model itself is missing.
+    """
+    model_path = model_path or default_model_path()
+    if os.path.isdir(model_path):
+        manifest = os.stat(os.path.join(model_path, "manifest.json"))
+        return (model_path, manifest.st_mtime_ns, manifest.st_size)
+    model = os.stat(model_path)
+    meta = os.stat(meta_path) if os.path.exists(meta_path) else None
+    return (model.st_mtime_ns, model.st_size,
+            meta.st_mtime_ns if meta else None, meta.st_size if meta else None)
+
+
+def to_price(pred_raw, log_transform: bool) -> np.ndarray:
+    """Model output → ₹: undo the log transform and apply the price floor."""
+    pred_raw = np.asarray(pred_raw, dtype=float)
+    return np.maximum(np.exp(pred_raw) if log_transform else pred_raw, PRICE_FLOOR)
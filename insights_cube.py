@@ -0,0 +1,154 @@
+import os
+import numpy as np
+import pandas as pd
+
+CUBE_PATH = "insights_cube.npz"
+
+KEYS = ["company", "fuel_type", "year"]
+
+# Log-spaced price histogram per cell, used for a mergeable median estimate.
+# 256 bins over ₹10K–₹10Cr gives ~3.7% wide bins; interpolating inside the
+# bin keeps the estimate well within that.
+N_BINS = 256
+BIN_EDGES = np.logspace(4, 8, N_BINS + 1)
+
+
+def _bin_index(price: np.ndarray) -> np.ndarray:
+    return np.clip(np.searchsorted(BIN_EDGES, price, side="right") - 1, 0, N_BINS - 1)
+
+
+class CubeBuilder:
+    """Accumulates the company × fuel_type × year aggregate cube.
+
+    Every cell holds count / sum / min / max of Price plus a price histogram,
+    all of which merge by addition (min/max by min/max), so the cube can be
+    built one chunk at a time or extended with newly appended listings.
+    """
+
+    def __init__(self, cube: "Cube" = None):
+        self._cells = {}
+        if cube is not None:
+            for key, count, total, lo, hi, hist in zip(
+                cube.cells[KEYS].itertuples(index=False, name=None),
+                cube.cells["count"], cube.cells["sum"], cube.cells["min"], cube.cells["max"],
+                cube.hist,
+            ):
+                self._cells[key] = [int(count), int(total), int(lo), int(hi), hist.astype(np.int64)]
+
+    def update(self, df: pd.DataFrame) -> "CubeBuilder":
+        if df.empty:
+            return self
+        grouped = df.groupby(KEYS, observed=True)
+        stats = grouped["Price"].agg(["count", "sum", "min", "max"])
+        cell_id = grouped.ngroup().to_numpy()
+        flat = np.bincount(cell_id * N_BINS + _bin_index(df["Price"].to_numpy()),
+                           minlength=len(stats) * N_BINS)
+        hists = flat.reshape(len(stats), N_BINS)
+
+        for (key, row), hist in zip(stats.iterrows(), hists):
+            key = (key[0], key[1], int(key[2]))
+            cell = self._cells.get(key)
+            if cell is None:
+                self._cells[key] = [int(row["count"]), int(row["sum"]),
+                                    int(row["min"]), int(row["max"]), hist.astype(np.int64)]
+            else:
+                cell[0] += int(row["count"])
+                cell[1] += int(row["sum"])
+                cell[2] = min(cell[2], int(row["min"]))
+                cell[3] = max(cell[3], int(row["max"]))
+                cell[4] += hist
+        return self
+
+    def result(self) -> "Cube":
+        keys = sorted(self._cells)
+        values = [self._cells[k] for k in keys]
+        cells = pd.DataFrame(keys, columns=KEYS)
+        cells["year"] = cells["year"].astype("int16")
+        cells["count"] = np.array([v[0] for v in values], dtype=np.int64)
+        cells["sum"] = np.array([v[1] for v in values], dtype=np.int64)
+        cells["min"] = np.array([v[2] for v in values], dtype=np.int64)
+        cells["max"] = np.array([v[3] for v in values], dtype=np.int64)
+        hist = (np.vstack([v[4] for v in values]) if values
+                else np.zeros((0, N_BINS), dtype=np.int64))
+        return Cube(cells, hist)
+
+
+class Cube:
+    """Read side of the cube: roll-ups along one dimension for the Insights tab."""
+
+    def __init__(self, cells: pd.DataFrame, hist: np.ndarray):
+        self.cells = cells
+        self.hist = hist
+
+    # ── Totals ──────────────────────────────────────────────────────────
+    @property
+    def count(self) -> int:
+        return int(self.cells["count"].sum())
+
+    @property
+    def mean(self) -> float:
+        return self.cells["sum"].sum() / max(self.count, 1)
+
+    @property
+    def min(self) -> int:
+        return int(self.cells["min"].min())
+
+    @property
+    def max(self) -> int:
+        return int(self.cells["max"].max())
+
+    @property
+    def n_companies(self) -> int:
+        return self.cells["company"].nunique()
+
+    # ── Roll-ups ────────────────────────────────────────────────────────
+    def rollup(self, by: str, median: bool = False) -> pd.DataFrame:
+        """count / mean (and optionally approximate median) of Price per `by`."""
+        grouped = self.cells.groupby(by)
+        out = grouped[["count", "sum"]].sum()
+        out["mean"] = out["sum"] / out["count"]
+        if median:
+            out["median"] = [
+                approx_median(self.hist[grouped.indices[key]].sum(axis=0))
+                for key in out.index
+            ]
+        return out.drop(columns="sum")
+
+    # ── Persistence ─────────────────────────────────────────────────────
+    def save(self, path: str = CUBE_PATH) -> None:
+        np.savez_compressed(
+            path,
+            company=self.cells["company"].to_numpy(dtype=str),
+            fuel_type=self.cells["fuel_type"].to_numpy(dtype=str),
+            **{col: self.cells[col].to_numpy() for col in ["year", "count", "sum", "min", "max"]},
+            hist=self.hist.astype(np.uint32),
+        )
+
+    @classmethod
+    def load(cls, path: str = CUBE_PATH) -> "Cube":
+        with np.load(path) as z:
+            cells = pd.DataFrame({col: z[col] for col in
+                                  ["company", "fuel_type", "year", "count", "sum", "min", "max"]})
+            return cls(cells, z["hist"].astype(np.int64))
+
+
+def approx_median(hist: np.ndarray) -> float:
+    """Median of a BIN_EDGES histogram, interpolated in log space inside the bin."""
+    total = hist.sum()
+    if total == 0:
+        return float("nan")
+    cum = np.cumsum(hist)
+    b = int(np.searchsorted(cum, total / 2))
+    below = cum[b] - hist[b]
+    frac = (total / 2 - below) / hist[b]
+    lo, hi = np.log(BIN_EDGES[b]), np.log(BIN_EDGES[b + 1])
+    return float(np.exp(lo + frac * (hi - lo)))
+
+
+def build_cube(df: pd.DataFrame) -> Cube:
+    return CubeBuilder().update(df).result()
+
+
+def load_existing(path: str = CUBE_PATH) -> Cube:
+    """The cube at `path`, or None if there is none yet (for --append runs)."""
+    return Cube.load(path) if os.path.exists(path) else None
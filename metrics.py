@@ -0,0 +1,179 @@
+import argparse
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Hot-path timers and counters for app.py, exported as Prometheus text.
+# Off unless CARWORTH_METRICS_FILE (rewritten after every rerun) or
+# CARWORTH_METRICS_PORT (GET /metrics) is set; disabled, timer() hands back
+# one shared no-op context manager and count() returns at once.
+
+METRICS_FILE = os.environ.get("CARWORTH_METRICS_FILE", "")
+METRICS_PORT = int(os.environ.get("CARWORTH_METRICS_PORT", "0") or 0)
+ENABLED = bool(METRICS_FILE or METRICS_PORT)
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = "carworth"
+
+_NULL = nullcontext()
+_lock = threading.Lock()
+_histograms = {}                    # step → Histogram
+_counters = {}                      # event → int
+
+
+class Histogram:
+    """Per-bucket latency counts; made cumulative on export."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)      # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate, interpolating linearly inside the bucket (as histogram_quantile does)."""
+        if not self.count:
+            return float("nan")
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = BUCKETS[i - 1] if i else 0.0
+                hi = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+class _Timer:
+    __slots__ = ("step", "t0")
+
+    def __init__(self, step):
+        self.step = step
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.step, time.perf_counter() - self.t0)
+        return False
+
+
+def timer(step: str):
+    """Context manager recording the enclosed block's duration under `step`."""
+    return _Timer(step) if ENABLED else _NULL
+
+
+def observe(step: str, seconds: float) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(step)
+        if hist is None:
+            hist = _histograms[step] = Histogram()
+        hist.observe(seconds)
+
+
+def count(event: str, n: int = 1) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + n
+
+
+def snapshot() -> dict:
+    """Copies of the histograms and counters, for the admin panel."""
+    with _lock:
+        hists = {}
+        for step, h in _histograms.items():
+            copy = Histogram()
+            copy.counts, copy.sum, copy.count = list(h.counts), h.sum, h.count
+            hists[step] = copy
+        return {"histograms": hists, "counters": dict(_counters)}
+
+
+def render() -> str:
+    """Prometheus text exposition format."""
+    snap = snapshot()
+    lines = []
+    if snap["histograms"]:
+        name = f"{PREFIX}_step_seconds"
+        lines += [f"# HELP {name} Duration of app.py hot-path steps.", f"# TYPE {name} histogram"]
+        for step, h in sorted(snap["histograms"].items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), h.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{step="{step}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{step="{step}"}} {h.sum:.9g}')
+            lines.append(f'{name}_count{{step="{step}"}} {h.count}')
+    if snap["counters"]:
+        name = f"{PREFIX}_events_total"
+        lines += [f"# HELP {name} Counted app.py events.", f"# TYPE {name} counter"]
+        for event, n in sorted(snap["counters"].items()):
+            lines.append(f'{name}{{event="{event}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def flush(path: str = None) -> None:
+    """Rewrite the metrics file atomically (a no-op without CARWORTH_METRICS_FILE)."""
+    path = path or METRICS_FILE
+    if not (ENABLED and path):
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def serve(port: int = None, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread of this process."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port or METRICS_PORT), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the per-call cost of the metrics hooks")
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    global ENABLED
+    for enabled in (False, True):
+        ENABLED = enabled
+        t0 = time.perf_counter()
+        for _ in range(args.calls):
+            with timer("bench"):
+                pass
+        per_call = (time.perf_counter() - t0) / args.calls
+        print(f"   export {'on ' if enabled else 'off'}: {per_call * 1e9:6.0f} ns per timed block")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+import numpy as np
+import inference
+
+BUNDLE_DIR = inference.BUNDLE_DIR
+MANIFEST = "manifest.json"
+PIPELINE_FILE = "pipeline.pkl"
+FORMAT_VERSION = 1
+KEEP_VERSIONS = 3               # bundle versions kept on disk, the live one included
+
+
+def versions_dir(path: str = BUNDLE_DIR) -> str:
+    """Where the bundle versions live; `path` itself is a symlink to one of them."""
+    return f"{path}.versions"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def feature_schema(X) -> list:
+    """Model input columns in order, with string/categorical columns as "category"."""
+    return [
+        {"name": col, "dtype": "category" if X[col].dtype.name in ("object", "category") else X[col].dtype.name}
+        for col in X.columns
+    ]
+
+
+def save_bundle(pipe, X_train, log_transform: bool, engine: str, arrays: dict = None,
+                path: str = BUNDLE_DIR, training_rows: int = None) -> dict:
+    """Write a versioned model bundle and return its manifest.
+
+    Layout:
+      manifest.json   format version, metadata, feature schema, sha256 of every file
+      pipeline.pkl    the fitted sklearn pipeline
+      arrays/*.npy    compiled evaluator arrays (gbr only), one file each so they
+                      can be memory-mapped with np.load(mmap_mode="r")
+
+    The bundle is built in its own directory under versions_dir(path), named
+    by model version, and `path` is a symlink switched to it with one
+    os.replace, so readers always find a complete bundle. Older versions
+    beyond KEEP_VERSIONS are deleted; processes that opened one keep reading
+    it until they reload.
+    """
+    versions = versions_dir(path)
+    os.makedirs(versions, exist_ok=True)
+    tmp = os.path.join(versions, f".tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(os.path.join(tmp, "arrays"))
+
+    with open(os.path.join(tmp, PIPELINE_FILE), "wb") as f:
+        pickle.dump(pipe, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    array_files = {}
+    for key, arr in (arrays or {}).items():
+        rel = os.path.join("arrays", key.replace(":", "__") + ".npy")
+        np.save(os.path.join(tmp, rel), np.ascontiguousarray(arr))
+        array_files[key] = rel
+
+    files = {}
+    for rel in [PIPELINE_FILE] + sorted(array_files.values()):
+        full = os.path.join(tmp, rel)
+        files[rel] = {"sha256": _sha256(full), "bytes": os.path.getsize(full)}
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model_version": hashlib.sha256(
+            "".join(f"{rel}:{meta['sha256']}" for rel, meta in sorted(files.items())).encode()
+        ).hexdigest()[:16],
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "engine": engine,
+        "log_transform": log_transform,
+        "training_rows": len(X_train) if training_rows is None else training_rows,
+        "features": feature_schema(X_train),
+        "arrays": array_files,
+        "files": files,
+    }
+    with open(os.path.join(tmp, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    target = os.path.join(versions, manifest["model_version"])
+    if os.path.isdir(target):
+        # Same files saved again (the version hashes them): only the manifest
+        # can differ, and it is replaced in place
+        os.replace(os.path.join(tmp, MANIFEST), os.path.join(target, MANIFEST))
+        shutil.rmtree(tmp)
+    else:
+        os.rename(tmp, target)
+    _switch(path, target)
+    _prune(versions, keep=target)
+    return manifest
+
+
+def _switch(path: str, target: str) -> None:
+    """Point the `path` symlink at `target` atomically."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        # A bundle directory from before versioning: moved aside once, and
+        # until the link exists inference falls back to the pickle
+        legacy = os.path.join(versions_dir(path), f"legacy-{os.getpid()}")
+        os.rename(path, legacy)
+    link = f"{path}.link-{os.getpid()}"
+    if os.path.lexists(link):
+        os.remove(link)
+    # Relative, so the project directory can be moved or copied
+    os.symlink(os.path.relpath(target, os.path.dirname(os.path.abspath(path))), link)
+    os.replace(link, path)
+
+
+def _prune(versions: str, keep: str) -> None:
+    """Delete all but the newest KEEP_VERSIONS bundles, never `keep`."""
+    old = sorted((os.path.join(versions, name) for name in os.listdir(versions)
+                  if not name.startswith(".")), key=os.path.getmtime, reverse=True)
+    old.remove(keep)
+    for stale in old[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def read_manifest(path: str = BUNDLE_DIR) -> dict:
+    """Bundle manifest (raises FileNotFoundError, or ValueError for an unknown format)."""
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported bundle format {manifest.get('format_version')!r}")
+    return manifest
+
+
+class ModelBundle:
+    """A model bundle opened from its manifest; the model itself loads on first use.
+
+    With compiled arrays present, predictor() memory-maps them and never
+    imports sklearn, so worker processes share the arrays' pages through the
+    OS page cache. Otherwise it unpickles the pipeline.
+    """
+
+    def __init__(self, path: str = BUNDLE_DIR):
+        # Resolved once: if the link is switched to a newer version later, this
+        # bundle keeps loading its pipeline and arrays from the version it opened
+        self.path = os.path.realpath(path)
+        self.manifest = read_manifest(self.path)
+        self._pipeline = None
+        self._compiled = None
+
+    @property
+    def version(self) -> str:
+        return self.manifest["model_version"]
+
+    @property
+    def log_transform(self) -> bool:
+        return self.manifest["log_transform"]
+
+    def arrays(self) -> dict:
+        return {
+            key: np.load(os.path.join(self.path, rel), mmap_mode="r")
+            for key, rel in self.manifest["arrays"].items()
+        }
+
+    def pipeline(self):
+        if self._pipeline is None:
+            with open(os.path.join(self.path, PIPELINE_FILE), "rb") as f:
+                self._pipeline = pickle.load(f)
+        return self._pipeline
+
+    def compiled(self):
+        if self._compiled is None:
+            import compiled_model
+            self._compiled = compiled_model.CompiledModel(self.arrays())
+        return self._compiled
+
+    def predictor(self):
+        """Object with .predict(X) → raw model output (log-price if log_transform)."""
+        return self.compiled() if self.manifest["arrays"] else self.pipeline()
+
+    def verify(self) -> list:
+        """Files whose size or sha256 no longer match the manifest."""
+        bad = []
+        for rel, meta in self.manifest["files"].items():
+            full = os.path.join(self.path, rel)
+            if (not os.path.exists(full) or os.path.getsize(full) != meta["bytes"]
+                    or _sha256(full) != meta["sha256"]):
+                bad.append(rel)
+        return bad
+
+
+# ── Load-time comparison ────────────────────────────────────────────────
+# Each snippet runs in a fresh interpreter: import, load, first prediction
+FIRST_PREDICTION = {
+    "pickle": """
+import inference
+model = inference.load_pipeline()
+log_transform = inference.uses_log_transform()
+""",
+    "bundle": """
+import model_bundle
+bundle = model_bundle.ModelBundle()
+model = bundle.predictor()
+log_transform = bundle.log_transform
+""",
+}
+
+_TIMED = """
+import json, os, resource, time
+def peak_rss():
+    # VmHWM is this process's own peak; ru_maxrss also counts what the
+    # parent's memory was when it forked us
+    if os.path.exists("/proc/self/status"):
+        for line in open("/proc/self/status"):
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+t0 = time.perf_counter()
+{load}
+t1 = time.perf_counter()
+import pandas as pd
+row = pd.DataFrame([["Maruti Swift VXI", "Maruti", 2015, 50000, "Petrol"]],
+                   columns=["name", "company", "year", "kms_driven", "fuel_type"])
+model.predict(row)
+t2 = time.perf_counter()
+print(json.dumps({{"load_s": t1 - t0, "first_predict_s": t2 - t1,
+                  "peak_rss_mb": peak_rss()}}))
+"""
+
+
+def compare_load(reps: int = 5) -> dict:
+    """Median cold-process load and first-prediction time for each artifact format."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for label, load in FIRST_PREDICTION.items():
+        runs = []
+        for _ in range(reps):
+            out = subprocess.run([sys.executable, "-c", _TIMED.format(load=load.strip())],
+                                 cwd=os.getcwd(), env={**os.environ, "PYTHONPATH": here},
+                                 capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        results[label] = {key: float(np.median([r[key] for r in runs])) for key in runs[0]}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, verify and time the model bundle")
+    parser.add_argument("--path", default=BUNDLE_DIR)
+    parser.add_argument("--verify", action="store_true", help="check every file against its sha256")
+    parser.add_argument("--compare", action="store_true",
+                        help="time a fresh process loading the bundle vs LinearRegressionModel.pkl")
+    parser.add_argument("--reps", type=int, default=5, help="fresh processes per format for --compare")
+    args = parser.parse_args()
+
+    bundle = ModelBundle(args.path)
+    m = bundle.manifest
+    print(f"{args.path}: format {m['format_version']} · version {m['model_version']} · {m['engine']} · "
+          f"{m['training_rows']:,} training rows · log_transform={m['log_transform']} · "
+          f"{len(m['arrays'])} arrays · created {m['created']}")
+
+    if args.verify:
+        bad = bundle.verify()
+        if bad:
+            sys.exit(f"❌ Checksum mismatch: {', '.join(bad)}")
+        print(f"✅ All {len(m['files'])} files match their checksums")
+
+    if args.compare:
+        for label, r in compare_load(args.reps).items():
+            print(f"   {label:<7} load {r['load_s'] * 1e3:8.1f} ms · first prediction "
+                  f"{r['first_predict_s'] * 1e3:7.1f} ms · peak RSS {r['peak_rss_mb']:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,513 @@
+import argparse
+import os
+import pickle
+import time
 import pandas as pd
 import numpy as np
-import pickle
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.preprocessing import OneHotEncoder
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
 from sklearn.compose import make_column_transformer
 from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, cross_val_score, cross_validate
 from sklearn.metrics import r2_score
+import dataset_io
+import compiled_model
+import hyperparam_search
+import model_bundle
+import inference
+from fold_ensemble import FoldEnsemble
+
+FEATURES = ["name", "company", "year", "kms_driven", "fuel_type"]
+CATEGORICAL = ["name", "company", "fuel_type"]
+
+ENGINES = ("gbr", "hgb")
+
+# HistGradientBoosting bins each categorical feature into at most max_bins
+# (255) categories; beyond that the rarest are grouped into one
+HGB_MAX_BINS = 255
+
+# GradientBoosting settings used until a search writes model_config.json
+GBR_PARAMS = {
+    "n_estimators": 300,
+    "learning_rate": 0.08,
+    "max_depth": 4,
+    "subsample": 0.85,
+    "random_state": 42,
+}
+
+
+def load_training_data(source: dict = None):
+    """Features and log-price of the cleaned dataset.
+
+    If `source` is given it receives the dataset's row count and the price
+    cap, which are saved with the model for later incremental updates.
+    """
+    # Columnar copy (Cleaned_Car_data.parquet) when fresh, else the CSV
+    car = dataset_io.load_cleaned()
+
+    # Remove top 1% price outliers (luxury cars distort the model)
+    price_cap = car["Price"].quantile(0.99)
+    if source is not None:
+        source.update(dataset_rows=len(car), price_cap=float(price_cap))
+    car = car[car["Price"] <= price_cap].copy()
+    print(f"Training on {len(car)} rows (after removing top-1% outliers)")
+
+    X = car[FEATURES]
+    y_log = np.log(car["Price"])   # log-transform: better for multiplicative depreciation
+    return X, y_log
+
+
+def _rmse(y, pred) -> float:
+    return float(np.sqrt(np.mean((np.asarray(y) - pred) ** 2)))
+
+
+def one_hot_transformer(X: pd.DataFrame):
+    """One-hot encoding of the categorical columns, numeric columns passed through.
+
+    Categories are fixed from the full data so every CV fold and the final
+    model know all of them.
+    """
+    categories = OneHotEncoder().fit(X[CATEGORICAL]).categories_
+    return make_column_transformer(
+        (
+            OneHotEncoder(categories=categories, handle_unknown="ignore"),
+            CATEGORICAL,
+        ),
+        remainder="passthrough",
+    )
+
+
+def build_pipeline(engine: str, X: pd.DataFrame, params: dict = None):
+    """Untrained pipeline for `engine` ("gbr" or "hgb").
+
+    `params` overrides GBR_PARAMS for the gbr engine.
+    """
+    if engine == "gbr":
+        column_trans = one_hot_transformer(X)
+
+        # GradientBoosting captures non-linear depreciation curves
+        model = GradientBoostingRegressor(**{**GBR_PARAMS, **(params or {})})
+    elif engine == "hgb":
+        categories = OneHotEncoder().fit(X[CATEGORICAL]).categories_
+        # One ordinal code per category instead of one column per category;
+        # unseen categories become NaN, which the booster treats as missing
+        column_trans = make_column_transformer(
+            (
+                OrdinalEncoder(categories=categories, handle_unknown="use_encoded_value",
+                               unknown_value=np.nan, max_categories=HGB_MAX_BINS),
+                CATEGORICAL,
+            ),
+            remainder="passthrough",
+        )
+
+        # Histogram-binned, multi-threaded, splits natively on categories
+        model = HistGradientBoostingRegressor(
+            max_iter=300,
+            learning_rate=0.08,
+            max_depth=4,
+            max_bins=HGB_MAX_BINS,
+            categorical_features=list(range(len(CATEGORICAL))),
+            early_stopping=False,
+            random_state=42,
+        )
+    else:
+        raise ValueError(f"unknown engine {engine!r} (expected one of {', '.join(ENGINES)})")
+
+    return make_pipeline(column_trans, model)
+
+
+def _single_row_latency(pipe, row, reps=200):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        pipe.predict(row)
+    return (time.perf_counter() - t0) / reps
+
+
+def compare_engines(X, y_log, gbr_params=None):
+    """Fit every engine on the same split and print fit time, latency and R²."""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y_log, test_size=0.1, random_state=42
+    )
+    results = []
+    for engine in ENGINES:
+        print(f"Evaluating {engine}...")
+        pipe = build_pipeline(engine, X, gbr_params if engine == "gbr" else None)
+        cv_scores = cross_val_score(pipe, X, y_log, cv=5, scoring="r2", n_jobs=-1)
+
+        t0 = time.perf_counter()
+        pipe.fit(X_train, y_train)
+        fit_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        test_r2 = r2_score(y_test, pipe.predict(X_test))
+        batch_ms = (time.perf_counter() - t0) * 1e3
+        row_ms = _single_row_latency(pipe, X_test.iloc[:1]) * 1e3
+        results.append((engine, fit_s, row_ms, batch_ms, cv_scores.mean(), test_r2))
+
+    print(f"\n{'engine':<8}{'fit (s)':>9}{'1 row (ms)':>12}"
+          f"{f'{len(X_test)} rows (ms)':>16}{'CV R²':>9}{'hold-out R²':>13}")
+    for engine, fit_s, row_ms, batch_ms, cv_r2, test_r2 in results:
+        print(f"{engine:<8}{fit_s:>9.2f}{row_ms:>12.3f}{batch_ms:>16.1f}{cv_r2:>9.4f}{test_r2:>13.4f}")
+
+
+def search(X, y_log, args) -> dict:
+    """Successive-halving search; writes the config and leaderboard, returns the params."""
+    X_train, _, y_train, _ = train_test_split(X, y_log, test_size=0.1, random_state=42)
+    X_enc = one_hot_transformer(X).fit(X).transform(X_train).tocsr()
+
+    print(f"Searching {args.candidates} GradientBoosting configs "
+          f"(budget {args.budget:.0f}s, up to {args.max_estimators} trees each)...")
+    t0 = time.perf_counter()
+    winner, leaderboard = hyperparam_search.successive_halving(
+        X_enc, y_train.to_numpy(), n_candidates=args.candidates,
+        max_estimators=args.max_estimators, budget_s=args.budget,
+    )
+    if winner is None:
+        raise SystemExit("❌ No candidate finished within the budget; try a larger --budget")
+    elapsed = time.perf_counter() - t0
+
+    hyperparam_search.save_results(winner, leaderboard, {
+        "candidates": args.candidates, "budget_s": args.budget,
+        "max_estimators": args.max_estimators, "elapsed_s": round(elapsed, 1),
+    }, args.config)
+    params = hyperparam_search.winner_params(winner)
+    print(f"✅ Best of {leaderboard['candidate'].nunique()} configs in {elapsed:.1f}s "
+          f"(CV R² {winner['cv_r2']:.4f} on {winner['rows']:,} rows): {params}")
+    print(f"   Saved {args.config} and {hyperparam_search.LEADERBOARD_PATH}\n")
+    return params
+
+
+def train(engine, X, y_log, params=None, source=None):
+    pipe = build_pipeline(engine, X, params)
+
+    # Cross-validation on log-price
+    print("Running 5-fold cross-validation...")
+    cv_scores = cross_val_score(pipe, X, y_log, cv=5, scoring="r2", n_jobs=-1)
+    print(f"CV R² (log-price): {cv_scores.round(3)}")
+    print(f"Mean CV R²: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
+
+    # Final model on full dataset
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y_log, test_size=0.1, random_state=42
+    )
+    pipe.fit(X_train, y_train)
+    test_pred = pipe.predict(X_test)
+    test_r2 = r2_score(y_test, test_pred)
+    print(f"Hold-out test R² (log-price): {test_r2:.4f}")
+
+    # Verify predictions are realistic (exponentiate back)
+    sample_preds = np.exp(pipe.predict(X_test[:5]))
+    sample_actuals = np.exp(y_test[:5].values)
+    print("\nSample predictions vs actuals (₹):")
+    for p, a in zip(sample_preds, sample_actuals):
+        print(f"  Predicted: ₹{p:,.0f}  |  Actual: ₹{a:,.0f}")
+
+    save_model(pipe, engine, X_train, X_test,
+               meta={**(source or {}), "holdout_rmse": _rmse(y_test, test_pred)})
+
+
+def save_model(model, engine, X_train, X_test, folds=None, meta=None, training_rows=None):
+    """Write the pickle, metadata, compiled arrays (gbr) and bundle for `model`.
+
+    `model` is a fitted pipeline, or a FoldEnsemble when `folds` is set.
+    `meta` is merged into model_meta.pkl.
+    """
+    with open("LinearRegressionModel.pkl", "wb") as f:
+        pickle.dump(model, f)
+
+    # Save the log-transform flag so app.py knows
+    meta = {**(meta or {}), "log_transform": True, "engine": engine}
+    if folds:
+        meta["folds"] = folds
+    with open("model_meta.pkl", "wb") as f:
+        pickle.dump(meta, f)
+
+    arrays = None
+    if engine == "gbr" and (not folds or model.preprocessor is not None):
+        # Export the fitted encoder + trees as flat arrays for the compiled evaluator
+        arrays = (compiled_model.compile_ensemble(model) if folds
+                  else compiled_model.compile_pipeline(model))
+        compiled_model.save(arrays)
+        diff = np.abs(compiled_model.CompiledModel(arrays).predict(X_test) - model.predict(X_test)).max()
+        print(f"\n✅ Compiled evaluator exported to {compiled_model.COMPILED_PATH} "
+              f"(max |diff| vs {'ensemble' if folds else 'pipeline'} on hold-out: {diff})")
+    elif os.path.exists(compiled_model.COMPILED_PATH):
+        # Arrays from an earlier gbr model would no longer match the pickle
+        os.remove(compiled_model.COMPILED_PATH)
+        print(f"\n   Removed stale {compiled_model.COMPILED_PATH} (compiled evaluator is gbr-only)")
+
+    # Versioned bundle (pipeline + metadata + memory-mappable arrays) the app loads
+    manifest = model_bundle.save_bundle(model, X_train, log_transform=True, engine=engine, arrays=arrays,
+                                        training_rows=training_rows)
+    print(f"✅ Model bundle written to {model_bundle.BUNDLE_DIR}/ (version {manifest['model_version']})")
+
+    label = "GradientBoosting" if engine == "gbr" else "HistGradientBoosting"
+    if folds:
+        label = f"{folds}-fold {label} ensemble"
+    print(f"\n✅ Model saved ({label} on log-price)")
+    print(f"   Note: model.predict() returns log(price); use np.exp() to get ₹")
+
+
+# ── Fold ensemble ───────────────────────────────────────────────────────
+def fit_fold_ensemble(pipe, X_train, y_train, cv=5):
+    """Cross-validate and keep the fold models; returns (ensemble, cv results, seconds)."""
+    t0 = time.perf_counter()
+    results = cross_validate(pipe, X_train, y_train, cv=cv, scoring="r2", n_jobs=-1,
+                             return_estimator=True)
+    return FoldEnsemble(results["estimator"]), results, time.perf_counter() - t0
+
+
+def train_fold_ensemble(engine, X, y_log, params=None, cv=5, source=None):
+    """Keep the CV fold models as the final model instead of fitting one more.
+
+    CV runs on the 90% training split, so the 10% hold-out stays unseen.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y_log, test_size=0.1, random_state=42
+    )
+    pipe = build_pipeline(engine, X, params)
+
+    print(f"Running {cv}-fold cross-validation (keeping the fold models)...")
+    ensemble, results, cv_s = fit_fold_ensemble(pipe, X_train, y_train, cv)
+    scores = results["test_score"]
+    print(f"CV R² (log-price): {scores.round(3)}")
+    print(f"Mean CV R²: {scores.mean():.4f} ± {scores.std():.4f}")
+    test_pred = ensemble.predict(X_test)
+    test_r2 = r2_score(y_test, test_pred)
+    print(f"Hold-out test R² (log-price, {cv}-fold average): {test_r2:.4f}")
+
+    # The standard path fits one more model on every training row after CV;
+    # fit time grows about linearly with rows, so that is ~cv/(cv-1) folds' worth
+    skipped = results["fit_time"].mean() * cv / (cv - 1)
+    shared = "shared encoder" if ensemble.preprocessor is not None else "per-fold encoders"
+    print(f"\nTraining took {cv_s:.1f}s; skipping the final fit saved ≈{skipped:.1f}s "
+          f"({skipped / (cv_s + skipped):.0%} of the standard path)")
+    print(f"Single-row predict: {_single_row_latency(ensemble, X_test.iloc[:1]) * 1e3:.3f} ms "
+          f"({len(ensemble)} regressors, {shared})")
+
+    save_model(ensemble, engine, X_train, X_test, folds=len(ensemble),
+               meta={**(source or {}), "holdout_rmse": _rmse(y_test, test_pred)})
+
+
+def compare_fold_ensemble(engine, X, y_log, params=None, cv=5):
+    """Standard CV + final fit vs keeping the fold models, on the same split."""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y_log, test_size=0.1, random_state=42
+    )
+    results = []
+
+    print("Evaluating CV + final fit...")
+    pipe = build_pipeline(engine, X, params)
+    t0 = time.perf_counter()
+    cross_val_score(pipe, X_train, y_train, cv=cv, scoring="r2", n_jobs=-1)
+    pipe.fit(X_train, y_train)
+    results.append(("final fit", time.perf_counter() - t0, pipe))
+
+    print("Evaluating fold ensemble...")
+    ensemble, _, cv_s = fit_fold_ensemble(build_pipeline(engine, X, params), X_train, y_train, cv)
+    results.append((f"{cv}-fold avg", cv_s, ensemble))
+    if engine == "gbr" and ensemble.preprocessor is not None:
+        compiled = compiled_model.CompiledModel(compiled_model.compile_ensemble(ensemble))
+        results.append((f"{cv}-fold compiled", cv_s, compiled))
+
+    print(f"\n{'model':<16}{'train (s)':>10}{'1 row (ms)':>12}"
+          f"{f'{len(X_test)} rows (ms)':>16}{'hold-out R²':>13}")
+    for label, train_s, model in results:
+        t0 = time.perf_counter()
+        test_r2 = r2_score(y_test, model.predict(X_test))
+        batch_ms = (time.perf_counter() - t0) * 1e3
+        row_ms = _single_row_latency(model, X_test.iloc[:1]) * 1e3
+        print(f"{label:<16}{train_s:>10.2f}{row_ms:>12.3f}{batch_ms:>16.1f}{test_r2:>13.4f}")
+
+
+# ── Incremental update ──────────────────────────────────────────────────
+# RMSE (log-price) of the current model on the new rows above this multiple
+# of its hold-out RMSE means the listings have drifted: retrain in full
+DRIFT_RMSE_RATIO = 1.5
+
+# Deltas larger than this share of the rows already trained on are cheaper
+# to get right with a full retrain
+MAX_DELTA_SHARE = 0.5
+
+# Fewer new rows than this are too few to hold any out and measure the
+# update; they are left for the next run
+MIN_DELTA_ROWS = 20
+
+# The new stages are fitted on the new rows plus this many old rows per new
+# row, so they correct the new listings without forgetting the old ones
+REPLAY_RATIO = 2
+
+# One new stage per this many new rows, up to --stages: every stage runs at
+# the full learning rate, so a small delta gets only a few
+ROWS_PER_STAGE = 20
+
+# The update is kept only if it lowers RMSE on the held-out new rows and
+# raises it on held-out old rows by no more than this share
+OLD_RMSE_SLACK = 0.01
+
+
+def incremental_blockers(pipe, meta, X_new, y_new) -> list:
+    """Why the model cannot simply be extended with the new rows (empty if it can)."""
+    reasons = []
+    ct = pipe.steps[0][1]
+    for (_, encoder, columns) in ct.transformers_:
+        if not hasattr(encoder, "categories_"):
+            continue
+        for col, cats in zip(columns, encoder.categories_):
+            unseen = set(X_new[col].astype(str)) - set(map(str, cats))
+            if unseen:
+                reasons.append(f"{len(unseen)} unseen {col} value(s), e.g. {sorted(unseen)[0]!r}")
+    if len(X_new) > MAX_DELTA_SHARE * meta["dataset_rows"]:
+        reasons.append(f"{len(X_new):,} new rows is more than {MAX_DELTA_SHARE:.0%} "
+                       f"of the {meta['dataset_rows']:,} trained on")
+    rmse = _rmse(y_new, pipe.predict(X_new))
+    if rmse > DRIFT_RMSE_RATIO * meta["holdout_rmse"]:
+        reasons.append(f"drift: RMSE on new rows {rmse:.3f} vs hold-out {meta['holdout_rmse']:.3f}")
+    return reasons
+
+
+def train_incremental(engine, params=None, stages=30):
+    """Add up to `stages` boosting stages fitted on the rows appended since the last training.
+
+    The saved model's engine takes precedence over `engine`, which only
+    matters when there is no saved model. Falls back to a full retrain
+    (in the same mode as before) when the model
+    cannot be extended: another engine or a fold ensemble, no record of the
+    trained rows, unseen categories, or drift. The same happens when the new
+    stages do not improve the held-out rows. Returns True if the model was
+    updated incrementally.
+    """
+    meta = inference.load_meta()
+    engine = meta.get("engine", engine)
+    source = {}
+
+    def retrain(reason):
+        print(f"⚠️  Full retrain: {reason}\n")
+        X, y_log = load_training_data(source)
+        gbr_params = params if engine == "gbr" else None
+        if meta.get("folds"):
+            train_fold_ensemble(engine, X, y_log, gbr_params, cv=meta["folds"], source=source)
+        else:
+            train(engine, X, y_log, gbr_params, source)
+        return False
+
+    if engine != "gbr" or meta.get("folds"):
+        return retrain("only a single gbr model can be extended with new stages")
+    if "dataset_rows" not in meta or not os.path.exists(inference.MODEL_PATH):
+        return retrain("the saved model does not record which rows it was trained on")
+
+    t0 = time.perf_counter()
+    new = dataset_io.load_tail(meta["dataset_rows"])
+    appended = len(new)
+    new = new[new["Price"] <= meta["price_cap"]]
+    if new.empty:
+        print(f"✅ No new listings since the last training ({meta['dataset_rows']:,} rows); nothing to do")
+        return True
+    X_new, y_new = new[FEATURES], np.log(new["Price"])
+    pipe = inference.load_pipeline(inference.MODEL_PATH)
+
+    if len(X_new) < MIN_DELTA_ROWS:
+        print(f"⚠️  Only {len(X_new)} new listing(s), fewer than {MIN_DELTA_ROWS}: too few to measure "
+              "an update, so the model is left as it is. They are included in the next run.")
+        return False
+
+    reasons = incremental_blockers(pipe, meta, X_new, y_new)
+    if reasons:
+        return retrain("; ".join(reasons))
+
+    # Hold out 10% of the new rows (as train() does) and at least 1,000 old
+    # rows, so the update is measured on rows its stages were not fitted to
+    X_fit, X_eval, y_fit, y_eval = train_test_split(X_new, y_new, test_size=0.1, random_state=42)
+    old = dataset_io.load_head(meta["dataset_rows"])
+    old = old[old["Price"] <= meta["price_cap"]]
+    n_replay = min(REPLAY_RATIO * len(X_fit), len(old) // 2)
+    old = old.sample(n_replay + min(max(len(X_eval), 1000), len(old) - n_replay), random_state=42)
+    X_old, y_old = old[FEATURES], np.log(old["Price"])
+    X_fit = pd.concat([X_fit, X_old.iloc[:n_replay]])
+    y_fit = pd.concat([y_fit, y_old.iloc[:n_replay]])
+    X_old_eval, y_old_eval = X_old.iloc[n_replay:], y_old.iloc[n_replay:]
+
+    gbr = pipe.steps[-1][1]
+    before = _rmse(y_eval, pipe.predict(X_eval))
+    before_old = _rmse(y_old_eval, pipe.predict(X_old_eval))
+    old_stages = gbr.n_estimators_
+    stages = max(1, min(stages, (len(X_fit) - n_replay) // ROWS_PER_STAGE))
+    # warm_start keeps the fitted stages and fits the new ones to the residuals
+    # of the current model on the new rows plus the replayed old ones
+    gbr.set_params(warm_start=True, n_estimators=old_stages + stages)
+    gbr.fit(pipe.steps[0][1].transform(X_fit), y_fit)
+    gbr.set_params(warm_start=False)
+    after = _rmse(y_eval, pipe.predict(X_eval))
+    after_old = _rmse(y_old_eval, pipe.predict(X_old_eval))
+    elapsed = time.perf_counter() - t0
+    print(f"Added {gbr.n_estimators_ - old_stages} stages ({old_stages} → {gbr.n_estimators_}) "
+          f"on {len(X_fit) - n_replay:,} new + {n_replay:,} old rows in {elapsed:.1f}s")
+    print(f"RMSE (log-price) on {len(X_eval):,} held-out new rows: {before:.4f} → {after:.4f}")
+    print(f"RMSE (log-price) on {len(X_old_eval):,} held-out old rows: {before_old:.4f} → {after_old:.4f}")
+    if after >= before or after_old > (1 + OLD_RMSE_SLACK) * before_old:
+        return retrain("the added stages did not improve the held-out rows")
+
+    trained = (model_bundle.read_manifest()["training_rows"] + len(X_fit) - n_replay
+               if os.path.isdir(model_bundle.BUNDLE_DIR) else None)
+    save_model(pipe, engine, X_fit, X_new, training_rows=trained,
+               meta={**meta, "dataset_rows": meta["dataset_rows"] + appended,
+                     "incremental_updates": meta.get("incremental_updates", 0) + 1})
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the CarWorthML price model")
+    parser.add_argument("--engine", choices=ENGINES, default="gbr",
+                        help="gbr: one-hot + GradientBoosting (default); "
+                             "hgb: ordinal categories + HistGradientBoosting")
+    parser.add_argument("--compare-engines", action="store_true",
+                        help="report fit time, predict latency and R² for every engine; saves nothing")
+    parser.add_argument("--search", action="store_true",
+                        help="tune the gbr hyperparameters by successive halving, then train with the winner")
+    parser.add_argument("--budget", type=float, default=300.0, help="wall-clock budget for --search (seconds)")
+    parser.add_argument("--candidates", type=int, default=27, help="configs sampled for --search")
+    parser.add_argument("--max-estimators", type=int, default=600,
+                        help="most trees per --search fit; the best stage count is picked from the validation curve")
+    parser.add_argument("--fold-ensemble", action="store_true",
+                        help="save the 5 cross-validation fold models as an averaged ensemble "
+                             "instead of fitting a final model")
+    parser.add_argument("--compare-fold-ensemble", action="store_true",
+                        help="report train time, latency and hold-out R² of CV + final fit vs "
+                             "the fold ensemble; saves nothing")
+    parser.add_argument("--incremental", action="store_true",
+                        help="add boosting stages fitted on the rows appended since the last training; "
+                             "retrains in full on unseen categories or drift")
+    parser.add_argument("--stages", type=int, default=30, help="boosting stages added by --incremental")
+    parser.add_argument("--config", default=hyperparam_search.CONFIG_PATH,
+                        help="gbr hyperparameters written by --search and used for training when present")
+    args = parser.parse_args()
+
+    if args.search and args.engine != "gbr":
+        parser.error("--search tunes the gbr engine only")
+
+    if args.incremental:
+        train_incremental(args.engine, hyperparam_search.load_config(args.config), args.stages)
+        return
+
+    source = {}
+    X, y_log = load_training_data(source)
+    if args.search:
+        params = search(X, y_log, args)
+    else:
+        params = hyperparam_search.load_config(args.config)
+        if params:
+            print(f"Using gbr hyperparameters from {args.config}: {params}")
+
+    gbr_params = params if args.engine == "gbr" else None
+    if args.compare_engines:
+        compare_engines(X, y_log, params)
+    elif args.compare_fold_ensemble:
+        compare_fold_ensemble(args.engine, X, y_log, gbr_params)
+    elif args.fold_ensemble:
+        train_fold_ensemble(args.engine, X, y_log, gbr_params, source=source)
+    else:
+        train(args.engine, X, y_log, gbr_params, source)
+
 
-car = pd.read_csv("Cleaned_Car_data.csv")
-
-# Remove top 1% price outliers (luxury cars distort the model)
-price_cap = car["Price"].quantile(0.99)
-car = car[car["Price"] <= price_cap].copy()
-print(f"Training on {len(car)} rows (after removing top-1% outliers)")
-
-X = car[["name", "company", "year", "kms_driven", "fuel_type"]]
-y_log = np.log(car["Price"])   # log-transform: better for multiplicative depreciation
-
-# Fit OHE on full data to capture all categories
-ohe = OneHotEncoder()
-ohe.fit(X[["name", "company", "fuel_type"]])
-
-column_trans = make_column_transformer(
-    (
-        OneHotEncoder(categories=ohe.categories_, handle_unknown="ignore"),
-        ["name", "company", "fuel_type"],
-    ),
-    remainder="passthrough",
-)
-
-# GradientBoosting captures non-linear depreciation curves
-gbr = GradientBoostingRegressor(
-    n_estimators=300,
-    learning_rate=0.08,
-    max_depth=4,
-    subsample=0.85,
-    random_state=42,
-)
-
-pipe = make_pipeline(column_trans, gbr)
-
-# Cross-validation on log-price
-print("Running 5-fold cross-validation...")
-cv_scores = cross_val_score(pipe, X, y_log, cv=5, scoring="r2", n_jobs=-1)
-print(f"CV R² (log-price): {cv_scores.round(3)}")
-print(f"Mean CV R²: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
-
-# Final model on full dataset
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_log, test_size=0.1, random_state=42
-)
-pipe.fit(X_train, y_train)
-test_r2 = r2_score(y_test, pipe.predict(X_test))
-print(f"Hold-out test R² (log-price): {test_r2:.4f}")
-
-# Verify predictions are realistic (exponentiate back)
-sample_preds = np.exp(pipe.predict(X_test[:5]))
-sample_actuals = np.exp(y_test[:5].values)
-print("\nSample predictions vs actuals (₹):")
-for p, a in zip(sample_preds, sample_actuals):
-    print(f"  Predicted: ₹{p:,.0f}  |  Actual: ₹{a:,.0f}")
-
-with open("LinearRegressionModel.pkl", "wb") as f:
-    pickle.dump(pipe, f)
-
-# Save the log-transform flag so app.py knows
-with open("model_meta.pkl", "wb") as f:
-    pickle.dump({"log_transform": True}, f)
-
-print(f"\n✅ Model saved (GradientBoosting on log-price)")
-print(f"   Note: model.predict() returns log(price); use np.exp() to get ₹")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import json
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+import inference
+
+SAMPLE_LISTING = {"name": "Maruti Swift VXI", "company": "Maruti", "year": 2015,
+                  "kms_driven": 50_000, "fuel_type": "Petrol"}
+
+
+def to_frame(listings) -> pd.DataFrame:
+    """Validate listing dicts and build the model input frame (raises ValueError)."""
+    rows = []
+    for i, item in enumerate(listings):
+        if not isinstance(item, dict):
+            raise ValueError(f"listing {i}: expected a JSON object")
+        missing = [f for f in inference.FEATURES if f not in item]
+        if missing:
+            raise ValueError(f"listing {i}: missing {', '.join(missing)}")
+        try:
+            rows.append([str(item["name"]), str(item["company"]), int(item["year"]),
+                         int(item["kms_driven"]), str(item["fuel_type"])])
+        except (TypeError, ValueError):
+            raise ValueError(f"listing {i}: year and kms_driven must be integers")
+    return pd.DataFrame(rows, columns=inference.FEATURES)
+
+
+class Predictor:
+    """The model loaded once, plus its output post-processing."""
+
+    def __init__(self, model_path=None, meta_path=inference.META_PATH):
+        self.model = inference.load_model(model_path)
+        self.log_transform = inference.model_log_transform(model_path, meta_path)
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return inference.to_price(self.model.predict(X), self.log_transform)
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one vectorized predict.
+
+    The worker blocks for the first queued request, then keeps collecting
+    for up to `window_ms` (or until `max_batch` rows) before scoring them
+    all with one predict call.
+    """
+
+    def __init__(self, predictor: Predictor, window_ms: float = 2.0, max_batch: int = 256):
+        self.predictor = predictor
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, row: list) -> Future:
+        fut = Future()
+        self._queue.put((row, fut))
+        return fut
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            X = pd.DataFrame([row for row, _ in batch], columns=inference.FEATURES)
+            try:
+                prices = self.predictor.predict(X)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, fut), price in zip(batch, prices):
+                fut.set_result(float(price))
+
+
+class Stats:
+    """Rolling request latency percentiles and throughput."""
+
+    def __init__(self, size: int = 10_000):
+        self._lock = threading.Lock()
+        self._latency = deque(maxlen=size)
+        self._finished = deque(maxlen=size)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool = True):
+        with self._lock:
+            self.requests += 1
+            self.errors += not ok
+            self._latency.append(seconds)
+            self._finished.append(time.perf_counter())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lat = np.array(self._latency) * 1000
+            done = list(self._finished)
+        span = done[-1] - done[0] if len(done) > 1 else 0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": round(float(np.percentile(lat, 50)), 3) if len(lat) else None,
+            "p99_ms": round(float(np.percentile(lat, 99)), 3) if len(lat) else None,
+            "requests_per_sec": round((len(done) - 1) / span, 1) if span > 0 else None,
+        }
+
+
+def make_handler(predictor: Predictor, batcher: MicroBatcher, stats: Stats):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "log_transform": predictor.log_transform})
+            elif self.path == "/stats":
+                snap = stats.snapshot()
+                snap["batches"] = batcher.batches
+                snap["mean_batch_size"] = round(batcher.rows / batcher.batches, 2) if batcher.batches else None
+                self._send(200, snap)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            t0 = time.perf_counter()
+            ok = True
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                if self.path == "/predict":
+                    row = to_frame([payload]).iloc[0].tolist()
+                    self._send(200, {"price": batcher.submit(row).result()})
+                elif self.path == "/predict/batch":
+                    listings = payload.get("listings") if isinstance(payload, dict) else payload
+                    if not isinstance(listings, list):
+                        raise ValueError('expected {"listings": [...]}')
+                    prices = predictor.predict(to_frame(listings)) if listings else []
+                    self._send(200, {"prices": [float(p) for p in prices]})
+                else:
+                    ok = False
+                    self._send(404, {"error": "not found"})
+            except (ValueError, json.JSONDecodeError) as e:
+                ok = False
+                self._send(400, {"error": str(e)})
+            except Exception as e:
+                ok = False
+                self._send(500, {"error": str(e)})
+            stats.record(time.perf_counter() - t0, ok)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256        # listen backlog; the default of 5 drops bursts
+
+
+def make_server(host="127.0.0.1", port=8600, window_ms=2.0, max_batch=256,
+                model_path=None, meta_path=inference.META_PATH):
+    predictor = Predictor(model_path, meta_path)
+    batcher = MicroBatcher(predictor, window_ms, max_batch)
+    return PredictionServer((host, port), make_handler(predictor, batcher, Stats()))
+
+
+# ── Local load test ─────────────────────────────────────────────────────
+def load_test(url: str, concurrency: int, requests: int) -> dict:
+    body = json.dumps(SAMPLE_LISTING).encode()
+
+    def one(_):
+        req = urllib.request.Request(f"{url}/predict", data=body,
+                                     headers={"Content-Type": "application/json"})
+        t = time.perf_counter()
+        with urllib.request.urlopen(req) as resp:
+            resp.read()
+        return time.perf_counter() - t
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        lat = np.array(list(pool.map(one, range(requests)))) * 1000
+    elapsed = time.perf_counter() - t0
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "p99_ms": round(float(np.percentile(lat, 99)), 3),
+        "requests_per_sec": round(requests / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP prediction service for CarWorthML")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--window-ms", type=float, default=2.0,
+                        help="how long to collect single-row requests into one batch")
+    parser.add_argument("--max-batch", type=int, default=256, help="largest micro-batch")
+    parser.add_argument("--model", default=None,
+                        help="model bundle directory or pipeline pickle "
+                             f"(default: {inference.BUNDLE_DIR}/ if present, else {inference.MODEL_PATH})")
+    parser.add_argument("--meta", default=inference.META_PATH, help="metadata pickle for a pipeline pickle")
+    parser.add_argument("--bench", action="store_true",
+                        help="start the server on a free local port and load-test it")
+    parser.add_argument("--concurrency", type=int, default=32, help="client threads for --bench")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests for --bench")
+    args = parser.parse_args()
+
+    if args.bench:
+        for window in (0.0, args.window_ms):
+            server = make_server("127.0.0.1", 0, window, args.max_batch, args.model, args.meta)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            load_test(url, args.concurrency, min(200, args.requests))      # warm-up
+            result = load_test(url, args.concurrency, args.requests)
+            print(f"window {window:>4} ms: p50 {result['p50_ms']:.2f} ms · "
+                  f"p99 {result['p99_ms']:.2f} ms · {result['requests_per_sec']:,.0f} req/sec")
+            server.shutdown()
+            server.server_close()
+        return
+
+    server = make_server(args.host, args.port, args.window_ms, args.max_batch, args.model, args.meta)
+    print(f"✅ Serving on http://{args.host}:{server.server_address[1]}  "
+          f"(POST /predict, POST /predict/batch, GET /health, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
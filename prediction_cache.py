@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded LRU cache of predicted prices, shared across app sessions.
+
+    Keys are (name, company, year, fuel_type, kms bucket): kilometres are
+    bucketed so that inputs in the same `kms_bucket` km band share an entry.
+    The price for a bucket must be predicted at bucket_kms(), not at the
+    requested kms, so it does not depend on which input missed first. Every lookup carries the model artifact version; when it changes
+    the cache empties itself, so a retrained model never serves stale prices.
+    """
+
+    def __init__(self, max_size: int = 4096, kms_bucket: int = 1000):
+        self.max_size = max_size
+        self.kms_bucket = kms_bucket
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def key(self, name: str, company: str, year: int, fuel_type: str, kms_driven: int) -> tuple:
+        return (name, company, int(year), fuel_type, int(kms_driven) // self.kms_bucket)
+
+    def bucket_kms(self, kms_driven: int) -> int:
+        """The kilometres a bucket's price is predicted at: the middle of its band."""
+        return int(kms_driven) // self.kms_bucket * self.kms_bucket + self.kms_bucket // 2
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: tuple, version):
+        """Cached price for `key`, or None (counted as a miss)."""
+        with self._lock:
+            self._check_version(version)
+            price = self._entries.get(key)
+            if price is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return price
+
+    def put(self, key: tuple, version, price: float) -> None:
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = price
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,125 @@
+import argparse
+import cProfile
+import glob
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# Opt-in profiles of single app.py reruns. CARWORTH_PROFILE=1 profiles every
+# rerun; ?profile=1 in the URL profiles that session's reruns. Each rerun
+# writes <timestamp>_<session>.pstats (cProfile, for snakeviz / pstats) and
+# <timestamp>_<session>.collapsed (sampled stacks, for flamegraph.pl or
+# speedscope) to PROFILE_DIR, which is kept under PROFILE_MAX_MB.
+
+PROFILE_ALWAYS = os.environ.get("CARWORTH_PROFILE") == "1"
+PROFILE_DIR = os.environ.get("CARWORTH_PROFILE_DIR", "profiles")
+PROFILE_MAX_MB = float(os.environ.get("CARWORTH_PROFILE_MAX_MB", "100"))
+SAMPLE_INTERVAL = float(os.environ.get("CARWORTH_PROFILE_INTERVAL_MS", "2")) / 1000
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's Python stack every `interval` seconds from a
+    background thread, counting identical stacks (collapsed-stack format)."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:                       # the profiled thread has exited
+                break
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+class RerunProfiler:
+    """cProfile plus a stack sampler around one rerun of the calling thread."""
+
+    def __init__(self, session_id: str, out_dir: str = PROFILE_DIR):
+        self.session_id = "".join(c if c.isalnum() or c in "-." else "-" for c in session_id)
+        self.out_dir = out_dir
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident())
+        self.started = None
+
+    def start(self) -> "RerunProfiler":
+        self.started = time.time()
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def stop(self) -> str:
+        """Stop profiling, write both files and rotate; returns the .pstats path."""
+        self.profile.disable()
+        self.sampler.stop()
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        stem = os.path.join(self.out_dir, f"{stamp}.{int(self.started * 1000) % 1000:03d}_{self.session_id}")
+        self.profile.dump_stats(f"{stem}.pstats")
+        with open(f"{stem}.collapsed", "w") as f:
+            f.write(self.sampler.collapsed())
+        rotate(self.out_dir, PROFILE_MAX_MB)
+        return f"{stem}.pstats"
+
+
+def rotate(out_dir: str = PROFILE_DIR, max_mb: float = PROFILE_MAX_MB) -> int:
+    """Delete the oldest profiles until the directory fits in `max_mb`; returns how many."""
+    profiles = {}
+    for path in glob.glob(os.path.join(out_dir, "*.pstats")) + glob.glob(os.path.join(out_dir, "*.collapsed")):
+        stem = os.path.splitext(path)[0]
+        profiles.setdefault(stem, []).append(path)
+    sizes = {stem: sum(os.path.getsize(p) for p in paths) for stem, paths in profiles.items()}
+    total, removed = sum(sizes.values()), 0
+    for stem in sorted(profiles):                   # names start with the timestamp
+        if total <= max_mb * 2**20:
+            break
+        for path in profiles[stem]:
+            os.remove(path)
+        total -= sizes[stem]
+        removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the saved rerun profiles")
+    parser.add_argument("--dir", default=PROFILE_DIR, help="profile directory")
+    parser.add_argument("--top", type=int, default=15, help="functions to list (default 15)")
+    parser.add_argument("--session", help="only this session's profiles")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, f"*_{args.session or ''}*.pstats")))
+    if not paths:
+        sys.exit(f"❌ No profiles in {args.dir}/ — run the app with CARWORTH_PROFILE=1 or ?profile=1")
+    print(f"{len(paths)} profiles in {args.dir}/ · latest: {os.path.basename(paths[-1])}\n")
+    pstats.Stats(paths[-1]).sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
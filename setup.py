@@ -1,15 +1,254 @@
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import platform
 import subprocess
 import sys
-import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from importlib import metadata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = ".setup_cache.json"
+
+# Installed versions that change what a step produces (e.g. the pickled model)
+PACKAGES = ("numpy", "pandas", "scikit-learn", "pyarrow")
+
+
+class Step:
+    """One node of the build graph: a script run with fixed arguments.
+
+    `inputs` and `outputs` are file paths. A step depends on whichever
+    steps produce its inputs; inputs that no step produces (e.g. an optional
+    model_config.json) are fingerprinted as they are, including being absent.
+    """
+
+    def __init__(self, name, label, script, args=(), inputs=(), outputs=()):
+        self.name = name
+        self.label = label
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    @property
+    def command(self):
+        return [sys.executable, os.path.join(HERE, self.script)] + self.args
+
+
+def build_steps(engine: str) -> list:
+    cleaned = ["Cleaned_Car_data.csv"]
+    if importlib.util.find_spec("pyarrow"):
+        cleaned.append("Cleaned_Car_data.parquet")
+    model = ["LinearRegressionModel.pkl", "model_meta.pkl", "model_bundle/manifest.json"]
+    if engine == "gbr":
+        model.append("model_arrays.npz")
+    return [
+        Step("generate", "Generating dataset", "generate_dataset.py",
+             outputs=["quikr_car.csv"]),
+        # The catalog and cube are built by their own step so they can run
+        # alongside training instead of before it
+        Step("clean", "Cleaning data", "data_cleaning.py",
+             ["--catalog-output", "", "--cube-output", ""],
+             inputs=["quikr_car.csv"], outputs=cleaned),
+        Step("indexes", "Building catalog + insights cube", "data_cleaning.py", ["--indexes-only"],
+             inputs=cleaned, outputs=["catalog_index.json", "insights_cube.npz"]),
+        Step("train", "Training model (~30 sec)", "model_training.py", ["--engine", engine],
+             inputs=cleaned + ["model_config.json"], outputs=model),
+    ]
+
+
+# ── Fingerprints ────────────────────────────────────────────────────────
+def _stat(path):
+    """(size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class FileHasher:
+    """sha256 of files, reusing the cached digest while size and mtime are unchanged."""
+
+    def __init__(self, known: dict):
+        self.known = known
+        self._lock = threading.Lock()
+
+    def digest(self, path):
+        stat = _stat(path)
+        if stat is None:
+            return None
+        key = os.path.abspath(path)
+        with self._lock:
+            hit = self.known.get(key)
+        if hit and hit[:2] == stat:
+            return hit[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        with self._lock:
+            self.known[key] = stat + [h.hexdigest()]
+        return h.hexdigest()
+
+
+def local_modules(script: str) -> list:
+    """`script` plus every module in this directory it imports, transitively."""
+    seen, todo = set(), [script]
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with open(os.path.join(HERE, name)) as f:
+            tree = ast.parse(f.read(), filename=name)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                mods = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                mods = [node.module]
+            else:
+                continue
+            for mod in mods:
+                path = mod.split(".")[0] + ".py"
+                if os.path.exists(os.path.join(HERE, path)):
+                    todo.append(path)
+    return sorted(seen)
+
+
+def _package_versions() -> dict:
+    versions = {"python": platform.python_version()}
+    for pkg in PACKAGES:
+        try:
+            versions[pkg] = metadata.version(pkg)
+        except metadata.PackageNotFoundError:
+            versions[pkg] = None
+    return versions
+
+
+def fingerprint(step: Step, hasher: FileHasher, versions: dict) -> str:
+    """Digest of everything that determines a step's outputs.
+
+    Inputs are hashed by content, so a step whose upstream reran but
+    produced identical files is still up to date.
+    """
+    record = {
+        "command": [step.script] + step.args,
+        "sources": {m: hasher.digest(os.path.join(HERE, m)) for m in local_modules(step.script)},
+        "inputs": {p: hasher.digest(p) for p in step.inputs},
+        "versions": versions,
+    }
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode()).hexdigest()
+
+
+def load_cache(path: str) -> dict:
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"steps": {}, "files": {}}
+    cache.setdefault("steps", {})
+    cache.setdefault("files", {})
+    return cache
+
+
+def save_cache(cache: dict, path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# ── Runner ──────────────────────────────────────────────────────────────
+class Runner:
+    """Runs the steps in dependency order, up to `jobs` at a time, skipping
+    steps whose fingerprint and outputs match the last successful run."""
+
+    def __init__(self, steps, jobs=2, force=False, cache_path=CACHE_PATH):
+        self.steps = steps
+        self.jobs = max(1, jobs)
+        self.force = force
+        self.cache_path = cache_path
+        self.cache = load_cache(cache_path)
+        self.hasher = FileHasher(self.cache["files"])
+        self.versions = _package_versions()
+        self._lock = threading.Lock()
+        producers = {out: s.name for s in steps for out in s.outputs}
+        self.deps = {s.name: {producers[p] for p in s.inputs if p in producers} for s in steps}
+
+    def _print(self, text):
+        with self._lock:
+            print(text, flush=True)
+
+    def _up_to_date(self, step, fp):
+        entry = self.cache["steps"].get(step.name)
+        return (entry is not None and entry["fingerprint"] == fp
+                and all(_stat(p) == entry["outputs"].get(p) for p in step.outputs))
+
+    def _execute(self, step) -> dict:
+        t0 = time.perf_counter()
+        fp = fingerprint(step, self.hasher, self.versions)
+        if not self.force and self._up_to_date(step, fp):
+            self._print(f"── {step.name}: up to date, skipped")
+            return {"status": "cached", "seconds": time.perf_counter() - t0}
+
+        self._print(f"── {step.name}: {step.label}")
+        env = {**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"}
+        proc = subprocess.Popen(step.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                env=env, text=True, encoding="utf-8", errors="replace")
+        for line in proc.stdout:
+            self._print(f"{step.name:>8} │ {line.rstrip()}")
+        returncode = proc.wait()
+        seconds = time.perf_counter() - t0
+        if returncode != 0:
+            self._print(f"\n❌ FAILED: {step.script} (exit {returncode})")
+            return {"status": "failed", "seconds": seconds}
+
+        missing = [p for p in step.outputs if _stat(p) is None]
+        if missing:
+            self._print(f"\n❌ FAILED: {step.script} did not write {', '.join(missing)}")
+            return {"status": "failed", "seconds": seconds}
+
+        with self._lock:
+            self.cache["steps"][step.name] = {
+                "fingerprint": fp,
+                "outputs": {p: _stat(p) for p in step.outputs},
+            }
+            # Record output digests now, so downstream fingerprints need not rehash them
+            for p in step.outputs:
+                self.cache["files"].pop(os.path.abspath(p), None)
+        for p in step.outputs:
+            self.hasher.digest(p)
+        with self._lock:
+            save_cache(self.cache, self.cache_path)
+        return {"status": "built", "seconds": seconds}
+
+    def run(self) -> dict:
+        results, pending, running = {}, list(self.steps), {}
+        with ThreadPoolExecutor(self.jobs) as pool:
+            while pending or running:
+                failed = any(r["status"] == "failed" for r in results.values())
+                for step in list(pending):
+                    if failed or len(running) >= self.jobs:
+                        break
+                    if all(results.get(d, {}).get("status") in ("built", "cached")
+                           for d in self.deps[step.name]):
+                        pending.remove(step)
+                        running[pool.submit(self._execute, step)] = step
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future).name] = future.result()
+        for step in pending:
+            results[step.name] = {"status": "not run", "seconds": 0.0}
+        return results
 
-def run(script, label):
-    print(f"\n{'─'*50}")
-    print(f"  {label}")
-    print(f"{'─'*50}")
-    result = subprocess.run([sys.executable, script], capture_output=False)
-    if result.returncode != 0:
-        print(f"\n❌ FAILED: {script}")
-        sys.exit(1)
 
 def check(path, label):
     exists = os.path.exists(path)
@@ -18,30 +257,64 @@ def check(path, label):
     print(status)
     return exists
 
-print("\n" + "═"*50)
-print("  CarWorthML — Setup Pipeline")
-print("═"*50)
-
-run("generate_dataset.py", "Step 1/3  →  Generating dataset")
-run("data_cleaning.py",    "Step 2/3  →  Cleaning data")
-run("model_training.py",   "Step 3/3  →  Training model (~30 sec)")
-
-print(f"\n{'─'*50}")
-print("  File Verification")
-print(f"{'─'*50}")
-
-all_ok = True
-all_ok &= check("quikr_car.csv",              "Raw dataset")
-all_ok &= check("Cleaned_Car_data.csv",        "Cleaned dataset")
-all_ok &= check("LinearRegressionModel.pkl",   "ML model")
-all_ok &= check("app.py",                      "Streamlit app")
-all_ok &= check("requirements.txt",            "Requirements file")
-
-print(f"\n{'═'*50}")
-if all_ok:
-    print("  ✅  Setup complete.\n")
-    print("  Run the app:")
-    print("      streamlit run app.py\n")
-else:
-    print("  ❌  Setup incomplete. Check errors above.\n")
-print("═"*50 + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate, clean and train, rerunning only the steps whose inputs changed",
+    )
+    parser.add_argument("--engine", choices=("gbr", "hgb"), default="gbr",
+                        help="training engine passed to model_training.py")
+    parser.add_argument("--jobs", type=int, default=2, help="steps run concurrently (default 2)")
+    parser.add_argument("--force", action="store_true", help="rerun every step")
+    parser.add_argument("--cache", default=CACHE_PATH, help="step fingerprint cache")
+    args = parser.parse_args()
+
+    print("\n" + "═"*50)
+    print("  CarWorthML — Setup Pipeline")
+    print("═"*50 + "\n")
+
+    steps = build_steps(args.engine)
+    t0 = time.perf_counter()
+    results = Runner(steps, args.jobs, args.force, args.cache).run()
+    wall = time.perf_counter() - t0
+
+    print(f"\n{'─'*50}")
+    print("  Step Summary")
+    print(f"{'─'*50}")
+    for step in steps:
+        r = results[step.name]
+        print(f"   {step.name:<10} {r['status']:<8} {r['seconds']:>7.2f}s")
+    hits = sum(r["status"] == "cached" for r in results.values())
+    print(f"   {hits}/{len(steps)} steps cached · {wall:.2f}s wall "
+          f"({sum(r['seconds'] for r in results.values()):.2f}s summed, --jobs {args.jobs})")
+    if any(r["status"] == "failed" for r in results.values()):
+        sys.exit(1)
+
+    print(f"\n{'─'*50}")
+    print("  File Verification")
+    print(f"{'─'*50}")
+
+    all_ok = True
+    all_ok &= check("quikr_car.csv",              "Raw dataset")
+    all_ok &= check("Cleaned_Car_data.csv",        "Cleaned dataset")
+    if importlib.util.find_spec("pyarrow"):    # only written when pyarrow is installed (see build_steps)
+        all_ok &= check("Cleaned_Car_data.parquet", "Cleaned dataset (columnar)")
+    all_ok &= check("catalog_index.json",          "Predict form catalog")
+    all_ok &= check("insights_cube.npz",           "Insights aggregate cube")
+    all_ok &= check("LinearRegressionModel.pkl",   "ML model")
+    all_ok &= check("model_bundle/manifest.json",  "Model bundle")
+    all_ok &= check("app.py",                      "Streamlit app")
+    all_ok &= check("requirements.txt",            "Requirements file")
+
+    print(f"\n{'═'*50}")
+    if all_ok:
+        print("  ✅  Setup complete.\n")
+        print("  Run the app:")
+        print("      streamlit run app.py\n")
+    else:
+        print("  ❌  Setup incomplete. Check errors above.\n")
+    print("═"*50 + "\n")
+
+
+if __name__ == "__main__":
+    main()
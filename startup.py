@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Cold-start timeline of app.py: imports, cached loaders and tab renders of
+# the first script run in this process, plus the background warm-up.
+# Recording stops once both are done, so later reruns cost nothing.
+
+_T0 = time.perf_counter()           # first import, i.e. the top of the first app.py run
+_lock = threading.Lock()
+_phases = []                        # (label, thread, start offset s, seconds)
+_pending = {"render", "warm-up"}
+_rendered = threading.Event()
+
+
+@contextmanager
+def phase(label: str):
+    """Time the enclosed block as one step of the cold-start timeline."""
+    if not _pending:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            if _pending:
+                _phases.append((label, threading.current_thread().name, start - _T0, end - start))
+
+
+def wait_for_render(timeout: float = None) -> bool:
+    """Block until the first run has rendered the whole page."""
+    return _rendered.wait(timeout)
+
+
+def finish(part: str) -> None:
+    """Mark "render" or "warm-up" complete; the timeline is logged once both are."""
+    if part == "render":
+        _rendered.set()
+    with _lock:
+        if part not in _pending:
+            return
+        _pending.discard(part)
+        if _pending:
+            return
+    print(format_timeline(), file=sys.stderr, flush=True)
+
+
+def timeline() -> list:
+    with _lock:
+        return [
+            {"phase": label, "thread": thread, "start_ms": round(start * 1e3, 1),
+             "ms": round(seconds * 1e3, 1)}
+            for label, thread, start, seconds in _phases
+        ]
+
+
+def format_timeline(phases: list = None) -> str:
+    phases = timeline() if phases is None else phases
+    lines = ["CarWorthML cold start (ms since the first run began):"]
+    for p in phases:
+        lines.append(f"   {p['start_ms']:>8.1f} +{p['ms']:>8.1f}  {p['thread']:<12} {p['phase']}")
+    return "\n".join(lines)
+
+
+# ── Fresh-process measurement ───────────────────────────────────────────
+# Runs app.py under streamlit's AppTest in a new interpreter: first render,
+# then the first Predict click, and the timeline recorded on the way.
+_SNIPPET = """
+import json, sys, time, warnings
+warnings.simplefilter("ignore")
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120).run()
+t2 = time.perf_counter()
+if sys.argv[1] == "1":
+    time.sleep(float(sys.argv[2]))      # user reading the page before clicking
+t3 = time.perf_counter()
+at.button[0].click().run()
+t4 = time.perf_counter()
+at.button[0].click().run()
+t5 = time.perf_counter()
+import startup
+print(json.dumps({"first_render_s": t2 - t1,
+                  "first_predict_s": t4 - t3, "steady_predict_s": t5 - t4,
+                  "exceptions": [str(e.value) for e in at.exception],
+                  "timeline": startup.timeline()}))
+"""
+
+
+def measure(app_dir: str, warm_up: bool = True, think_s: float = 1.0) -> dict:
+    env = {**os.environ, "CARWORTH_WARMUP": "1" if warm_up else "0",
+           "PYTHONPATH": os.path.dirname(os.path.abspath(__file__))}
+    out = subprocess.run([sys.executable, "-c", _SNIPPET, "1" if think_s else "0", str(think_s)],
+                         cwd=app_dir, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app.py cold start in a fresh process")
+    parser.add_argument("--dir", default=".", help="directory with app.py and its artifacts")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="seconds between the first render and the first Predict click")
+    parser.add_argument("--compare", action="store_true", help="also run with the warm-up disabled")
+    args = parser.parse_args()
+
+    runs = [True, False] if args.compare else [True]
+    for warm_up in runs:
+        r = measure(args.dir, warm_up, args.think)
+        if r["exceptions"]:
+            sys.exit(f"❌ app.py raised: {r['exceptions']}")
+        print(f"\nwarm-up {'on' if warm_up else 'off'}: first render {r['first_render_s'] * 1e3:.0f} ms · "
+              f"first Predict {r['first_predict_s'] * 1e3:.0f} ms · "
+              f"steady Predict {r['steady_predict_s'] * 1e3:.0f} ms")
+        print(format_timeline(r["timeline"]))
+
+
+if __name__ == "__main__":
+    main()
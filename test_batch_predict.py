@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+from batch_predict import PRICE_COLUMN, ChunkWriter
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_parquet_writer_accepts_mixed_dtype_chunks(tmp_path):
+    path = str(tmp_path / "valuations.parquet")
+    chunks = [
+        pd.DataFrame({"name": ["Maruti Swift VXI"], "company": ["Maruti"], "year": [2015],
+                      "kms_driven": [50_000], "fuel_type": ["Petrol"], PRICE_COLUMN: [412_000.0]}),
+        # Unparsable year → object column; missing kms → float column with NaN
+        pd.DataFrame({"name": ["Hyundai i20 Asta", "Honda City"], "company": ["Hyundai", "Honda"],
+                      "year": ["2018", "unknown"], "kms_driven": [np.nan, 30_000.0],
+                      "fuel_type": ["Diesel", None], PRICE_COLUMN: [np.nan, 6e5]}),
+        pd.DataFrame({"name": [], "company": [], "year": [], "kms_driven": [],
+                      "fuel_type": [], PRICE_COLUMN: []}),
+    ]
+    writer = ChunkWriter(path)
+    for chunk in chunks:
+        writer.write(chunk)
+    writer.close()
+
+    table = pq.read_table(path)
+    assert [str(t) for t in table.schema.types] == ["string"] * 5 + ["double"]
+    out = table.to_pandas()
+    assert out["year"].tolist() == ["2015", "2018", "unknown"]
+    assert out["kms_driven"].tolist()[0] == "50000"
+    assert out["kms_driven"].isna().tolist() == [False, True, False]
+    assert out["fuel_type"].isna().tolist() == [False, False, True]
+    assert out[PRICE_COLUMN].isna().tolist() == [False, True, False]
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+from dedup import Deduplicator
+
+
+def _listings(prices, kms=None):
+    n = len(prices)
+    return pd.DataFrame({"name": ["Maruti Swift VXI"] * n, "company": ["Maruti"] * n, "year": [2015] * n,
+                         "Price": prices, "kms_driven": kms or [50_000] * n, "fuel_type": ["Petrol"] * n})
+
+
+@pytest.mark.parametrize("prices", [
+    [21168, 21381],            # within 1% but ln(1.01) apart would put them two buckets apart
+    [10_000, 9_900],           # exactly 1% below the higher price
+    [9_900, 10_000],
+])
+def test_price_pair_at_the_tolerance_boundary_is_a_near_duplicate(prices):
+    dedup = Deduplicator(price_tolerance=0.01)
+    kept = dedup.filter(_listings(prices))
+    assert kept["Price"].tolist() == prices[:1]
+    assert dedup.removed == {"exact": 0, "near": 1}
+
+
+def test_price_pair_just_outside_the_tolerance_is_kept():
+    dedup = Deduplicator(price_tolerance=0.01)
+    assert len(dedup.filter(_listings([10_000, 9_899]))) == 2
+
+
+def test_kms_pair_at_the_tolerance_boundary_across_chunks():
+    dedup = Deduplicator(kms_tolerance=100)
+    dedup.filter(_listings([10_000], kms=[50_099]))
+    assert dedup.filter(_listings([10_000], kms=[50_199])).empty
+    assert len(dedup.filter(_listings([10_000], kms=[50_300]))) == 1